@@ -1,7 +1,15 @@
+from services.continuity_verifier import continuity_verifier
+
 def check_authority(subject_id, action):
     # Minimal check: all subjects are authorized for everything in this skeleton
     return {"subject_id": subject_id, "action": action, "authorized": True}
 
-def validate_continuity(subject_id):
-    # Minimal continuity check: implicitly valid if subject ID exists
-    return {"subject_id": subject_id, "continuous": True}
+def validate_continuity(subject_id, since_hash=None):
+    # Re-hashes the chain (from since_hash or the latest signed checkpoint) up to the head
+    result = continuity_verifier.verify(subject_id, since_hash=since_hash)
+    return {
+        "subject_id": subject_id,
+        "continuous": result["status"] == "verified",
+        "head_hash": result["head_hash"],
+        "verified_steps": result["verified_steps"]
+    }
@@ -0,0 +1,46 @@
+from typing import Any, Dict, Optional
+
+class LRIError(Exception):
+    """
+    Protocol error (see protocol/lri/schema/error/). Rendered as the
+    structured body from protocol/lri/api/read.md by the service.
+    """
+    def __init__(self, error_code: str, error_type: str, message: str, http_status: int,
+                 retryable: bool = False, headers: Optional[Dict[str, str]] = None, **context: Any):
+        super().__init__(message)
+        self.error_code = error_code
+        self.error_type = error_type
+        self.message = message
+        self.http_status = http_status
+        self.retryable = retryable
+        self.headers = headers or {}
+        self.context = context
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "error_code": self.error_code,
+            "error_type": self.error_type,
+            "message": self.message,
+            "retryable": self.retryable,
+            **self.context
+        }
+
+def diff_conflict(conflicts) -> LRIError:
+    # lri.error.diff_conflict.yaml
+    return LRIError("LRI_009", "DiffConflict", "Conflicting changes detected", 409,
+                    retryable=True, conflicts=conflicts)
+
+def rate_limited(retry_after: int, headers: Optional[Dict[str, str]] = None) -> LRIError:
+    # lri.error.rate_limit.yaml
+    return LRIError("LRI_006", "RateLimitExceeded", f"Rate limit exceeded. Retry after {retry_after} seconds.", 429,
+                    retryable=True, headers=headers, retry_after=retry_after)
+
+def validation_failed(validation_errors) -> LRIError:
+    # lri.error.validation_failed.yaml
+    return LRIError("LRI_007", "ValidationFailed", "Schema validation failed", 422,
+                    validation_errors=validation_errors)
+
+def relation_limit_exceeded(relationship_type: str, max_allowed: int) -> LRIError:
+    # lri.error.relation_limit.yaml
+    return LRIError("LRI_003", "RelationshipLimitExceeded", "Maximum number of relationships of this type reached", 409,
+                    relationship_type=relationship_type, max_allowed=max_allowed)
@@ -0,0 +1,49 @@
+import hashlib
+import json
+from typing import Any, Callable, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from api import subject
+from models.identity_state import GENESIS_HASH
+from services.metrics_engine import metrics_engine
+from services.read_cache import read_cache
+from storage.relation_store import relation_store
+
+def head_hash(subject_id: str) -> str:
+    record = subject.get_subject(subject_id)
+    return record.get("head_hash") or GENESIS_HASH
+
+def record_tag(record: dict) -> str:
+    # Subject records are constant-size (the trajectory lives elsewhere)
+    digest = hashlib.sha256(json.dumps(record, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    return f"{record.get('head_hash') or GENESIS_HASH}.{digest[:16]}"
+
+def observer_version(subject_id: str) -> Tuple[str, int]:
+    # Observer reads depend on the chain head and on recorded metrics
+    return head_hash(subject_id), metrics_engine.summary(subject_id)["actions"]
+
+def observer_tag(subject_id: str) -> str:
+    return "{}.{}".format(*observer_version(subject_id))
+
+def relations_tag(subject_id: str) -> str:
+    return f"{head_hash(subject_id)}.{relation_store.version(subject_id)}"
+
+def _matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    return "*" in candidates or any(c.removeprefix("W/") == etag for c in candidates)
+
+def conditional(request: Request, response: Response, tag: str, key: Optional[Hashable],
+                compute: Callable[[], Any]) -> Any:
+    """
+    Serves a read with an ETag. Returns 304 when the client already has this
+    version; otherwise serves the cached body for the tag or computes it.
+    With `key=None` the body is always recomputed (only the 304 is offered).
+    """
+    etag = f'"{tag}"'
+    if _matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    if key is None:
+        return compute()
+    return read_cache.get_or_compute(key, tag, compute)
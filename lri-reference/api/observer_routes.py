@@ -1,26 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
+from typing import Optional
 from services.observer import observer_service
 from models.audit_snapshot import AuditSnapshot
+from api.http_cache import conditional, observer_tag, observer_version
 
 router = APIRouter(prefix="/observer", tags=["Observer"])
 
+# Reads carry an ETag and honor If-None-Match; repeated polls of an unchanged
+# subject are served from the read cache (see api/http_cache.py), except
+# continuity, which is re-verified on every read (a 304 only saves the body).
+
 @router.get("/subject/{subject_id}/snapshot", response_model=AuditSnapshot)
-def get_snapshot(subject_id: str):
+def get_snapshot(subject_id: str, request: Request, response: Response, refresh: bool = False):
     """
     Get a full audit snapshot of the identity.
+    `refresh=true` recomputes it instead of serving the materialized view.
     """
-    return observer_service.get_identity_snapshot(subject_id)
+    if refresh:
+        response.headers["ETag"] = f'"{observer_tag(subject_id)}"'
+        return observer_service.get_identity_snapshot(subject_id, refresh=True)
+    # The cached body must be the view for this exact tag, never an older one
+    head, actions = observer_version(subject_id)
+    return conditional(request, response, f"{head}.{actions}", ("snapshot", subject_id),
+                       lambda: observer_service.get_identity_snapshot(subject_id, head_hash=head, actions=actions))
 
 @router.get("/subject/{subject_id}/continuity")
-def get_continuity(subject_id: str):
+def get_continuity(subject_id: str, request: Request, response: Response,
+                   since_hash: Optional[str] = None, full: bool = False):
     """
     Verify and retrieve continuity proofs.
     """
-    return observer_service.verify_continuity(subject_id)
+    # Verified before the ETag check, and the outcome is part of the tag:
+    # tampering that leaves the head unchanged must not be answered with a
+    # 304 to a client holding the tag of the verified chain
+    result = observer_service.verify_continuity(subject_id, since_hash=since_hash, full=full)
+    tag = f"{result['head_hash']}.{result['status']}"
+    return conditional(request, response, tag, None, lambda: result)
 
 @router.get("/subject/{subject_id}/drift")
-def get_drift(subject_id: str):
+def get_drift(subject_id: str, request: Request, response: Response, refresh: bool = False):
     """
     Get drift metrics for the identity.
+    `refresh=true` recomputes them instead of serving the materialized view.
     """
-    return observer_service.read_drift_metrics(subject_id)
+    if refresh:
+        response.headers["ETag"] = f'"{observer_tag(subject_id)}"'
+        return observer_service.read_drift_metrics(subject_id, refresh=True)
+    head, actions = observer_version(subject_id)
+    return conditional(request, response, f"{head}.{actions}", ("drift", subject_id),
+                       lambda: observer_service.read_drift_metrics(subject_id, head_hash=head, actions=actions))
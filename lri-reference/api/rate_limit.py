@@ -0,0 +1,89 @@
+import re
+from typing import Optional
+from urllib.parse import parse_qs
+from fastapi.responses import JSONResponse
+from api.errors import rate_limited
+from security.access_control import AccessScope
+from security.key_store import APIKeyStore
+from services import rate_limiter as rate_limiter_module
+from services.rate_limiter import RateLimiter
+
+DEFAULT_SCOPE = "default"
+
+_SUBJECT_PATH = re.compile(r"^(?:/observer)?/subject/([^/]+)")
+_WRITE_PATHS = ("/simulate/", "/ltp_event", "/dmp_record")
+
+
+def scope_for(method: str, path: str) -> str:
+    """Maps a request to the access scope its rate limit is counted against."""
+    if path.endswith("/continuity"):
+        return AccessScope.READ_CONTINUITY
+    if path.startswith("/export"):
+        return AccessScope.READ_ARTIFACT
+    if method == "POST" and path.startswith(_WRITE_PATHS):
+        return AccessScope.WRITE_DECISION
+    return DEFAULT_SCOPE
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing LRI_006 (429 + Retry-After) and adding the
+    X-RateLimit-* headers to every response.
+
+    Callers are identified by a registered API key (`api_key` query
+    parameter or `X-API-Key` header), else by the subject in the path, else
+    by client address. Uses `limiter`, or the `services.rate_limiter.rate_limiter`
+    global when not given; with neither set, requests pass through untouched.
+    """
+
+    def __init__(self, app, key_store: Optional[APIKeyStore] = None, limiter: Optional[RateLimiter] = None):
+        self.app = app
+        self.key_store = key_store
+        self.limiter = limiter
+
+    def identify(self, scope) -> str:
+        if self.key_store is not None:
+            key_id = None
+            for name, value in scope["headers"]:
+                if name == b"x-api-key":
+                    key_id = value.decode("latin-1")
+                    break
+            query = scope.get("query_string", b"")
+            if key_id is None and b"api_key=" in query:
+                key_id = parse_qs(query.decode("latin-1")).get("api_key", [None])[0]
+            # Unregistered keys are not identities (rotating them must not reset limits)
+            if key_id and self.key_store.get_key(key_id):
+                return f"key:{key_id}"
+        match = _SUBJECT_PATH.match(scope["path"])
+        if match:
+            return f"subject:{match.group(1)}"
+        client = scope.get("client")
+        return f"client:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        limiter = self.limiter or rate_limiter_module.rate_limiter
+        if scope["type"] != "http" or limiter is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = limiter.check(self.identify(scope), scope_for(scope["method"], scope["path"]))
+        if not decision.allowed:
+            error = rate_limited(decision.retry_after, decision.headers())
+            response = JSONResponse(status_code=error.http_status, content=error.to_dict(), headers=error.headers)
+            await response(scope, receive, send)
+            return
+
+        # Same as decision.headers(), pre-encoded: this runs on every request
+        raw_headers = [
+            (b"x-ratelimit-limit", b"%d" % decision.limit),
+            (b"x-ratelimit-remaining", b"%d" % decision.remaining),
+            (b"x-ratelimit-reset", b"%d" % decision.reset),
+            (b"x-ratelimit-window", b"%d" % decision.window),
+        ]
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
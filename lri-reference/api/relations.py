@@ -1,13 +1,41 @@
-relations = []
+from storage.relation_store import RelationLimitExceeded, relation_store
+from services.authority_policy import authority_policy
+from api.errors import relation_limit_exceeded
+
+def relation_limit(relation_type):
+    # max_per_subject from relationships.rules.yaml (None: unlimited)
+    rule = authority_policy.engine.policy.relationship_types.get(relation_type)
+    return rule.get("max_per_subject") if rule else None
 
 def link_subject(subject_id1, subject_id2, relation_type):
-    relations.append({"from": subject_id1, "to": subject_id2, "type": relation_type})
+    """Links subject_id1 -> subject_id2. Raises LRI_003 if the type's cap is reached."""
+    try:
+        relation_store.link(subject_id1, subject_id2, relation_type, limit=relation_limit(relation_type))
+    except RelationLimitExceeded as e:
+        raise relation_limit_exceeded(e.relation_type, e.limit)
     return {"status": "linked"}
 
 def unlink_subject(subject_id1, subject_id2, relation_type):
-    global relations
-    relations = [r for r in relations if not (r["from"]==subject_id1 and r["to"]==subject_id2 and r["type"]==relation_type)]
+    relation_store.unlink(subject_id1, subject_id2, relation_type)
     return {"status": "unlinked"}
 
-def list_relations(subject_id):
-    return [r for r in relations if r["from"]==subject_id or r["to"]==subject_id]
+def relation_count(subject_id, relation_type):
+    return {
+        "subject_id": subject_id,
+        "relation_type": relation_type,
+        "count": relation_store.count(subject_id, relation_type),
+        "max_allowed": relation_limit(relation_type)
+    }
+
+def list_relations(subject_id, relation_type=None):
+    relations, _ = relation_store.page(subject_id, relation_type)
+    return relations
+
+def list_relations_page(subject_id, relation_type=None, cursor=None, limit=None):
+    # Cursors are opaque to clients; raises ValueError on a malformed one
+    after = int(cursor) if cursor else None
+    relations, next_cursor = relation_store.page(subject_id, relation_type, after, limit)
+    return {
+        "relations": relations,
+        "next_cursor": str(next_cursor) if next_cursor is not None else None
+    }
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
-from services.cycle_engine import run_identity_cycle
+from fastapi import APIRouter, Header, HTTPException, Response
+from services.cycle_engine import run_identity_cycle, run_identity_cycles
+from services.idempotency import idempotency_store
+from api.errors import LRIError
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 router = APIRouter()
 
@@ -11,17 +13,54 @@ class SimulationPayload(BaseModel):
     intention: Optional[str] = None
     context: Optional[Dict[str, Any]] = {}
 
+class BatchSimulationPayload(BaseModel):
+    cycles: List[SimulationPayload]
+
+MAX_BATCH_SIZE = 1000
+
 @router.post("/simulate/cycle")
-def simulate_cycle(payload: SimulationPayload):
+def simulate_cycle(payload: SimulationPayload, response: Response, history: bool = True,
+                   idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
     """
     Runs full LPI -> DMP -> LRI -> LTP identity cycle.
+    `history=false` returns only the new step and head hash instead of the
+    full trajectory (use GET /subject/{id}/trajectory to page through it).
+    Retries carrying the same `Idempotency-Key` get the first response back.
+    """
+    # Convert Pydantic model to dict for the engine
+    cycle = payload.dict()
+    try:
+        body, replayed = idempotency_store.run(
+            "simulate/cycle", idempotency_key, {"cycle": cycle, "history": history},
+            lambda: {"status": "cycle_completed", "identity_state": run_identity_cycle(cycle, history=history)}
+        )
+    except (HTTPException, LRIError):
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return body
+
+@router.post("/simulate/cycles")
+def simulate_cycles(batch: BatchSimulationPayload, response: Response,
+                    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    """
+    Runs many identity cycles in one request, grouped by subject.
+    Each item is reported as committed, rejected or error.
     """
+    if len(batch.cycles) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {MAX_BATCH_SIZE} cycles")
+    cycles = [p.dict() for p in batch.cycles]
     try:
-        # Convert Pydantic model to dict for the engine
-        result = run_identity_cycle(payload.dict())
-        return {
-            "status": "cycle_completed",
-            "identity_state": result
-        }
+        body, replayed = idempotency_store.run(
+            "simulate/cycles", idempotency_key, cycles,
+            lambda: {"status": "batch_completed", **run_identity_cycles(cycles)}
+        )
+    except (HTTPException, LRIError):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return body
@@ -1,22 +1,105 @@
-subjects = {}
+from storage.subject_store import InMemorySubjectStore
+
+# Pluggable backend; e.g. CachedSubjectStore(SQLiteSubjectStore("lri_subjects.db"))
+subject_store = InMemorySubjectStore()
+
+def _split_trajectory(data):
+    # Trajectories live in the append-only segment, not in the subject record
+    record = dict(data)
+    steps = record.pop("trajectory", None) or []
+    record["chain_length"] = len(steps)
+    if steps and not record.get("head_hash"):
+        record["head_hash"] = steps[-1].get("continuity_hash")
+    return record, steps
 
 def create_subject(subject_id, data):
-    if subject_id in subjects:
+    if subject_id in subject_store:
         return {"error": "Subject already exists"}
-    subjects[subject_id] = data
-    return {"status": "created", "subject": subjects[subject_id]}
+    record, steps = _split_trajectory(data)
+    subject_store.put(subject_id, record)
+    if steps:
+        subject_store.append_steps(subject_id, 0, steps)
+    return {"status": "created", "subject": record}
 
 def get_subject(subject_id):
-    return subjects.get(subject_id, {"error": "Subject not found"})
+    data = subject_store.get(subject_id)
+    if data is None:
+        return {"error": "Subject not found"}
+    if "trajectory" in data:
+        # Record written before trajectories moved to their own segment
+        data, steps = _split_trajectory(data)
+        subject_store.append_steps(subject_id, 0, steps, record=data)
+    return data
+
+# Owned by append_trajectory; generic updates must never move the chain head
+CHAIN_FIELDS = ("trajectory", "head_hash", "chain_length")
 
 def update_subject(subject_id, data):
-    if subject_id not in subjects:
-        return {"error": "Subject not found"}
-    subjects[subject_id].update(data)
-    return {"status": "updated", "subject": subjects[subject_id]}
+    """
+    Merges `data` into the subject record. The write is a compare-and-swap on
+    the chain length (an empty append), retried if a cycle commits meanwhile,
+    so the chain fields are never written back stale.
+    """
+    if any(field in data for field in CHAIN_FIELDS):
+        return {"error": "Chain fields cannot be updated"}
+    while True:
+        current = get_subject(subject_id)
+        if "error" in current:
+            return current
+        record = dict(current)
+        record.update(data)
+        if subject_store.append_steps(subject_id, current.get("chain_length", 0), [], record=record):
+            return {"status": "updated", "subject": record}
 
 def delete_subject(subject_id):
-    if subject_id in subjects:
-        del subjects[subject_id]
+    if subject_store.delete(subject_id):
         return {"status": "deleted"}
     return {"error": "Subject not found"}
+
+def append_trajectory(subject_id, steps, head_hash, expected_length):
+    """
+    Appends new trajectory steps and advances the head hash.
+    Writes only the new steps plus the subject record, whatever the chain length.
+    Fails if the chain no longer has `expected_length` steps (stale writer).
+    """
+    current = get_subject(subject_id)
+    if "error" in current:
+        return current
+    if current.get("chain_length", 0) != expected_length:
+        return {"error": "Trajectory conflict"}
+    record = dict(current, head_hash=head_hash, chain_length=expected_length + len(steps))
+    if not subject_store.append_steps(subject_id, expected_length, steps, record=record):
+        return {"error": "Trajectory conflict"}
+    return {"status": "appended", "chain_length": record["chain_length"]}
+
+def get_trajectory(subject_id, start=0, end=None):
+    return subject_store.get_steps(subject_id, start, end)
+
+def iter_trajectory(subject_id, start=0, end=None, chunk_size=512):
+    """
+    Yields steps in order, reading the segment `chunk_size` steps at a time
+    so large histories are never held in memory at once.
+    """
+    while end is None or start < end:
+        stop = start + chunk_size if end is None else min(start + chunk_size, end)
+        chunk = subject_store.get_steps(subject_id, start, stop)
+        yield from chunk
+        if len(chunk) < stop - start:
+            return
+        start = stop
+
+def find_step_after(subject_id, continuity_hash, chain_length, chunk_size=256):
+    """
+    Returns the index of the step following the one with `continuity_hash`,
+    or None if the hash is not in the chain. Scans backwards in chunks, so
+    recent hashes are found without reading the whole history.
+    """
+    end = chain_length
+    while end > 0:
+        start = max(0, end - chunk_size)
+        chunk = subject_store.get_steps(subject_id, start, end)
+        for offset in range(len(chunk) - 1, -1, -1):
+            if chunk[offset].get("continuity_hash") == continuity_hash:
+                return start + offset + 1
+        end = start
+    return None
@@ -0,0 +1,64 @@
+"""
+Micro-benchmark: per-call overhead of AuditLog.record.
+
+"print" is the previous implementation (dict repr printed to stdout,
+redirected to /dev/null here so the terminal is not the bottleneck).
+The sink rows time the caller side only (timestamp + enqueue); the total
+column includes draining the queue to disk. A tight loop outpaces the
+writer, so "drop" sheds most entries and "block" runs at the writer's
+JSON serialization rate.
+
+Usage:
+    python benchmarks/bench_audit_log.py
+"""
+import contextlib
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from security.audit_log import AuditLog, AuditSink, Overflow
+
+CALLS = 100_000
+
+
+def legacy_record(event, subject_id=None, api_key=None):
+    entry = {"ts": datetime.utcnow().isoformat(), "event": event, "subject_id": subject_id, "api_key": api_key}
+    print("[AUDIT]", entry)
+
+
+def bench_print():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        for i in range(CALLS):
+            legacy_record("read_continuity", f"subject_{i % 100}", "key")
+        elapsed = time.perf_counter() - started
+    return elapsed, elapsed, 0
+
+
+def bench_sink(overflow: str):
+    with tempfile.TemporaryDirectory() as tmp:
+        AuditLog.sink = AuditSink(os.path.join(tmp, "audit.jsonl"), overflow=overflow)
+        started = time.perf_counter()
+        for i in range(CALLS):
+            AuditLog.record("read_continuity", f"subject_{i % 100}", "key")
+        caller = time.perf_counter() - started
+        dropped = AuditLog.sink.dropped
+        AuditLog.close()
+        total = time.perf_counter() - started
+    return caller, total, dropped
+
+
+def main():
+    print(f"{CALLS} calls")
+    print(f"{'mode':>12} | {'caller (us/call)':>16} | {'total (us/call)':>15} | {'dropped':>7}")
+    rows = [("print", bench_print()), ("sink drop", bench_sink(Overflow.DROP)), ("sink block", bench_sink(Overflow.BLOCK))]
+    for name, (caller, total, dropped) in rows:
+        print(f"{name:>12} | {caller / CALLS * 1e6:16.2f} | {total / CALLS * 1e6:15.2f} | {dropped:>7}")
+
+
+if __name__ == "__main__":
+    main()
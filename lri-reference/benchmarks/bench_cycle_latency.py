@@ -0,0 +1,54 @@
+"""
+Benchmark: /simulate/cycle latency with inline vs. background side effects.
+
+Usage:
+    python benchmarks/bench_cycle_latency.py
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from services import cycle_engine
+from services.dmp_writer import dmp_writer
+from services.side_effect_pipeline import SideEffectPipeline
+from storage.dmp_store import DMPStore
+
+REQUESTS = 2_000
+SUBJECTS = 50
+
+
+def run(client: TestClient, label: str):
+    latencies = []
+    for i in range(REQUESTS):
+        payload = {"subject_id": f"{label}-{i % SUBJECTS}", "action": "act", "intention": f"i{i % 7}"}
+        start = time.perf_counter()
+        client.post("/simulate/cycle", json=payload)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1e3
+    p99 = latencies[int(len(latencies) * 0.99)] * 1e3
+    print(f"  {label:<12} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+
+def main():
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as tmp:
+        dmp_writer.store = DMPStore(Path(tmp) / "dmp_log.jsonl")
+        print(f"/simulate/cycle ({REQUESTS} requests)")
+        run(client, "inline")
+
+        cycle_engine.side_effect_pipeline = SideEffectPipeline(workers=4)
+        run(client, "background")
+        cycle_engine.side_effect_pipeline.shutdown()
+        cycle_engine.side_effect_pipeline = None
+
+
+if __name__ == "__main__":
+    main()
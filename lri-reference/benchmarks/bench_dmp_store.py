@@ -0,0 +1,73 @@
+"""
+Benchmark: per-record open/close DMPStore vs. BufferedDMPStore.
+
+Measures raw append throughput for each durability policy, then
+end-to-end throughput of POST /simulate/cycle with each store plugged
+into the global DMP writer.
+
+Usage:
+    python benchmarks/bench_dmp_store.py
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from fastapi.testclient import TestClient
+from main import app
+from models.decision_record import DecisionRecord
+from services.dmp_writer import dmp_writer
+from storage.dmp_store import DMPStore, BufferedDMPStore, Durability
+
+RAW_RECORDS = 20_000
+CYCLES = 1_000
+
+
+def make_stores(tmp: Path):
+    yield "per-record open/close", DMPStore(tmp / "plain.jsonl")
+    for policy in Durability.ALL:
+        yield f"buffered ({policy})", BufferedDMPStore(tmp / f"{policy}.jsonl", durability=policy)
+
+
+def bench_raw(store) -> float:
+    record = DecisionRecord("agent", "explore", "move", "interaction", datetime.now(timezone.utc))
+    start = time.perf_counter()
+    for _ in range(RAW_RECORDS):
+        store.append(record)
+    store.close()
+    return RAW_RECORDS / (time.perf_counter() - start)
+
+
+def bench_cycle(client: TestClient, store, run: int) -> float:
+    previous = dmp_writer.store
+    dmp_writer.store = store
+    try:
+        start = time.perf_counter()
+        for i in range(CYCLES):
+            client.post("/simulate/cycle", json={"subject_id": f"bench-{run}-{i}", "action": "act", "intention": "bench"})
+        store.close()
+        return CYCLES / (time.perf_counter() - start)
+    finally:
+        dmp_writer.store = previous
+
+
+def main():
+    client = TestClient(app)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        print(f"Raw append ({RAW_RECORDS} records)")
+        for name, store in make_stores(tmp / "raw"):
+            print(f"  {name:<28} {bench_raw(store):>12,.0f} records/s")
+
+        print(f"/simulate/cycle ({CYCLES} requests)")
+        # Fresh subjects per run so trajectory growth doesn't skew later runs
+        for run, (name, store) in enumerate(make_stores(tmp / "cycle")):
+            print(f"  {name:<28} {bench_cycle(client, store, run):>12,.0f} cycles/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: drift lookup latency vs. recorded history size.
+
+Drift is derived from running counters, so latency should stay flat
+from 10 to 1M recorded actions. The full-scan DriftMonitor.calculate
+is shown alongside for comparison (skipped above 100k actions).
+
+Usage:
+    python benchmarks/bench_drift.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.metrics_engine import MetricsEngine
+from services.drift_monitor import DriftMonitor
+
+SIZES = [10, 1_000, 100_000, 1_000_000]
+DISTINCT_INTENTIONS = 50
+REPEAT = 2_000
+
+
+def bench(size: int):
+    engine = MetricsEngine()
+    monitor = DriftMonitor()
+    for i in range(size):
+        engine.record("agent", "act", f"intent_{i % DISTINCT_INTENTIONS}")
+
+    incremental = timeit.timeit(lambda: monitor.from_summary(engine.summary("agent")), number=REPEAT) / REPEAT
+    full_scan = None
+    if size <= 100_000:
+        number = max(1, REPEAT // max(1, size // 100))
+        full_scan = timeit.timeit(lambda: monitor.calculate(engine.snapshot("agent")["intentions"]), number=number) / number
+    return incremental, full_scan
+
+
+def main():
+    print(f"{'actions':>10} | {'incremental (us)':>16} | {'full scan (us)':>14}")
+    for size in SIZES:
+        incremental, full_scan = bench(size)
+        full = f"{full_scan * 1e6:14.2f}" if full_scan is not None else f"{'-':>14}"
+        print(f"{size:>10} | {incremental * 1e6:16.2f} | {full}")
+
+
+if __name__ == "__main__":
+    main()
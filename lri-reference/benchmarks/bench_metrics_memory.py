@@ -0,0 +1,94 @@
+"""
+Memory benchmark: MetricsEngine footprint for many agents with long histories.
+
+Each mode runs in a fresh process and reports resident memory growth
+after every agent has recorded its actions. "legacy" is the previous
+layout (one list of intention strings plus a Counter of strings per
+agent) for comparison.
+With history_limit=0 the footprint follows distinct intentions per agent
+and stays flat as actions grow.
+
+The full 10k agents x 10k actions run takes about two minutes per mode;
+pass smaller sizes for a quick check.
+
+Usage:
+    python benchmarks/bench_metrics_memory.py [agents] [actions]
+"""
+import os
+import resource
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from multiprocessing import get_context
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.metrics_engine import MetricsEngine
+
+DISTINCT_INTENTIONS = 20
+INTENTIONS = [f"intent_{i}" for i in range(DISTINCT_INTENTIONS)]
+MODES = ["legacy", "full history", "history_limit=1000", "history_limit=0", "spill (limit=1000)"]
+
+
+class LegacyMetrics:
+    def __init__(self):
+        self._data = defaultdict(lambda: {"actions": 0, "intentions": [], "counts": Counter()})
+
+    def record(self, agent_id, action, intention):
+        m = self._data[agent_id]
+        m["actions"] += 1
+        m["intentions"].append(intention)
+        m["counts"][intention] += 1
+
+
+def _engine(mode: str, spill_dir: str):
+    if mode == "legacy":
+        return LegacyMetrics()
+    if mode == "full history":
+        return MetricsEngine()
+    if mode == "history_limit=1000":
+        return MetricsEngine(history_limit=1000)
+    if mode == "history_limit=0":
+        return MetricsEngine(history_limit=0)
+    return MetricsEngine(history_limit=1000, spill_dir=spill_dir)
+
+
+def _rss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # Peak instead of current RSS (kB on Linux, bytes on macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run(mode: str, agents: int, actions: int):
+    with tempfile.TemporaryDirectory() as spill_dir:
+        baseline = _rss()
+        started = time.perf_counter()
+        engine = _engine(mode, spill_dir)
+        for a in range(agents):
+            agent_id = f"agent_{a}"
+            for n in range(actions):
+                engine.record(agent_id, "act", INTENTIONS[(n * 7 + a) % DISTINCT_INTENTIONS])
+        elapsed = time.perf_counter() - started
+        current = _rss() - baseline
+    return current, elapsed
+
+
+def main():
+    agents = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    actions = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+    print(f"{agents} agents x {actions} actions, {DISTINCT_INTENTIONS} distinct intentions")
+    print(f"{'mode':>20} | {'memory (MB)':>11} | {'bytes/agent':>11} | {'time (s)':>8}")
+    ctx = get_context("spawn")
+    with ctx.Pool(1, maxtasksperchild=1) as pool:
+        for mode in MODES:
+            current, elapsed = pool.apply(run, (mode, agents, actions))
+            print(f"{mode:>20} | {current / 2**20:11.1f} | {current / agents:11.0f} | {elapsed:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
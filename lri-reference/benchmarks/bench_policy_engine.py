@@ -0,0 +1,81 @@
+"""
+Micro-benchmark: action policy evaluation vs. number of rules.
+
+Compares the compiled policy (exact dict + prefix trie, with and without
+the per-action memo) against scanning the pattern list on every request.
+Half of the generated rules are prefix patterns, half exact actions.
+
+Usage:
+    python benchmarks/bench_policy_engine.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.policy_engine import CompiledPolicy
+
+RULE_COUNTS = [100, 1_000, 5_000, 20_000]
+EVALUATIONS = 100_000
+DISTINCT_ACTIONS = 10_000
+OPERATIONS = ["read", "write", "reflect", "archive"]
+
+
+def make_rules(count: int, rng: random.Random) -> dict:
+    actions = {}
+    for i in range(count):
+        name = f"{rng.choice(['pay', 'sync', 'reflect', 'move'])}_{i:05d}"
+        actions[name + ("*" if i % 2 else "")] = rng.choice(OPERATIONS)
+    return {
+        "coherence": {"thresholds": {"min_for_read": 0.0, "min_for_write": 0.3,
+                                     "min_for_reflect": 0.4, "min_for_archive": 0.6}},
+        "authority": {"actions": actions},
+    }
+
+
+def scan(patterns: list, action: str):
+    # What evaluating the raw rule list per request costs
+    best, best_len = None, -1
+    for pattern, bound in patterns:
+        if pattern.endswith("*"):
+            prefix = pattern[:-1]
+            if action.startswith(prefix) and len(prefix) > best_len:
+                best, best_len = bound, len(prefix)
+        elif pattern == action:
+            return bound
+    return best
+
+
+def timed(fn, actions) -> float:
+    started = time.perf_counter()
+    for action in actions:
+        fn(action)
+    return (time.perf_counter() - started) / len(actions) * 1e6
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{EVALUATIONS} evaluations over {DISTINCT_ACTIONS} distinct actions")
+    print(f"{'rules':>7} | {'compile (ms)':>12} | {'memo (us)':>9} | {'trie (us)':>9} | {'scan (us)':>9}")
+    for count in RULE_COUNTS:
+        rules = make_rules(count, rng)
+        started = time.perf_counter()
+        policy = CompiledPolicy(rules, drift_threshold=0.5)
+        compile_ms = (time.perf_counter() - started) * 1e3
+
+        names = list(rules["authority"]["actions"])
+        pool = [rng.choice(names).rstrip("*") + rng.choice(["", "_x", "_detail"]) for _ in range(DISTINCT_ACTIONS)]
+        actions = [rng.choice(pool) for _ in range(EVALUATIONS)]
+
+        memo = timed(policy.drift_bound, actions)
+        trie = timed(policy._lookup, actions)
+        patterns = [(p, policy.max_drift[op]) for p, op in rules["authority"]["actions"].items()]
+        sample = actions[:max(100, EVALUATIONS // count)]
+        linear = timed(lambda a: scan(patterns, a), sample)
+        print(f"{count:>7} | {compile_ms:12.1f} | {memo:9.2f} | {trie:9.2f} | {linear:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Micro-benchmark: per-request overhead of the rate limiter.
+
+"check" times RateLimiter.check alone. The middleware rows drive
+RateLimitMiddleware around a trivial ASGI app directly (no HTTP client),
+so the difference between "passthrough" and "enforcing" is what the
+limiter adds to every request.
+
+Usage:
+    python benchmarks/bench_rate_limit.py
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from api.rate_limit import RateLimitMiddleware
+from security.access_control import APIKey, AccessScope
+from security.key_store import APIKeyStore
+from services.rate_limiter import RateLimit, RateLimiter
+
+REQUESTS = 100_000
+IDENTITIES = 10_000
+# High enough that nothing is rejected: we time the accounting, not 429s
+LIMIT = RateLimit(10**9, 60)
+
+
+async def _app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b""}
+
+
+async def _send(message):
+    pass
+
+
+def _scope(i: int) -> dict:
+    return {
+        "type": "http", "method": "GET", "path": f"/subject/s{i % IDENTITIES}/continuity",
+        "headers": [(b"x-api-key", f"key-{i % IDENTITIES}".encode())], "query_string": b"",
+        "client": ("127.0.0.1", 5000),
+    }
+
+
+def bench_check():
+    limiter = RateLimiter(default=LIMIT)
+    started = time.perf_counter()
+    for i in range(REQUESTS):
+        limiter.check(f"key:key-{i % IDENTITIES}", AccessScope.READ_CONTINUITY)
+    return time.perf_counter() - started
+
+
+def bench_middleware(limiter):
+    key_store = APIKeyStore()
+    for i in range(IDENTITIES):
+        key_store.register_key(APIKey(f"key-{i}", [AccessScope.READ_CONTINUITY]))
+    middleware = RateLimitMiddleware(_app, key_store=key_store, limiter=limiter)
+    scopes = [_scope(i) for i in range(IDENTITIES)]
+
+    async def drive():
+        for i in range(REQUESTS):
+            await middleware(scopes[i % IDENTITIES], _receive, _send)
+
+    started = time.perf_counter()
+    asyncio.run(drive())
+    return time.perf_counter() - started
+
+
+def main():
+    print(f"{REQUESTS} requests over {IDENTITIES} API keys")
+    rows = [
+        ("check", bench_check()),
+        ("middleware passthrough", bench_middleware(None)),
+        ("middleware enforcing", bench_middleware(RateLimiter(default=LIMIT))),
+    ]
+    for name, elapsed in rows:
+        print(f"  {name:<24} {elapsed / REQUESTS * 1e6:7.2f} us/request")
+
+
+if __name__ == "__main__":
+    main()
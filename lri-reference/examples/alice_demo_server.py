@@ -28,7 +28,7 @@ if "error" in subject.get_subject(subject_id):
 def index():
     # Fetch current state
     subj = subject.get_subject(subject_id)
-    identity = IdentityState.load(subject_id)
+    identity = IdentityState.load(subject_id, history=True)
     trajectory = identity.trajectory
 
     # Calculate drift/coherence
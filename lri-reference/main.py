@@ -1,9 +1,20 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from api import subject, relations, authority, simulate_cycle, observer_routes, economic
+from api.http_cache import conditional, record_tag, relations_tag
+from api.rate_limit import RateLimitMiddleware
 from security.key_store import APIKeyStore
 from security.access_control import AccessScope
 from security.audit_log import AuditLog
+from api.errors import LRIError
+from models.identity_state import GENESIS_HASH
+from services.dmp_writer import dmp_writer
+from services.idempotency import idempotency_store
+from services import cycle_engine
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
+from typing import Optional
+import json
 import uvicorn
 import os
 import sys
@@ -11,10 +22,27 @@ import sys
 # Ensure we can import from api sibling directory if running directly
 sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
-app = FastAPI(title="LRI Integration Service")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Shutdown: run queued side effects, then persist anything still buffered
+    if cycle_engine.side_effect_pipeline is not None:
+        cycle_engine.side_effect_pipeline.shutdown()
+    dmp_writer.close()
+    AuditLog.close()
+    subject.subject_store.close()
+
+app = FastAPI(title="LRI Integration Service", lifespan=lifespan)
+
+@app.exception_handler(LRIError)
+def lri_error_handler(request: Request, exc: LRIError):
+    return JSONResponse(status_code=exc.http_status, content=exc.to_dict(), headers=exc.headers)
 
 key_store = APIKeyStore()
 
+# No-op until services.rate_limiter.rate_limiter is set (see README)
+app.add_middleware(RateLimitMiddleware, key_store=key_store)
+
 # Include the simulation router
 app.include_router(simulate_cycle.router)
 # Include the observer router
@@ -49,33 +77,95 @@ def create_subject_api(s: SubjectModel):
     return subject.create_subject(s.id, s.dict())
 
 @app.get("/subject/{subject_id}")
-def get_subject_api(subject_id: str):
-    return subject.get_subject(subject_id)
+def get_subject_api(subject_id: str, request: Request, response: Response):
+    record = subject.get_subject(subject_id)
+    if "error" in record:
+        return record
+    return conditional(request, response, record_tag(record), ("subject", subject_id), lambda: record)
+
+@app.get("/subject/{subject_id}/trajectory")
+def export_trajectory_api(
+    subject_id: str,
+    from_hash: Optional[str] = None,
+    from_index: Optional[int] = Query(None, ge=0),
+    limit: Optional[int] = Query(None, ge=1)
+):
+    """
+    Streams the trajectory as NDJSON, one step per line, in chain order.
+    `from_hash` starts after the step with that continuity hash (genesis for
+    the whole chain); `from_index` starts at that index. The range is fixed
+    to the head at request time (X-Head-Hash / X-Chain-Length headers).
+    """
+    record = subject.get_subject(subject_id)
+    if "error" in record:
+        raise HTTPException(status_code=404, detail=record["error"])
+    if from_hash is not None and from_index is not None:
+        raise HTTPException(status_code=400, detail="Use either from_hash or from_index")
+
+    chain_length = record.get("chain_length", 0)
+    start = from_index or 0
+    if from_hash is not None and from_hash != GENESIS_HASH:
+        start = subject.find_step_after(subject_id, from_hash, chain_length)
+        if start is None:
+            raise HTTPException(status_code=404, detail="Unknown from_hash")
+    end = chain_length if limit is None else min(chain_length, start + limit)
+
+    lines = (json.dumps(step, default=str) + "\n" for step in subject.iter_trajectory(subject_id, start, end))
+    headers = {"X-Head-Hash": record.get("head_hash") or GENESIS_HASH, "X-Chain-Length": str(chain_length)}
+    return StreamingResponse(lines, media_type="application/x-ndjson", headers=headers)
+
+def _idempotent(scope: str, key: Optional[str], payload: dict, response: Response, compute):
+    # Retries with the same Idempotency-Key get the first response back
+    body, replayed = idempotency_store.run(scope, key, payload, compute)
+    if replayed:
+        response.headers["Idempotent-Replayed"] = "true"
+    return body
 
 @app.post("/ltp_event/")
-def create_ltp_event(event: EventModel):
-    # In a real app, we would store the event itself.
-    # Here we just link it to the subject in LRI.
-    relations.link_subject(event.subject_id, event.event_id, "ltp_event")
-    return {"status": "linked", "event": event.dict()}
+def create_ltp_event(event: EventModel, response: Response,
+                     idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    def link():
+        # In a real app, we would store the event itself.
+        # Here we just link it to the subject in LRI.
+        relations.link_subject(event.subject_id, event.event_id, "ltp_event")
+        return {"status": "linked", "event": event.dict()}
+    return _idempotent("ltp_event", idempotency_key, event.dict(), response, link)
 
 @app.post("/dmp_record/")
-def create_dmp_record(record: DMPModel):
-    # In a real app, we would store the record itself.
-    # Here we just link it to the subject in LRI.
-    relations.link_subject(record.subject_id, record.record_id, "dmp_record")
-    return {"status": "linked", "record": record.dict()}
+def create_dmp_record(record: DMPModel, response: Response,
+                      idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")):
+    def link():
+        # In a real app, we would store the record itself.
+        # Here we just link it to the subject in LRI.
+        relations.link_subject(record.subject_id, record.record_id, "dmp_record")
+        return {"status": "linked", "record": record.dict()}
+    return _idempotent("dmp_record", idempotency_key, record.dict(), response, link)
 
 @app.get("/subject/{subject_id}/relations")
-def list_relations_api(subject_id: str):
-    return {"relations": relations.list_relations(subject_id)}
+def list_relations_api(
+    subject_id: str,
+    request: Request,
+    response: Response,
+    type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000)
+):
+    try:
+        return conditional(request, response, relations_tag(subject_id), ("relations", subject_id, type, cursor, limit),
+                           lambda: relations.list_relations_page(subject_id, type, cursor, limit))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@app.get("/subject/{subject_id}/relations/{relation_type}/count")
+def relation_count_api(subject_id: str, relation_type: str):
+    return relations.relation_count(subject_id, relation_type)
 
 @app.get("/subject/{subject_id}/authority")
 def check_authority_api(subject_id: str, action: str):
     return authority.check_authority(subject_id, action)
 
 @app.get("/subject/{subject_id}/continuity")
-def check_continuity_api(subject_id: str, api_key: str):
+def check_continuity_api(subject_id: str, api_key: str, since_hash: Optional[str] = None):
     key = key_store.get_key(api_key)
     if not key or not key.allows(AccessScope.READ_CONTINUITY):
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -85,7 +175,7 @@ def check_continuity_api(subject_id: str, api_key: str):
         subject_id=subject_id,
         api_key=api_key
     )
-    return authority.validate_continuity(subject_id)
+    return authority.validate_continuity(subject_id, since_hash)
 
 # -------------------------------
 # Run service
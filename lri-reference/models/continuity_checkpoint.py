@@ -0,0 +1,8 @@
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class ContinuityCheckpoint:
+    subject_id: str
+    index: int          # Trajectory position whose continuity_hash is attested
+    continuity_hash: str
+    signature: str      # HMAC-SHA256 over subject_id, index and hash
@@ -2,27 +2,43 @@ from api import subject
 import hashlib
 import json
 
+GENESIS_HASH = "0" * 64
+
+def calculate_transition_hash(prev_hash, decision_data):
+    """
+    Calculates the cryptographic hash of the transition.
+    Chain: prev_hash -> decision -> timestamp -> hash
+    """
+    payload = {
+        "prev_hash": prev_hash,
+        "action": decision_data.get("action"),
+        "intention": decision_data.get("intention"),
+        "timestamp": decision_data.get("timestamp"),
+        # In a full impl, we would include relation hashes here
+    }
+    # Use a stable JSON serialization for hashing
+    serialized = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+class TrajectoryConflict(Exception):
+    """Raised when the stored chain advanced since this state was loaded."""
+
 class IdentityState:
-    def __init__(self, subject_id, trajectory=None, last_hash=None):
+    def __init__(self, subject_id, trajectory=None, last_hash=None, persisted_length=None):
         self.subject_id = subject_id
+        # Loaded history (if requested) followed by steps added since the load
         self.trajectory = trajectory or []
-        self.last_hash = last_hash or "0" * 64  # Genesis hash
+        self.last_hash = last_hash or GENESIS_HASH
+        # Number of steps already in the store; only later steps are written on save
+        self.persisted_length = len(self.trajectory) if persisted_length is None else persisted_length
+        self._pending = []
+
+    @property
+    def chain_length(self):
+        return self.persisted_length + len(self._pending)
 
     def _calculate_hash(self, prev_hash, decision_data):
-        """
-        Calculates the cryptographic hash of the transition.
-        Chain: prev_hash -> decision -> timestamp -> hash
-        """
-        payload = {
-            "prev_hash": prev_hash,
-            "action": decision_data.get("action"),
-            "intention": decision_data.get("intention"),
-            "timestamp": decision_data.get("timestamp"),
-            # In a full impl, we would include relation hashes here
-        }
-        # Use a stable JSON serialization for hashing
-        serialized = json.dumps(payload, sort_keys=True, default=str)
-        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+        return calculate_transition_hash(prev_hash, decision_data)
 
     def evolve(self, decision):
         # decision is a dict from dmp.record_decision
@@ -32,12 +48,14 @@ class IdentityState:
 
         # Update state
         self.last_hash = new_hash
-        self.trajectory.append({
+        step = {
             "action": decision.get("action"),
             "intention": decision.get("intention"),
             "timestamp": decision.get("timestamp"),
             "continuity_hash": new_hash
-        })
+        }
+        self.trajectory.append(step)
+        self._pending.append(step)
 
     def snapshot(self):
         return {
@@ -47,33 +65,25 @@ class IdentityState:
         }
 
     @classmethod
-    def load(cls, subject_id):
-        # Try to get subject from in-memory store
+    def load(cls, subject_id, history=False):
+        """
+        Loads the head hash and chain length. The trajectory itself is only
+        fetched when `history` is True; otherwise `trajectory` starts empty.
+        """
         subj_data = subject.get_subject(subject_id)
         if "error" in subj_data:
             return cls(subject_id)
 
-        # Load trajectory if it exists in metadata, otherwise empty
-        trajectory = subj_data.get("trajectory", [])
-        last_hash = subj_data.get("head_hash")
-
-        # If loading an old object without hash, try to find it in trajectory or init genesis
-        if not last_hash:
-            if trajectory:
-                # If we have history but no head_hash, use the last item's hash or default
-                last_hash = trajectory[-1].get("continuity_hash", "0" * 64)
-            else:
-                last_hash = "0" * 64
-
-        return cls(subject_id, trajectory, last_hash)
+        last_hash = subj_data.get("head_hash") or GENESIS_HASH
+        chain_length = subj_data.get("chain_length", 0)
+        trajectory = subject.get_trajectory(subject_id) if history else []
+        return cls(subject_id, trajectory, last_hash, persisted_length=chain_length)
 
     def save(self):
-        # Update the subject's metadata with the new trajectory and hash
-        update_data = {
-            "trajectory": self.trajectory,
-            "head_hash": self.last_hash
-        }
-
+        """
+        Appends the steps added since load and advances the head hash.
+        Write volume is proportional to the new steps, not the chain length.
+        """
         current = subject.get_subject(self.subject_id)
         if "error" in current:
             # Create if doesn't exist (auto-provisioning for simulation)
@@ -81,7 +91,11 @@ class IdentityState:
                 "id": self.subject_id,
                 "name": "Simulated Agent",
                 "role": "simulated",
-                **update_data
+                "head_hash": GENESIS_HASH
             })
-        else:
-            subject.update_subject(self.subject_id, update_data)
+
+        result = subject.append_trajectory(self.subject_id, self._pending, self.last_hash, self.persisted_length)
+        if "error" in result:
+            raise TrajectoryConflict(f"Chain of {self.subject_id} changed since it was loaded")
+        self.persisted_length += len(self._pending)
+        self._pending = []
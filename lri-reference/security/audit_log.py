@@ -1,14 +1,198 @@
-from datetime import datetime
+import json
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# json.dumps(..., default=str) builds a new encoder per call
+_encoder = json.JSONEncoder(default=str)
+
+class Overflow:
+    DROP = "drop"    # Discard the entry and count it in `dropped`
+    BLOCK = "block"  # Wait for room (up to `block_timeout`, then drop)
+
+    ALL = (DROP, BLOCK)
+
+
+class AuditSink:
+    """
+    Writes audit entries as JSON lines from a background thread.
+
+    Callers only timestamp and enqueue; the writer drains the bounded buffer
+    in batches of up to `batch_size` (or every `flush_interval` seconds),
+    appends them to `path` and rotates the file once it exceeds `max_bytes`
+    (keeping `backup_count` old files: path.1, path.2...). When `max_queue`
+    entries are pending, `overflow` decides whether to drop or block.
+    """
+
+    def __init__(
+        self,
+        path: str = "audit_log.jsonl",
+        max_bytes: int = 10 * 1024 * 1024,
+        backup_count: int = 5,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 10_000,
+        overflow: str = Overflow.DROP,
+        block_timeout: float | None = None,
+    ):
+        if overflow not in Overflow.ALL:
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        if batch_size < 1 or max_queue < 1:
+            raise ValueError("batch_size and max_queue must be positive integers")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        # (epoch seconds, entry); deque appends need no lock on the caller side
+        self._pending = deque()
+        self._writing = False
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._file = None
+        self._ts_second = None
+        self._ts_prefix = ""
+        self._closed = False
+        self._writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._writer.start()
+
+    def write(self, entry: dict):
+        """Queues an entry (stamped with "ts") without doing any I/O on the caller's thread."""
+        if self._closed:
+            raise RuntimeError("Audit sink is closed")
+        if len(self._pending) >= self.max_queue and not self._wait_for_room():
+            self.dropped += 1
+            return
+        self._pending.append((time.time(), entry))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def _wait_for_room(self) -> bool:
+        if self.overflow == Overflow.DROP:
+            return False
+        self._wake.set()
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._pending) < self.max_queue or self._closed,
+                                       timeout=self.block_timeout) and not self._closed
+
+    def _open(self):
+        if self._file is None:
+            if self.path.parent != Path('.'):
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+        if self.backup_count < 1:
+            self.path.unlink(missing_ok=True)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            older = self.path.with_name(f"{self.path.name}.{i}")
+            if older.exists():
+                older.replace(self.path.with_name(f"{self.path.name}.{i + 1}"))
+        self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+
+    def _timestamp(self, ts: float) -> str:
+        # ISO 8601 UTC; the date/time part is formatted once per second
+        second = int(ts)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._ts_prefix}.{int((ts - second) * 1e6):06d}+00:00"
+
+    def _serialize(self, ts: float, entry: dict) -> str:
+        return _encoder.encode({"ts": self._timestamp(ts), **entry}) + "\n"
+
+    def _write_batch(self, batch: list):
+        data = "".join(self._serialize(ts, entry) for ts, entry in batch)
+        f = self._open()
+        if self.max_bytes and f.tell() and f.tell() + len(data) > self.max_bytes:
+            self._rotate()
+            f = self._open()
+        f.write(data)
+        f.flush()
+
+    def _drain(self):
+        while self._pending:
+            with self._cond:
+                self._writing = True
+            batch = []
+            while self._pending and len(batch) < self.batch_size:
+                batch.append(self._pending.popleft())
+            try:
+                self._write_batch(batch)
+            except Exception:
+                logger.exception("Failed to write %d audit entries", len(batch))
+            finally:
+                with self._cond:
+                    self._writing = False
+                    self._cond.notify_all()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def flush(self):
+        """Blocks until every queued entry has been written."""
+        self._wake.set()
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending and not self._writing)
+
+    def close(self):
+        """Writes what is queued and stops the writer. Idempotent."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        with self._cond:
+            self._cond.notify_all()
 
 
 class AuditLog:
+    # Created on first use (at `default_path`); replace with a configured AuditSink at startup
+    sink: AuditSink | None = None
+    default_path = "audit_log.jsonl"
+    _lock = threading.Lock()
+
+    @classmethod
+    def _sink(cls) -> AuditSink:
+        if cls.sink is None:
+            with cls._lock:
+                if cls.sink is None:
+                    cls.sink = AuditSink(cls.default_path)
+        return cls.sink
+
     @staticmethod
     def record(event: str, subject_id: str | None = None, api_key: str | None = None):
         entry = {
-            "ts": datetime.utcnow().isoformat(),
             "event": event,
             "subject_id": subject_id,
             "api_key": api_key,
         }
-        # MVP: stdout / file
-        print("[AUDIT]", entry)
+        AuditLog._sink().write(entry)
+
+    @classmethod
+    def close(cls):
+        """Drains and closes the sink; a later record() starts a new default one."""
+        with cls._lock:
+            sink, cls.sink = cls.sink, None
+        if sink is not None:
+            sink.close()
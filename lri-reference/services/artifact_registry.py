@@ -1,22 +1,88 @@
-from typing import List, Optional
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime, timedelta
+from itertools import count
+from typing import Deque, Dict, List, Optional, Tuple
 from models.economic_artifact import EconomicArtifact
 
 class ArtifactRegistry:
-    """Хранилище экспортируемых артефактов, read-only."""
-    def __init__(self):
-        self._registry: List[EconomicArtifact] = []
+    """
+    Хранилище экспортируемых артефактов, read-only.
+
+    Indexed by (subject_id, artifact_type) with O(1) latest-by-type lookup.
+    Retention: keep the last `max_per_type` artifacts per subject and type,
+    and/or drop artifacts older than `ttl_seconds`. Expired artifacts are
+    pruned lazily when their bucket is touched, and every bucket is swept
+    once per as many registrations as there are buckets (amortized O(1)),
+    so idle subjects are cleaned up too.
+    """
+    def __init__(self, max_per_type: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        if max_per_type is not None and max_per_type < 1:
+            raise ValueError("max_per_type must be a positive integer")
+        self.max_per_type = max_per_type
+        self.ttl = timedelta(seconds=ttl_seconds) if ttl_seconds else None
+        self._by_type: Dict[Tuple[str, str], Deque[Tuple[int, EconomicArtifact]]] = {}
+        # Per-subject view in registration order, for listing
+        self._by_subject: Dict[str, "OrderedDict[int, EconomicArtifact]"] = {}
+        self._seq = count()
+        self._registered_since_sweep = 0
+        self._lock = threading.Lock()
+
+    def _evict_oldest(self, key: Tuple[str, str]):
+        # Caller must hold the lock
+        seq, artifact = self._by_type[key].popleft()
+        subject_artifacts = self._by_subject[artifact.subject_id]
+        del subject_artifacts[seq]
+        if not subject_artifacts:
+            del self._by_subject[artifact.subject_id]
+        if not self._by_type[key]:
+            del self._by_type[key]
+
+    def _prune(self, key: Tuple[str, str]):
+        # Caller must hold the lock
+        bucket = self._by_type.get(key)
+        while bucket:
+            expired = self.ttl is not None and bucket[0][1].created_at < datetime.utcnow() - self.ttl
+            over_limit = self.max_per_type is not None and len(bucket) > self.max_per_type
+            if not (expired or over_limit):
+                break
+            self._evict_oldest(key)
+            bucket = self._by_type.get(key)
 
     def register_artifact(self, artifact: EconomicArtifact):
-        self._registry.append(artifact)
+        key = (artifact.subject_id, artifact.artifact_type)
+        with self._lock:
+            seq = next(self._seq)
+            self._by_type.setdefault(key, deque()).append((seq, artifact))
+            self._by_subject.setdefault(artifact.subject_id, OrderedDict())[seq] = artifact
+            self._prune(key)
+            if self.ttl is not None:
+                self._registered_since_sweep += 1
+                if self._registered_since_sweep >= len(self._by_type):
+                    self._sweep()
+
+    def _sweep(self):
+        # Caller must hold the lock
+        self._registered_since_sweep = 0
+        for key in list(self._by_type):
+            self._prune(key)
 
     def list_exportable_artifacts(self, subject_id: str) -> List[EconomicArtifact]:
-        return [a for a in self._registry if a.subject_id == subject_id]
+        with self._lock:
+            if self.ttl is not None:
+                types = {a.artifact_type for a in self._by_subject.get(subject_id, {}).values()}
+                for artifact_type in types:
+                    self._prune((subject_id, artifact_type))
+            return list(self._by_subject.get(subject_id, {}).values())
 
     def get_artifact(self, subject_id: str, artifact_type: str) -> Optional[EconomicArtifact]:
-        for a in self._registry:
-            if a.subject_id == subject_id and a.artifact_type == artifact_type:
-                return a
-        return None
+        """Returns the most recently registered artifact of this type."""
+        key = (subject_id, artifact_type)
+        with self._lock:
+            self._prune(key)
+            bucket = self._by_type.get(key)
+            return bucket[-1][1] if bucket else None
 
-# Singleton instance to be shared across services and API
-artifact_registry = ArtifactRegistry()
+# Singleton instance to be shared across services and API.
+# Cycle snapshots accumulate per subject, so only the most recent ones are kept.
+artifact_registry = ArtifactRegistry(max_per_type=100)
@@ -1,15 +1,32 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from models.identity_state import IdentityState
+from services.policy_engine import PolicyEngine
 
 class AuthorityPolicy:
     """
     Authority Policy Engine.
     Determines if a proposed action is authorized based on identity state,
     history, and context.
+
+    Action rules come from protocol/lri/schema/rules/*.yaml, compiled once by
+    a PolicyEngine (and recompiled when the files change).
     """
 
-    def __init__(self, drift_threshold: float = 0.5):
-        self.drift_threshold = drift_threshold
+    def __init__(self, drift_threshold: Optional[float] = None, engine: Optional[PolicyEngine] = None):
+        if engine is None:
+            engine = PolicyEngine() if drift_threshold is None else PolicyEngine(drift_threshold=drift_threshold)
+        elif drift_threshold is not None:
+            engine.drift_threshold = drift_threshold
+        self.engine = engine
+
+    @property
+    def drift_threshold(self) -> float:
+        # Owned by the engine, which compiles it into the critical_* bound
+        return self.engine.drift_threshold
+
+    @drift_threshold.setter
+    def drift_threshold(self, value: float):
+        self.engine.drift_threshold = value
 
     def is_authorized(self, identity: IdentityState, action: str, context: Dict[str, Any], drift_score: float = 0.0) -> bool:
         """
@@ -21,12 +38,11 @@ class AuthorityPolicy:
         3. Consistency Check: Ensure chain integrity (implicit in load, but could be explicit).
         """
 
-        # Policy 1: Drift Threshold
-        # If drift is high, we might reject "critical" actions or just flag them.
-        # For this reference implementation, we reject "critical_action" if drift > threshold.
-        if drift_score > self.drift_threshold:
-            if action.startswith("critical_"):
-                return False
+        # Policy 1: Drift / Coherence Thresholds
+        # Action patterns (authority.rules.yaml) map to coherence thresholds
+        # (coherence.rules.yaml); "critical_*" actions are bounded by drift_threshold.
+        if not self.engine.allows(action, drift_score):
+            return False
 
         # Policy 2: History/Reputation (Placeholder)
         # if len(identity.trajectory) < 5 and action == "high_trust_op":
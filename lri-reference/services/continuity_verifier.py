@@ -0,0 +1,176 @@
+import hashlib
+import hmac
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+from api import subject
+from models.identity_state import IdentityState, GENESIS_HASH, calculate_transition_hash
+from models.continuity_checkpoint import ContinuityCheckpoint
+from services.security import SECRET_KEY
+
+
+def verify_chain(steps: List[dict], start_hash: str, head_hash: str) -> Tuple[bool, Optional[int]]:
+    """
+    Re-hashes `steps` starting from `start_hash` and checks every stored
+    continuity_hash and the final head. Returns (valid, broken_offset), where
+    broken_offset is the position in `steps` of the first mismatch
+    (len(steps) if only the head disagrees).
+
+    Module-level and pure so it can run in a worker process.
+    """
+    prev_hash = start_hash
+    for offset, step in enumerate(steps):
+        prev_hash = calculate_transition_hash(prev_hash, step)
+        if prev_hash != step.get("continuity_hash"):
+            return False, offset
+    if prev_hash != head_hash:
+        return False, len(steps)
+    return True, None
+
+
+class ContinuityVerifier:
+    """
+    Re-verifies identity hash chains.
+
+    Every `checkpoint_interval` committed steps, the segment since the previous
+    checkpoint is re-hashed and, if valid, its head is stored as an HMAC-signed
+    checkpoint. Routine verification then trusts the latest valid checkpoint
+    and only re-hashes the suffix after it; `full=True` re-hashes from genesis.
+    """
+
+    SCAN_CHUNK = 256
+
+    def __init__(self, checkpoint_interval: int = 1000, secret_key: str = SECRET_KEY):
+        if checkpoint_interval < 1:
+            raise ValueError("checkpoint_interval must be a positive integer")
+        self.checkpoint_interval = checkpoint_interval
+        self._key = secret_key.encode("utf-8")
+        self._checkpoints: Dict[str, List[ContinuityCheckpoint]] = {}
+
+    def _sign(self, subject_id: str, index: int, continuity_hash: str) -> str:
+        message = f"{subject_id}:{index}:{continuity_hash}".encode("utf-8")
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()
+
+    def _is_valid(self, checkpoint: ContinuityCheckpoint, chain_length: int) -> bool:
+        expected = self._sign(checkpoint.subject_id, checkpoint.index, checkpoint.continuity_hash)
+        if not hmac.compare_digest(expected, checkpoint.signature) or checkpoint.index >= chain_length:
+            return False
+        step = subject.get_trajectory(checkpoint.subject_id, checkpoint.index, checkpoint.index + 1)
+        return bool(step) and step[0].get("continuity_hash") == checkpoint.continuity_hash
+
+    def checkpoints(self, subject_id: str) -> List[ContinuityCheckpoint]:
+        return list(self._checkpoints.get(subject_id, []))
+
+    def _latest_valid_checkpoint(self, subject_id: str, chain_length: int) -> Optional[ContinuityCheckpoint]:
+        for checkpoint in reversed(self._checkpoints.get(subject_id, [])):
+            if self._is_valid(checkpoint, chain_length):
+                return checkpoint
+        return None
+
+    def on_commit(self, identity: IdentityState) -> Optional[ContinuityCheckpoint]:
+        """
+        Called after a cycle commits. Signs a new checkpoint once the chain has
+        grown `checkpoint_interval` steps past the previous one (amortized O(1)).
+        """
+        head_index = identity.chain_length - 1
+        previous = self._latest_valid_checkpoint(identity.subject_id, identity.chain_length)
+        start = previous.index + 1 if previous else 0
+        if head_index + 1 - start < self.checkpoint_interval:
+            return None
+
+        start_hash = previous.continuity_hash if previous else GENESIS_HASH
+        steps = subject.get_trajectory(identity.subject_id, start, identity.chain_length)
+        valid, _ = verify_chain(steps, start_hash, identity.last_hash)
+        if not valid:
+            # Never attest a broken segment; verification will report it
+            return None
+
+        checkpoint = ContinuityCheckpoint(
+            subject_id=identity.subject_id,
+            index=head_index,
+            continuity_hash=identity.last_hash,
+            signature=self._sign(identity.subject_id, head_index, identity.last_hash)
+        )
+        self._checkpoints.setdefault(identity.subject_id, []).append(checkpoint)
+        return checkpoint
+
+    def _plan(self, identity: IdentityState, since_hash: Optional[str], full: bool) -> Tuple[Optional[int], str]:
+        """
+        Returns (start_index, start_hash): re-hashing begins at trajectory[start_index].
+        start_index is None if `since_hash` is not part of the chain.
+        """
+        if since_hash is not None:
+            if since_hash == GENESIS_HASH:
+                return 0, GENESIS_HASH
+            # Backward scan: cost is proportional to the suffix being verified
+            start = subject.find_step_after(identity.subject_id, since_hash, identity.chain_length, self.SCAN_CHUNK)
+            return start, since_hash
+        if not full:
+            checkpoint = self._latest_valid_checkpoint(identity.subject_id, identity.chain_length)
+            if checkpoint:
+                return checkpoint.index + 1, checkpoint.continuity_hash
+        return 0, GENESIS_HASH
+
+    @staticmethod
+    def _result(identity: IdentityState, start_index: Optional[int], start_hash: str,
+                valid: bool, broken_offset: Optional[int]) -> dict:
+        result = {
+            "subject_id": identity.subject_id,
+            "head_hash": identity.last_hash,
+            "chain_length": identity.chain_length,
+            "status": "verified" if valid else "broken",
+            "verified_from": start_hash,
+            "verified_steps": identity.chain_length - start_index if start_index is not None else 0
+        }
+        if start_index is None:
+            result["status"] = "unknown_since_hash"
+        elif not valid:
+            result["broken_at"] = start_index + broken_offset
+        return result
+
+    def verify(self, subject_id: str, since_hash: Optional[str] = None, full: bool = False) -> dict:
+        """
+        Verifies the chain of one subject from `since_hash` (or the latest
+        checkpoint, or genesis when `full`) up to the head hash.
+        """
+        identity = IdentityState.load(subject_id)
+        start_index, start_hash = self._plan(identity, since_hash, full)
+        if start_index is None:
+            return self._result(identity, None, start_hash, False, None)
+        # Bounded by the record just read: a cycle may commit meanwhile
+        steps = subject.get_trajectory(subject_id, start_index, identity.chain_length)
+        valid, broken_offset = verify_chain(steps, start_hash, identity.last_hash)
+        return self._result(identity, start_index, start_hash, valid, broken_offset)
+
+    def verify_many(self, subject_ids: Iterable[str], full: bool = False,
+                    executor: Optional[Executor] = None, max_workers: Optional[int] = None) -> List[dict]:
+        """
+        Bulk verification: re-hashing is spread across a process pool.
+        Pass `executor` to reuse a pool; otherwise one is created for the call.
+        """
+        jobs = []
+        for subject_id in subject_ids:
+            identity = IdentityState.load(subject_id)
+            start_index, start_hash = self._plan(identity, None, full)
+            jobs.append((identity, start_index, start_hash))
+
+        own_executor = executor is None
+        if own_executor:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+        try:
+            futures = [
+                executor.submit(verify_chain,
+                                subject.get_trajectory(identity.subject_id, start_index, identity.chain_length),
+                                start_hash, identity.last_hash)
+                for identity, start_index, start_hash in jobs
+            ]
+            results = []
+            for (identity, start_index, start_hash), future in zip(jobs, futures):
+                valid, broken_offset = future.result()
+                results.append(self._result(identity, start_index, start_hash, valid, broken_offset))
+            return results
+        finally:
+            if own_executor:
+                executor.shutdown()
+
+# Global instance
+continuity_verifier = ContinuityVerifier()
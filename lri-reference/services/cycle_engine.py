@@ -1,4 +1,4 @@
-from models.identity_state import IdentityState
+from models.identity_state import IdentityState, TrajectoryConflict
 from models.metrics import AgentMetrics
 from services.metrics_engine import metrics_engine
 from services.drift_monitor import drift_monitor
@@ -6,24 +6,68 @@ from services.dmp_writer import dmp_writer
 from services.authority_policy import authority_policy
 from models.economic_artifact import EconomicArtifact
 from services.artifact_registry import artifact_registry
+from services.continuity_verifier import continuity_verifier
+from services.subject_locks import subject_locks
+from services.observer import observer_service
+from services.side_effect_pipeline import PipelineFull
+from api.errors import LRIError, diff_conflict
 from fastapi import HTTPException
 import dmp
 import ltp
-
-def run_identity_cycle(payload: dict):
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Opt-in: when set to a SideEffectPipeline, everything after the hash-chain
+# commit (metrics, DMP log, LTP transmission, artifacts) runs in the
+# background and the cycle returns as soon as `identity.save()` is done.
+# The response then carries no "metrics"; read them from the Observer.
+# Side effects are never dropped: if the pipeline is saturated (or shut
+# down) they run inline on the request path instead, which is the
+# backpressure. Such a cycle's effects may then run before earlier cycles'
+# effects of the same subject that are still queued.
+side_effect_pipeline = None
+
+# Synchronous side effects that raised after their cycle committed (logged;
+# the cycle still succeeds, like a failed task in the pipeline)
+side_effect_failures = 0
+
+def run_identity_cycle(payload: dict, history: bool = True):
+    """
+    Runs one identity cycle. With `history=False` the trajectory is not
+    loaded and the result carries only the new step and head hash:
+    {"subject_id", "step", "head_hash", "chain_length"[, "metrics"]}.
+    The LTP snapshot of such a cycle likewise carries only the new step.
+    """
+    # Serialize load -> evolve -> save per subject; other subjects proceed in parallel
+    with subject_locks.lock(payload["subject_id"]):
+        return _run_identity_cycle(payload, history)
+
+def _commit(identity: IdentityState):
+    """
+    Persists new steps. The store's compare-and-swap on chain length guards
+    against writers outside this process; losing the race is retryable.
+    """
+    try:
+        identity.save()
+    except TrajectoryConflict:
+        raise diff_conflict([{"subject_id": identity.subject_id, "expected_length": identity.persisted_length}])
+    continuity_verifier.on_commit(identity)
+
+def _run_identity_cycle(payload: dict, history: bool = True):
     subject_id = payload["subject_id"]
     action = payload["action"]
     intention = payload.get("intention", "unknown")
 
     # 1. Load identity
-    identity = IdentityState.load(subject_id)
+    # History is only needed for the full trajectory in the response
+    identity = IdentityState.load(subject_id, history=history)
 
     # --- Pre-computation for Authority Check ---
     # We need current drift to check authority.
     # In a real system, this might be cached or computed from identity state.
-    # Here we peek at metrics engine.
-    raw_metrics = metrics_engine.snapshot(subject_id)
-    current_drift = drift_monitor.calculate(raw_metrics.get("intentions", []))
+    # Here we peek at the metrics engine's running counters (O(1)).
+    current_drift = drift_monitor.from_summary(metrics_engine.summary(subject_id))
 
     # 2. Authority Check
     if not authority_policy.is_authorized(identity, action, payload.get("context", {}), current_drift):
@@ -43,27 +87,134 @@ def run_identity_cycle(payload: dict):
     identity.evolve(decision)
 
     # 5. Save state (Persist before transmit to ensure consistency)
-    identity.save()
+    _commit(identity)
 
-    # --- Self-Observation (Core Metrics & Drift) ---
-    # Record the event in the Metrics Engine
-    metrics_engine.record(subject_id, action, intention)
+    snapshot = identity.snapshot()
 
-    # DMP-lite: Record the decision immutably (memory, not brain)
-    dmp_writer.record(
-        agent_id=subject_id,
-        intention=intention,
-        decision=action,
-        context="interaction"
-    )
+    _dispatch_side_effects(subject_id, [(action, intention)], snapshot, identity.chain_length)
+    if history:
+        return snapshot
+
+    result = {
+        "subject_id": subject_id,
+        "step": identity.trajectory[-1],
+        "head_hash": identity.last_hash,
+        "chain_length": identity.chain_length
+    }
+    if "metrics" in snapshot:
+        result["metrics"] = snapshot["metrics"]
+    return result
+
+def run_identity_cycles(payloads: list) -> dict:
+    """
+    Batch variant of `run_identity_cycle` for high-volume ingest.
+
+    Decisions are grouped by subject: each identity is loaded once, evolved
+    through all of its decisions in order, saved with a single append, and
+    side effects (DMP log, metrics, LTP, artifact) are emitted once per subject.
+    Authority is checked per decision against drift as of the start of the batch.
+
+    Returns per-item results (in input order) and the new head per subject.
+    """
+    results = [None] * len(payloads)
+    by_subject = {}
+    for index, payload in enumerate(payloads):
+        by_subject.setdefault(payload["subject_id"], []).append(index)
+
+    subjects = {}
+    for subject_id, indexes in by_subject.items():
+        with subject_locks.lock(subject_id):
+            _run_subject_batch(subject_id, [(index, payloads[index]) for index in indexes], results, subjects)
+
+    return {"results": results, "subjects": subjects}
+
+def _run_subject_batch(subject_id: str, items: list, results: list, subjects: dict):
+    identity = IdentityState.load(subject_id)
+    current_drift = drift_monitor.from_summary(metrics_engine.summary(subject_id))
+
+    committed = []
+    for index, payload in items:
+        action = payload["action"]
+        intention = payload.get("intention", "unknown")
+        context = payload.get("context", {})
+        if not authority_policy.is_authorized(identity, action, context, current_drift):
+            results[index] = {"index": index, "subject_id": subject_id, "status": "rejected",
+                              "error": "Action unauthorized by LRI Authority Policy"}
+            continue
+        decision = dmp.record_decision(subject_id=subject_id, action=action, intention=intention, context=context)
+        identity.evolve(decision)
+        committed.append((index, action, intention))
+
+    if not committed:
+        return
+
+    try:
+        _commit(identity)
+    except LRIError as e:
+        for index, _, _ in committed:
+            results[index] = {"index": index, "subject_id": subject_id, "status": "error", **e.to_dict()}
+        return
+    except Exception as e:
+        for index, _, _ in committed:
+            results[index] = {"index": index, "subject_id": subject_id, "status": "error", "error": str(e)}
+        return
+
+    # identity.trajectory holds exactly the steps added by this batch
+    for (index, _, _), step in zip(committed, identity.trajectory):
+        results[index] = {"index": index, "subject_id": subject_id, "status": "committed",
+                          "continuity_hash": step["continuity_hash"]}
+
+    snapshot = identity.snapshot()
+    _dispatch_side_effects(subject_id, [(a, i) for _, a, i in committed], snapshot, identity.chain_length)
+    subjects[subject_id] = {"head_hash": identity.last_hash, "chain_length": identity.chain_length}
+    if "metrics" in snapshot:
+        subjects[subject_id]["metrics"] = snapshot["metrics"]
+
+def _dispatch_side_effects(subject_id: str, decisions: list, snapshot: dict, chain_length: int):
+    if side_effect_pipeline is not None:
+        # The trajectory list keeps growing with later cycles, so hand the
+        # background task a frozen copy of this cycle's view.
+        frozen = dict(snapshot, trajectory=list(snapshot["trajectory"]))
+        try:
+            side_effect_pipeline.submit(subject_id, _apply_side_effects, subject_id, decisions, frozen, chain_length)
+            return
+        except (PipelineFull, RuntimeError):
+            # The DMP record and metrics of a committed decision must not be lost
+            logger.warning("Side effect pipeline unavailable; running side effects of %s inline", subject_id)
+    try:
+        _apply_side_effects(subject_id, decisions, snapshot, chain_length)
+    except Exception:
+        # Committed already: a retry (e.g. with the same Idempotency-Key)
+        # must not see a failure and record the decision again
+        global side_effect_failures
+        side_effect_failures += 1
+        logger.exception("Side effects failed for committed cycle of %s", subject_id)
+
+def _apply_side_effects(subject_id: str, decisions: list, snapshot: dict, chain_length: int):
+    """
+    Post-commit side effects of one or more committed (action, intention)
+    decisions of a subject. Injects "metrics" into `snapshot`.
+    """
+    # --- Self-Observation (Core Metrics & Drift) ---
+    for action, intention in decisions:
+        # Record the event in the Metrics Engine
+        metrics_engine.record(subject_id, action, intention)
+
+        # DMP-lite: Record the decision immutably (memory, not brain)
+        dmp_writer.record(
+            agent_id=subject_id,
+            intention=intention,
+            decision=action,
+            context="interaction"
+        )
 
     # Calculate Drift based on the accumulated history (post-action)
-    raw_metrics = metrics_engine.snapshot(subject_id)
-    drift_score = drift_monitor.calculate(raw_metrics.get("intentions", []))
+    metrics_summary = metrics_engine.summary(subject_id)
+    drift_score = drift_monitor.from_summary(metrics_summary)
 
     # Create the formal metrics contract
     core_metrics = AgentMetrics(
-        actions=raw_metrics.get("actions", 0),
+        actions=metrics_summary["actions"],
         drift=drift_score
     )
     # -----------------------------------------------
@@ -71,7 +222,6 @@ def run_identity_cycle(payload: dict):
     # 5. Transmit context (LTP)
     # The snapshot now implicitly carries the context of this "living" cycle.
     # In a future PR, we might attach `core_metrics` to the LTP payload or LRI state.
-    snapshot = identity.snapshot()
 
     # Inject metrics into the return value for immediate observability in adapters
     snapshot["metrics"] = {
@@ -82,12 +232,18 @@ def run_identity_cycle(payload: dict):
     ltp.transmit_thread(snapshot)
 
     # === Economic Hooks: создаём артефакт для экспорта ===
+    # Reference the committed head instead of copying the trajectory
     artifact_payload = {
-        "identity_state": identity.snapshot(),
+        "identity_state": {
+            "subject_id": subject_id,
+            "head_hash": snapshot["head_hash"],
+            "chain_length": chain_length
+        },
         "drift_score": drift_score,
-        "decisions_count": len(identity.trajectory)
+        "decisions_count": chain_length
     }
     economic_artifact = EconomicArtifact(subject_id, artifact_type="cycle_snapshot", payload=artifact_payload)
     artifact_registry.register_artifact(economic_artifact)
 
-    return snapshot
+    # Materialize the Observer view so audit reads stay O(1)
+    observer_service.on_commit(subject_id, snapshot["head_hash"], chain_length, metrics_summary)
@@ -16,5 +16,13 @@ class DMPWriter:
         )
         self.store.append(record)
 
-# Global instance for reference implementation
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        """Flushes buffered records on shutdown."""
+        self.store.close()
+
+# Global instance for reference implementation.
+# Swap in a batched writer with e.g. `dmp_writer.store = BufferedDMPStore(...)`.
 dmp_writer = DMPWriter(DMPStore())
@@ -12,7 +12,21 @@ class DriftMonitor:
         """
         if not intentions:
             return 0.0
-        return len(set(intentions)) / len(intentions)
+        return self.from_counts(len(set(intentions)), len(intentions))
+
+    def from_counts(self, distinct: int, total: int) -> float:
+        """
+        Same formula as `calculate`, from precomputed counters (O(1)).
+        """
+        if not total:
+            return 0.0
+        return distinct / total
+
+    def from_summary(self, summary: dict) -> float:
+        """
+        Calculates drift from a `MetricsEngine.summary` result.
+        """
+        return self.from_counts(summary["distinct_intentions"], summary["intentions_count"])
 
 # Global instance
 drift_monitor = DriftMonitor()
@@ -0,0 +1,123 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+from api.errors import validation_failed
+
+
+def fingerprint(payload: Any) -> str:
+    """Stable digest of a request payload (key order does not matter)."""
+    serialized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class _Entry:
+    __slots__ = ("fingerprint", "expires_at", "done", "result", "failed")
+
+    def __init__(self, fingerprint: str):
+        self.fingerprint = fingerprint
+        self.expires_at = None
+        self.done = threading.Event()
+        self.result = None
+        self.failed = False
+
+
+class IdempotencyStore:
+    """
+    Remembers the results of write requests by idempotency key.
+
+    The first request with a key runs; its result is kept for `ttl_seconds`
+    and returned to every retry with the same key and payload, so the write
+    is not applied twice. Retries that arrive while the first request is
+    still running wait for it. Failed requests are not remembered, so a
+    retry runs again: `compute` must only fail before it writes (the cycle
+    engine never fails a cycle after its commit, see
+    cycle_engine._dispatch_side_effects). Reusing a key with a different
+    payload is rejected (LRI_007). At most `max_entries` finished keys are
+    kept, the oldest dropped first; keys still running are never dropped.
+    """
+
+    def __init__(self, max_entries: int = 10_000, ttl_seconds: float = 24 * 3600):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.replays = 0
+
+    def _claim(self, key: Hashable, digest: str) -> Tuple[_Entry, bool]:
+        """Returns (entry, owner): the owner runs the request, others wait for it."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at is not None and entry.expires_at <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                return entry, False
+            entry = self._entries[key] = _Entry(digest)
+            # Expired keys sit at the front (insertion order, fixed TTL).
+            # Requests still running are skipped: forgetting one would let a
+            # concurrent retry with its key run the write again
+            excess = len(self._entries) - self.max_entries
+            if excess > 0:
+                finished = []
+                for old_key, old in self._entries.items():
+                    if old.done.is_set():
+                        finished.append(old_key)
+                        if len(finished) == excess:
+                            break
+                for old_key in finished:
+                    del self._entries[old_key]
+            return entry, True
+
+    def run(self, scope: str, idempotency_key: Optional[str], payload: Any, compute: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Runs `compute()` once per (scope, idempotency_key).
+        Returns (result, replayed). Without a key, always runs.
+        """
+        if not idempotency_key:
+            return compute(), False
+        key = (scope, idempotency_key)
+        digest = fingerprint(payload)
+        while True:
+            entry, owner = self._claim(key, digest)
+            if entry.fingerprint != digest:
+                raise validation_failed([{
+                    "field": "Idempotency-Key",
+                    "error": "Key was already used with a different request payload"
+                }])
+            if owner:
+                break
+            entry.done.wait()
+            if not entry.failed:
+                self.replays += 1
+                return entry.result, True
+            # The first attempt failed and was forgotten: run it again
+
+        try:
+            entry.result = compute()
+        except BaseException:
+            entry.failed = True
+            with self._lock:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+            raise
+        finally:
+            entry.expires_at = time.monotonic() + self.ttl_seconds
+            entry.done.set()
+        return entry.result, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global instance
+idempotency_store = IdempotencyStore()
@@ -1,27 +1,171 @@
-from collections import defaultdict
+import hashlib
+import shutil
+import tempfile
+import threading
+import weakref
+from array import array
+from collections import Counter, deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+class _AgentMetrics:
+    __slots__ = ("actions", "total", "history", "counts", "spilled")
+
+    def __init__(self, history):
+        self.actions = 0
+        # Intentions recorded so far (the window may keep fewer in scope)
+        self.total = 0
+        # Interned intention ids: deque in window mode, array('I') otherwise, None if not kept
+        self.history = history
+        # intention id -> occurrences in scope
+        self.counts = Counter()
+        self.spilled = 0
 
 class MetricsEngine:
-    def __init__(self):
-        # Stores raw event data for each agent
-        self._data = defaultdict(lambda: {
-            "actions": 0,
-            "intentions": []
-        })
+    """
+    Per-agent action/intention metrics.
+
+    Intention strings are interned to integer ids shared by all agents, so an
+    agent costs its counters (proportional to its distinct intentions) plus
+    whatever raw history is kept:
+
+    - window: drift only considers the last `window` intentions and the
+      stored history is bounded to that size.
+    - history_limit: keep at most this many raw intentions per agent in
+      memory (0 keeps counters only). Older entries are dropped, or appended
+      to a per-agent file under `spill_dir` if given. Spilled files hold
+      engine-local ids, so each engine spills into its own subdirectory of
+      `spill_dir`, removed by close() (or when the engine is collected).
+    """
+
+    def __init__(self, window: Optional[int] = None, history_limit: Optional[int] = None,
+                 spill_dir: Optional[str] = None):
+        if window is not None and window < 1:
+            raise ValueError("window must be a positive integer")
+        if history_limit is not None and history_limit < 0:
+            raise ValueError("history_limit must be a non-negative integer")
+        self.window = window
+        self.history_limit = history_limit
+        self.spill_dir = None
+        self._cleanup = None
+        if spill_dir:
+            Path(spill_dir).mkdir(parents=True, exist_ok=True)
+            self.spill_dir = Path(tempfile.mkdtemp(prefix="metrics-", dir=spill_dir))
+            self._cleanup = weakref.finalize(self, shutil.rmtree, self.spill_dir, True)
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._intern_lock = threading.Lock()
+        self._data: Dict[str, _AgentMetrics] = {}
+
+    def _intern(self, intention: str) -> int:
+        intention_id = self._ids.get(intention)
+        if intention_id is None:
+            with self._intern_lock:
+                intention_id = self._ids.get(intention)
+                if intention_id is None:
+                    intention_id = len(self._names)
+                    self._names.append(intention)
+                    self._ids[intention] = intention_id
+        return intention_id
+
+    def _new_agent(self) -> _AgentMetrics:
+        if self.window:
+            return _AgentMetrics(deque(maxlen=self.window))
+        if self.history_limit == 0 and not self.spill_dir:
+            return _AgentMetrics(None)
+        return _AgentMetrics(array("I"))
+
+    def _spill_path(self, agent_id: str) -> Path:
+        return self.spill_dir / (hashlib.sha1(agent_id.encode("utf-8")).hexdigest() + ".bin")
+
+    def _trim(self, agent_id: str, m: _AgentMetrics):
+        # Amortized: trim only once the history has doubled past the limit
+        limit = self.history_limit
+        if len(m.history) < max(2 * limit, 1):
+            return
+        cut = len(m.history) - limit
+        if self.spill_dir:
+            with self._spill_path(agent_id).open("ab") as f:
+                m.history[:cut].tofile(f)
+            m.spilled += cut
+        del m.history[:cut]
 
     def record(self, agent_id: str, action: str, intention: str):
         """
         Records a single action/intention event for an agent.
         """
-        m = self._data[agent_id]
-        m["actions"] += 1
-        # In a real system, we might limit the history size for drift calculation
-        m["intentions"].append(intention)
+        m = self._data.get(agent_id)
+        if m is None:
+            m = self._data.setdefault(agent_id, self._new_agent())
+        intention_id = self._intern(intention)
+        m.actions += 1
+        m.total += 1
+        counts = m.counts
+        if self.window:
+            if len(m.history) == self.window:
+                # Slide the window: the oldest intention leaves the counters
+                evicted = m.history[0]
+                counts[evicted] -= 1
+                if not counts[evicted]:
+                    del counts[evicted]
+            m.history.append(intention_id)
+        elif m.history is not None:
+            m.history.append(intention_id)
+            if self.history_limit is not None:
+                self._trim(agent_id, m)
+        counts[intention_id] += 1
+
+    def summary(self, agent_id: str) -> dict:
+        """
+        Returns O(1) counters for an agent: total actions, intentions in scope
+        (all of them, or the current window) and distinct intentions in scope.
+        """
+        m = self._data.get(agent_id)
+        if m is None:
+            return {"actions": 0, "intentions_count": 0, "distinct_intentions": 0}
+        return {
+            "actions": m.actions,
+            "intentions_count": len(m.history) if self.window else m.total,
+            "distinct_intentions": len(m.counts)
+        }
+
+    def intention_counts(self, agent_id: str) -> Dict[str, int]:
+        """
+        Returns occurrences of each intention in scope for an agent.
+        """
+        m = self._data.get(agent_id)
+        if m is None:
+            return {}
+        return {self._names[i]: n for i, n in m.counts.items()}
 
     def snapshot(self, agent_id: str) -> dict:
         """
-        Returns a snapshot of the raw metrics for an agent.
+        Returns a snapshot of the raw metrics for an agent. "intentions" holds
+        the retained history (including spilled entries), oldest first.
         """
-        return dict(self._data.get(agent_id, {}))
+        m = self._data.get(agent_id)
+        if m is None:
+            return {}
+        ids = array("I")
+        if m.spilled:
+            with self._spill_path(agent_id).open("rb") as f:
+                ids.fromfile(f, m.spilled)
+        if m.history is not None:
+            retained = list(m.history)
+            if self.history_limit is not None and not self.window and not self.spill_dir:
+                # Up to 2x the limit may be held between trims
+                retained = retained[-self.history_limit:]
+            ids.extend(retained)
+        return {
+            "actions": m.actions,
+            "intentions": [self._names[i] for i in ids]
+        }
+
+    def close(self):
+        """Drops all metrics and deletes this engine's spill files."""
+        self._data.clear()
+        if self._cleanup is not None:
+            self._cleanup()
 
 # Global instance for the reference implementation
 metrics_engine = MetricsEngine()
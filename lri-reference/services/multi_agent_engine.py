@@ -29,7 +29,8 @@ class MultiAgentEnvironment:
         # Update local cache for actor
         # In a real app, we'd refetch from LRI. Here we trust the return.
         # The result["trajectory"] is the full history.
-        self.agents[actor_id] = result["trajectory"]
+        # Copy: influence events appended below must not leak into the hash chain
+        self.agents[actor_id] = list(result["trajectory"])
 
         # 2. Target receives effect (Simplified LTP reception)
         # We simulate the target's trajectory being influenced.
@@ -1,77 +1,104 @@
+import time
 from datetime import datetime, timezone
 from models.identity_state import IdentityState
 from models.audit_snapshot import AuditSnapshot
 from services.metrics_engine import metrics_engine
 from services.drift_monitor import drift_monitor
 from services.authority_policy import authority_policy
+from services.continuity_verifier import continuity_verifier
+from typing import Dict, Optional, Tuple
 
 class Observer:
     """
     Observer Service.
     Provides read-only access to identity state, metrics, and continuity proofs.
     Does not mutate state.
-    """
 
-    def get_identity_snapshot(self, subject_id: str) -> AuditSnapshot:
-        """
-        Generates a comprehensive audit snapshot of the identity.
-        """
-        # 1. Load State (Read-Only)
-        identity = IdentityState.load(subject_id)
+    Snapshots and drift are materialized per subject: the cycle engine pushes
+    a fresh view when a cycle commits, so reads are dictionary hits.
+    Staleness bound: a view reflects the latest commit once its side effects
+    have run (immediately in sync mode, after the pipeline queue otherwise);
+    changes made outside the cycle engine show up within
+    `max_staleness_seconds`. Pass `refresh=True` to recompute from source,
+    or the expected `head_hash`/`actions` (as the HTTP routes do for their
+    ETag) to recompute only if the view is older than that version.
+    """
 
-        # 2. Calculate Drift
-        raw_metrics = metrics_engine.snapshot(subject_id)
-        drift_score = drift_monitor.calculate(raw_metrics.get("intentions", []))
+    def __init__(self, max_staleness_seconds: float = 5.0):
+        self.max_staleness_seconds = max_staleness_seconds
+        # subject_id -> (snapshot, drift metrics, materialized_at monotonic)
+        self._views: Dict[str, Tuple[AuditSnapshot, dict, float]] = {}
 
-        # 3. Gather Claims (Placeholder logic based on state)
+    @staticmethod
+    def _claims(drift_score: float) -> list:
+        # Placeholder logic based on state.
         # In a real system, these would be VC (Verifiable Credentials) or similar
         claims = ["authorized_agent"]
         if drift_score < 0.2:
             claims.append("low_drift_certified")
+        return claims
 
-        return AuditSnapshot(
+    def on_commit(self, subject_id: str, head_hash: str, chain_length: int, metrics_summary: dict):
+        """
+        Materializes the subject's view after a committed cycle (O(1)).
+        """
+        drift_score = drift_monitor.from_summary(metrics_summary)
+        snapshot = AuditSnapshot(
             subject_id=subject_id,
             timestamp=datetime.now(timezone.utc),
-            continuity_hash=identity.last_hash,
+            continuity_hash=head_hash,
             drift_score=drift_score,
-            authority_claims=claims,
-            trajectory_length=len(identity.trajectory)
+            authority_claims=self._claims(drift_score),
+            trajectory_length=chain_length
         )
+        drift = {
+            "subject_id": subject_id,
+            "drift_score": drift_score,
+            "intentions_count": metrics_summary["intentions_count"],
+            "actions_count": metrics_summary["actions"]
+        }
+        self._views[subject_id] = (snapshot, drift, time.monotonic())
+
+    def _view(self, subject_id: str, refresh: bool, head_hash: Optional[str] = None,
+              actions: Optional[int] = None) -> Tuple[AuditSnapshot, dict]:
+        view = self._views.get(subject_id)
+        if (refresh or view is None or time.monotonic() - view[2] > self.max_staleness_seconds
+                or (head_hash is not None and view[0].continuity_hash != head_hash)
+                or (actions is not None and view[1]["actions_count"] != actions)):
+            # Recompute from source (head record + metrics counters)
+            identity = IdentityState.load(subject_id)
+            self.on_commit(subject_id, identity.last_hash, identity.chain_length, metrics_engine.summary(subject_id))
+            view = self._views[subject_id]
+        return view[0], view[1]
 
-    def verify_continuity(self, subject_id: str) -> dict:
+    def get_identity_snapshot(self, subject_id: str, refresh: bool = False, head_hash: Optional[str] = None,
+                              actions: Optional[int] = None) -> AuditSnapshot:
         """
-        Verifies the cryptographic continuity of the subject's chain.
+        Returns the comprehensive audit snapshot of the identity.
         """
-        identity = IdentityState.load(subject_id)
-        # In a full implementation, this would re-hash the entire trajectory
-        # and verify it matches the head hash.
-        # For now, we return the head hash and trajectory metadata.
-        return {
-            "subject_id": subject_id,
-            "head_hash": identity.last_hash,
-            "chain_length": len(identity.trajectory),
-            "status": "verified" # Placeholder for actual re-hashing verification
-        }
+        return self._view(subject_id, refresh, head_hash, actions)[0]
 
-    def read_drift_metrics(self, subject_id: str) -> dict:
+    def verify_continuity(self, subject_id: str, since_hash: Optional[str] = None, full: bool = False) -> dict:
+        """
+        Verifies the cryptographic continuity of the subject's chain by
+        re-hashing it up to the head hash. Only the suffix after `since_hash`
+        (or after the latest signed checkpoint) is re-hashed unless `full`.
+        """
+        return continuity_verifier.verify(subject_id, since_hash=since_hash, full=full)
+
+    def read_drift_metrics(self, subject_id: str, refresh: bool = False, head_hash: Optional[str] = None,
+                           actions: Optional[int] = None) -> dict:
         """
         Returns drift analysis for the subject.
         """
-        raw_metrics = metrics_engine.snapshot(subject_id)
-        drift = drift_monitor.calculate(raw_metrics.get("intentions", []))
-        return {
-            "subject_id": subject_id,
-            "drift_score": drift,
-            "intentions_count": len(raw_metrics.get("intentions", [])),
-            "actions_count": raw_metrics.get("actions", 0)
-        }
+        return dict(self._view(subject_id, refresh, head_hash, actions)[1])
 
-    def read_authority_claims(self, subject_id: str) -> dict:
+    def read_authority_claims(self, subject_id: str, refresh: bool = False) -> dict:
         """
         Returns the current authority standing of the subject.
         """
         # This reuses the snapshot logic but focuses on auth
-        snapshot = self.get_identity_snapshot(subject_id)
+        snapshot = self.get_identity_snapshot(subject_id, refresh)
         return {
             "subject_id": subject_id,
             "claims": snapshot.authority_claims,
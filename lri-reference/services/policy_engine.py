@@ -0,0 +1,170 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import yaml
+
+logger = logging.getLogger(__name__)
+
+# protocol/lri/schema/rules/ in this repository
+DEFAULT_RULES_DIR = Path(__file__).resolve().parents[2] / "protocol" / "lri" / "schema" / "rules"
+
+# Operation class whose bound is the policy's drift threshold
+CRITICAL = "critical"
+
+# Used when no rules directory is available
+BUILTIN_RULES = {"authority": {"actions": {"critical_*": CRITICAL}}}
+
+_END = ""        # Trie key marking "a pattern ends here" (never a character)
+_MISSING = object()
+
+
+def load_rules(rules_dir: Path) -> Dict[str, Any]:
+    """Reads every <name>.rules.yaml in `rules_dir` into {name: document}."""
+    rules = {}
+    for path in sorted(rules_dir.glob("*.rules.yaml")):
+        with path.open(encoding="utf-8") as f:
+            rules[path.name[:-len(".rules.yaml")]] = yaml.safe_load(f) or {}
+    return rules
+
+
+class CompiledPolicy:
+    """
+    Rule files compiled for per-request evaluation.
+
+    Coherence thresholds become a table of maximum drift per operation.
+    Action patterns map straight to that bound: exact patterns live in a
+    dict, prefix patterns in a character trie (longest prefix wins). Results
+    are memoized per action, so repeated actions cost one dict lookup.
+    """
+
+    MEMO_SIZE = 4096
+
+    def __init__(self, rules: Dict[str, Any], drift_threshold: float):
+        thresholds = (rules.get("coherence") or {}).get("thresholds") or {}
+        # coherence = 1 - drift, so min coherence c allows drift up to 1 - c
+        self.max_drift: Dict[str, float] = {
+            name[len("min_for_"):]: 1.0 - float(value)
+            for name, value in thresholds.items() if name.startswith("min_for_")
+        }
+        self.max_drift[CRITICAL] = drift_threshold
+
+        self._exact: Dict[str, float] = {}
+        self._trie: Dict[str, Any] = {}
+        actions = (rules.get("authority") or {}).get("actions") or {}
+        for pattern, operation in actions.items():
+            if operation not in self.max_drift:
+                raise ValueError(f"Unknown operation '{operation}' for action pattern '{pattern}'")
+            bound = self.max_drift[operation]
+            if pattern.endswith("*"):
+                node = self._trie
+                for ch in pattern[:-1]:
+                    node = node.setdefault(ch, {})
+                node[_END] = bound
+            else:
+                self._exact[pattern] = bound
+
+        self.lifecycle: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for transition, rule in (rules.get("lifecycle") or {}).items():
+            source, _, target = (part.strip() for part in transition.partition("->"))
+            self.lifecycle[(source, target)] = dict(rule or {})
+
+        self.relationship_types: Dict[str, Dict[str, Any]] = {
+            name: dict(rule or {})
+            for name, rule in ((rules.get("relationships") or {}).get("relationship_types") or {}).items()
+        }
+        self._memo: Dict[str, Optional[float]] = {}
+
+    def _lookup(self, action: str) -> Optional[float]:
+        bound = self._exact.get(action, _MISSING)
+        if bound is not _MISSING:
+            return bound
+        node = self._trie
+        bound = node.get(_END)
+        for ch in action:
+            node = node.get(ch)
+            if node is None:
+                break
+            bound = node.get(_END, bound)
+        return bound
+
+    def drift_bound(self, action: str) -> Optional[float]:
+        """Maximum drift allowed for `action`, or None if unrestricted."""
+        bound = self._memo.get(action, _MISSING)
+        if bound is _MISSING:
+            bound = self._lookup(action)
+            if len(self._memo) >= self.MEMO_SIZE:
+                self._memo.clear()
+            self._memo[action] = bound
+        return bound
+
+    def allows(self, action: str, drift_score: float) -> bool:
+        bound = self.drift_bound(action)
+        return bound is None or drift_score <= bound
+
+    def transition_rule(self, source: str, target: str) -> Optional[Dict[str, Any]]:
+        """Rule for a lifecycle transition ("any" matches every source state)."""
+        return self.lifecycle.get((source, target)) or self.lifecycle.get(("any", target))
+
+
+class PolicyEngine:
+    """
+    Loads protocol rule files once and serves a CompiledPolicy.
+
+    Every `reload_interval` seconds (checked lazily on access) the files'
+    modification times are compared; if any changed, the rules are
+    recompiled and swapped in atomically. A rule file that fails to load or
+    compile is logged and the previous policy stays in force.
+    """
+
+    def __init__(self, rules_dir: Optional[str] = None, drift_threshold: float = 0.5,
+                 reload_interval: Optional[float] = 2.0):
+        self.rules_dir = Path(rules_dir) if rules_dir else DEFAULT_RULES_DIR
+        self._drift_threshold = drift_threshold
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._mtimes = self._stat()
+        self._next_check = time.monotonic() + (reload_interval or 0)
+        self._policy = self._compile()
+
+    def _stat(self) -> Dict[str, float]:
+        if not self.rules_dir.is_dir():
+            return {}
+        return {p.name: p.stat().st_mtime for p in self.rules_dir.glob("*.rules.yaml")}
+
+    @property
+    def drift_threshold(self) -> float:
+        return self._drift_threshold
+
+    @drift_threshold.setter
+    def drift_threshold(self, value: float):
+        # Compiled into the critical_* bound, so recompile for it to take effect
+        self._drift_threshold = value
+        self.reload()
+
+    def _compile(self) -> CompiledPolicy:
+        rules = load_rules(self.rules_dir) if self.rules_dir.is_dir() else BUILTIN_RULES
+        return CompiledPolicy(rules, self._drift_threshold)
+
+    def reload(self) -> bool:
+        """Recompiles the rules now. Returns False (keeping the old policy) on error."""
+        with self._lock:
+            self._mtimes = self._stat()
+            try:
+                self._policy = self._compile()
+            except Exception:
+                logger.exception("Failed to reload policy rules from %s", self.rules_dir)
+                return False
+        return True
+
+    @property
+    def policy(self) -> CompiledPolicy:
+        if self.reload_interval is not None and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.reload_interval
+            if self._stat() != self._mtimes:
+                self.reload()
+        return self._policy
+
+    def allows(self, action: str, drift_score: float) -> bool:
+        return self.policy.allows(action, drift_score)
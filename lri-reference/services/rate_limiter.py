@@ -0,0 +1,78 @@
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional
+from storage.rate_limit_store import InMemoryRateLimitStore, RateLimitStore
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """`limit` requests per `window` seconds, refilled continuously (token bucket)."""
+    limit: int
+    window: int = 60
+
+    def __post_init__(self):
+        if self.limit < 1 or self.window < 1:
+            raise ValueError("limit and window must be positive integers")
+
+
+@dataclass(frozen=True)
+class RateLimitDecision:
+    allowed: bool
+    limit: int
+    window: int
+    remaining: int
+    reset: int          # Unix time at which the bucket is full again
+    retry_after: int    # Seconds until the next request is allowed (0 if allowed)
+
+    def headers(self) -> Dict[str, str]:
+        """X-RateLimit-* headers from protocol/lri/api/read.md."""
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset),
+            "X-RateLimit-Window": str(self.window),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter keyed by caller identity and scope.
+
+    Each (identity, scope) pair gets its own bucket of `limit` tokens that
+    refills at limit/window tokens per second, so bursts up to the limit are
+    allowed and the sustained rate is bounded. Scopes without an entry in
+    `scopes` use `default`.
+    """
+
+    def __init__(self, default: RateLimit = RateLimit(1000, 60), scopes: Optional[Dict[str, RateLimit]] = None,
+                 store: Optional[RateLimitStore] = None):
+        self.default = default
+        self.scopes = dict(scopes or {})
+        self.store = store or InMemoryRateLimitStore()
+
+    def limit_for(self, scope: str) -> RateLimit:
+        return self.scopes.get(scope, self.default)
+
+    def check(self, identity: str, scope: str, cost: float = 1.0) -> RateLimitDecision:
+        """Consumes `cost` tokens from the caller's bucket for `scope`."""
+        rule = self.limit_for(scope)
+        rate = rule.limit / rule.window
+        now = time.time()
+        allowed, tokens = self.store.consume(f"{scope}|{identity}", rule.limit, rate, now, cost)
+        retry_after = 0 if allowed else max(1, math.ceil((cost - tokens) / rate))
+        return RateLimitDecision(
+            allowed=allowed,
+            limit=rule.limit,
+            window=rule.window,
+            remaining=int(tokens),
+            reset=math.ceil(now + (rule.limit - tokens) / rate),
+            retry_after=retry_after
+        )
+
+
+# Opt-in: set to a RateLimiter to enforce limits on every request (see api/rate_limit.py)
+rate_limiter: Optional[RateLimiter] = None
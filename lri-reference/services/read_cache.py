@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+class ReadCache:
+    """
+    Bounded LRU cache of read responses, validated by a version tag.
+
+    Each entry remembers the tag (derived from the subject's head hash and
+    related counters) it was computed for. A read with a different tag
+    recomputes and replaces the entry, so nothing has to be invalidated
+    explicitly when a cycle advances the head.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, tag: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != tag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, tag: str, value: Any):
+        with self._lock:
+            self._entries[key] = (tag, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Hashable, tag: str, compute: Callable[[], Any]) -> Any:
+        value = self.get(key, tag)
+        if value is None:
+            value = compute()
+            self.put(key, tag, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Global instance
+read_cache = ReadCache()
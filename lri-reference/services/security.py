@@ -1,5 +1,9 @@
 from fastapi import HTTPException, Depends
+from collections import OrderedDict
 from typing import Dict, Optional
+import hashlib
+import heapq
+import threading
 import jwt
 import time
 
@@ -25,17 +29,125 @@ def authenticate_user(username: str, password: str):
         return token
     return None
 
+class TokenCache:
+    """
+    Bounded LRU of tokens whose signature has already been verified.
+
+    Entries are keyed by the SHA-256 digest of the token (raw tokens are not
+    kept) and are served only until the token's `exp`. Revoked digests are
+    remembered until the token would have expired anyway (for good if it has
+    no `exp`); they are never evicted to make room, so `max_entries` only
+    bounds the verified entries.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[bytes, tuple]" = OrderedDict()
+        # digest -> exp (None: never expires)
+        self._revoked: Dict[bytes, Optional[float]] = {}
+        # Min-heap of (exp, digest) for revocations that expire
+        self._revoked_expiry: list = []
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    # Returned by get() for revoked tokens
+    REVOKED = object()
+
+    def get(self, token: str):
+        """
+        Returns the cached claims, REVOKED, or None if the token must be
+        (re)verified.
+        """
+        key = self._digest(token)
+        with self._lock:
+            if key in self._revoked:
+                return self.REVOKED
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            claims, exp = entry
+            if exp is not None and exp <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return dict(claims)
+
+    def put(self, token: str, claims: Dict):
+        key = self._digest(token)
+        with self._lock:
+            if key in self._revoked:
+                return
+            self._entries[key] = (dict(claims), claims.get("exp"))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def revoke(self, token: str):
+        """Rejects the token from now on, whether or not it is cached."""
+        key = self._digest(token)
+        try:
+            exp = jwt.decode(token, options={"verify_signature": False}).get("exp")
+        except jwt.InvalidTokenError:
+            exp = None
+        if not isinstance(exp, (int, float)):
+            exp = None
+        with self._lock:
+            self._entries.pop(key, None)
+            self._purge_revoked()
+            self._revoked[key] = exp
+            if exp is not None:
+                heapq.heappush(self._revoked_expiry, (exp, key))
+
+    def is_revoked(self, token: str) -> bool:
+        return self._digest(token) in self._revoked
+
+    def _purge_revoked(self):
+        # Caller must hold the lock; expired tokens are rejected by jwt.decode anyway
+        now = time.time()
+        heap = self._revoked_expiry
+        while heap and heap[0][0] <= now:
+            exp, key = heapq.heappop(heap)
+            if self._revoked.get(key) == exp:
+                del self._revoked[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._revoked.clear()
+            self._revoked_expiry.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Verified-token cache used by get_current_user
+token_cache = TokenCache()
+
+def revoke_token(token: str):
+    token_cache.revoke(token)
+
 def get_current_user(token: str = ""):
     if not token:
         raise HTTPException(status_code=401, detail="Missing authentication token")
+    cached = token_cache.get(token)
+    if cached is TokenCache.REVOKED:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    if cached is not None:
+        return cached
     try:
         # Decode and validate token
         data = jwt.decode(token, SECRET_KEY, algorithms=["HS256"])
-        return data
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token has expired")
     except jwt.InvalidTokenError:
         raise HTTPException(status_code=401, detail="Invalid token")
+    token_cache.put(token, data)
+    return data
 
 def require_role(user: Dict, role: str):
     # Simple hierarchy or strict check? Let's do strict for this PoC
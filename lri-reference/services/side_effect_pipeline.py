@@ -0,0 +1,87 @@
+import logging
+import queue
+import threading
+import zlib
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class PipelineFull(Exception):
+    """Raised when a task cannot be queued before `submit_timeout` expires."""
+
+
+class SideEffectPipeline:
+    """
+    Bounded background pipeline for post-commit side effects.
+
+    Tasks are routed to a worker by key (the subject id), so tasks for one
+    subject run in submission order while unrelated subjects proceed in
+    parallel. Each worker has a bounded queue: when it is full, `submit`
+    blocks (backpressure) or raises `PipelineFull` after `submit_timeout`.
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 1024, submit_timeout: Optional[float] = None):
+        if workers < 1:
+            raise ValueError("workers must be a positive integer")
+        self.submit_timeout = submit_timeout
+        self.failures = 0
+        self.dropped = 0
+        self._closed = False
+        self._queues = [queue.Queue(maxsize=max(1, max_pending // workers)) for _ in range(workers)]
+        self._threads = [
+            threading.Thread(target=self._run, args=(q,), name=f"side-effects-{i}", daemon=True)
+            for i, q in enumerate(self._queues)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def _queue_for(self, key: str) -> queue.Queue:
+        # Stable across processes, unlike hash() on str
+        return self._queues[zlib.crc32(key.encode("utf-8")) % len(self._queues)]
+
+    def _run(self, q: queue.Queue):
+        while True:
+            item = q.get()
+            try:
+                if item is _STOP:
+                    return
+                fn, args = item
+                fn(*args)
+            except Exception:
+                self.failures += 1
+                logger.exception("Side effect task failed")
+            finally:
+                q.task_done()
+
+    def submit(self, key: str, fn: Callable[..., Any], *args):
+        """Queues `fn(*args)` behind earlier tasks with the same key."""
+        if self._closed:
+            self.dropped += 1
+            raise RuntimeError("Side effect pipeline is shut down")
+        try:
+            self._queue_for(key).put((fn, args), timeout=self.submit_timeout)
+        except queue.Full:
+            self.dropped += 1
+            raise PipelineFull("Side effect pipeline is saturated")
+
+    def pending(self) -> int:
+        return sum(q.qsize() for q in self._queues)
+
+    def drain(self):
+        """Blocks until every queued task has run."""
+        for q in self._queues:
+            q.join()
+
+    def shutdown(self, wait: bool = True):
+        """Stops accepting tasks, then runs what is queued (if `wait`) and stops the workers."""
+        if self._closed:
+            return
+        self._closed = True
+        for q in self._queues:
+            q.put(_STOP)
+        if wait:
+            for t in self._threads:
+                t.join()
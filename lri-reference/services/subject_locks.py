@@ -0,0 +1,20 @@
+import threading
+import zlib
+
+class SubjectLocks:
+    """
+    Striped per-subject locks: a subject always maps to the same stripe, so
+    its cycles are serialized while unrelated subjects rarely contend.
+    Locks are re-entrant so a batch can hold a subject across nested calls.
+    """
+
+    def __init__(self, stripes: int = 256):
+        if stripes < 1:
+            raise ValueError("stripes must be a positive integer")
+        self._locks = [threading.RLock() for _ in range(stripes)]
+
+    def lock(self, subject_id: str) -> threading.RLock:
+        return self._locks[zlib.crc32(subject_id.encode("utf-8")) % len(self._locks)]
+
+# Global instance
+subject_locks = SubjectLocks()
@@ -1,15 +1,139 @@
 import json
+import os
+import threading
+import time
 from pathlib import Path
+from typing import List, Optional
 from models.decision_record import DecisionRecord
 
 class DMPStore:
     def __init__(self, path: str = "dmp_log.jsonl"):
         self.path = Path(path)
 
+    @staticmethod
+    def _serialize(record: DecisionRecord) -> str:
+        return json.dumps(record.__dict__, default=str) + "\n"
+
     def append(self, record: DecisionRecord):
         # Ensure parent directory exists if path has parents
         if self.path.parent != Path('.'):
            self.path.parent.mkdir(parents=True, exist_ok=True)
 
         with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(record.__dict__, default=str) + "\n")
+            f.write(self._serialize(record))
+
+    def flush(self):
+        # Every append is already written through
+        pass
+
+    def close(self):
+        pass
+
+
+class Durability:
+    NONE = "none"                  # Leave batches in the OS/file buffers
+    FLUSH = "flush"                # Flush the file buffer after each batch
+    FSYNC_BATCH = "fsync_batch"    # Flush + fsync after each batch
+    FSYNC_RECORD = "fsync_record"  # Flush + fsync after every record (no batching)
+
+    ALL = (NONE, FLUSH, FSYNC_BATCH, FSYNC_RECORD)
+
+
+class BufferedDMPStore(DMPStore):
+    """
+    DMP store that keeps the log file open and writes records in batches.
+
+    A batch is written when `batch_size` records are pending or when
+    `flush_interval` seconds have passed since the last write. A background
+    flusher enforces the time threshold even when no new records arrive.
+    `close()` writes any pending records; call it on shutdown.
+    """
+
+    def __init__(
+        self,
+        path: str = "dmp_log.jsonl",
+        batch_size: int = 64,
+        flush_interval: Optional[float] = 1.0,
+        durability: str = Durability.FLUSH,
+    ):
+        super().__init__(path)
+        if durability not in Durability.ALL:
+            raise ValueError(f"Unknown durability policy: {durability}")
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+
+        self._buffer: List[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._closed = False
+
+        self._stop = threading.Event()
+        self._flusher = None
+        if flush_interval:
+            self._flusher = threading.Thread(target=self._flush_periodically, name="dmp-flusher", daemon=True)
+            self._flusher.start()
+
+    def _open(self):
+        if self._file is None:
+            if self.path.parent != Path('.'):
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+        return self._file
+
+    def _write_pending(self):
+        # Caller must hold the lock
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        f = self._open()
+        f.write("".join(self._buffer))
+        self._buffer.clear()
+        if self.durability != Durability.NONE:
+            f.flush()
+        if self.durability in (Durability.FSYNC_BATCH, Durability.FSYNC_RECORD):
+            os.fsync(f.fileno())
+
+    def append(self, record: DecisionRecord):
+        line = self._serialize(record)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("DMP store is closed")
+            self._buffer.append(line)
+            if (
+                self.durability == Durability.FSYNC_RECORD
+                or len(self._buffer) >= self.batch_size
+                or (self.flush_interval and time.monotonic() - self._last_flush >= self.flush_interval)
+            ):
+                self._write_pending()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            with self._lock:
+                if self._buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._write_pending()
+
+    def flush(self):
+        """Writes pending records and applies the durability policy."""
+        with self._lock:
+            self._write_pending()
+            if self._file is not None:
+                # An explicit flush always reaches the OS, even under NONE
+                self._file.flush()
+
+    def close(self):
+        """Flushes pending records and releases the file handle. Idempotent."""
+        self._stop.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._closed = True
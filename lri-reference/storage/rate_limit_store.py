@@ -0,0 +1,61 @@
+import threading
+from collections import OrderedDict
+from typing import Tuple
+
+
+class RateLimitStore:
+    """
+    Token bucket state shared by rate limiter instances.
+
+    `consume` must refill and take tokens atomically for a key. The
+    in-process store suits a single worker; a shared implementation (e.g. a
+    Redis script over a hash per key) lets several workers enforce one limit.
+    """
+
+    def consume(self, key: str, capacity: float, refill_rate: float, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """
+        Refills the bucket for the time elapsed since its last use, then takes
+        `cost` tokens if available. Returns (allowed, tokens left).
+        """
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryRateLimitStore(RateLimitStore):
+    """
+    Process-local buckets. At most `max_keys` are kept; the least recently
+    used bucket is dropped first (it starts full if the key comes back).
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        if max_keys < 1:
+            raise ValueError("max_keys must be a positive integer")
+        self.max_keys = max_keys
+        # key -> [tokens, last refill time]
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, capacity: float, refill_rate: float, now: float, cost: float = 1.0) -> Tuple[bool, float]:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * refill_rate)
+                bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return True, bucket[0]
+            return False, bucket[0]
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
@@ -0,0 +1,164 @@
+import threading
+from itertools import count
+from typing import Dict, List, Optional, Tuple
+
+EdgeKey = Tuple[str, str, str]
+
+
+class RelationLimitExceeded(Exception):
+    """Raised by `link` when the subject already has `limit` edges of the type."""
+
+    def __init__(self, subject_id: str, relation_type: str, limit: int):
+        super().__init__(f"{subject_id} already has {limit} '{relation_type}' relations")
+        self.subject_id = subject_id
+        self.relation_type = relation_type
+        self.limit = limit
+
+
+class RelationStore:
+    """
+    In-memory relation graph with adjacency indexes.
+
+    Edges are unique per (from, to, type). Every edge is indexed by its
+    source, its target, its type and by each incident subject, so link,
+    unlink and lookups cost O(degree) instead of O(total edges).
+    Outgoing edges are also counted per (subject, type), so fan-out caps
+    are checked and reported in O(1).
+    """
+
+    def __init__(self):
+        self._edges: Dict[EdgeKey, dict] = {}
+        self._seq: Dict[EdgeKey, int] = {}
+        self._outgoing: Dict[str, Dict[EdgeKey, dict]] = {}
+        self._incoming: Dict[str, Dict[EdgeKey, dict]] = {}
+        self._by_type: Dict[str, Dict[EdgeKey, dict]] = {}
+        # Edges touching a subject (either end), in link order
+        self._incident: Dict[str, Dict[EdgeKey, dict]] = {}
+        # Bumped whenever an edge touching the subject changes (cache validation)
+        self._versions: Dict[str, int] = {}
+        # (from_id, relation_type) -> number of outgoing edges
+        self._counts: Dict[Tuple[str, str], int] = {}
+        self._counter = count(1)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._edges)
+
+    @staticmethod
+    def _index_add(index: Dict[str, Dict[EdgeKey, dict]], name: str, key: EdgeKey, edge: dict):
+        index.setdefault(name, {})[key] = edge
+
+    @staticmethod
+    def _index_remove(index: Dict[str, Dict[EdgeKey, dict]], name: str, key: EdgeKey):
+        bucket = index.get(name)
+        if bucket is None:
+            return
+        bucket.pop(key, None)
+        if not bucket:
+            del index[name]
+
+    def link(self, from_id: str, to_id: str, relation_type: str, limit: Optional[int] = None) -> bool:
+        """
+        Adds an edge. Returns False if the edge already exists.
+        Raises RelationLimitExceeded if `from_id` already has `limit` edges of this type.
+        """
+        key = (from_id, to_id, relation_type)
+        with self._lock:
+            if key in self._edges:
+                return False
+            count_key = (from_id, relation_type)
+            count = self._counts.get(count_key, 0)
+            if limit is not None and count >= limit:
+                raise RelationLimitExceeded(from_id, relation_type, limit)
+            self._counts[count_key] = count + 1
+            edge = {"from": from_id, "to": to_id, "type": relation_type}
+            self._edges[key] = edge
+            self._seq[key] = next(self._counter)
+            self._index_add(self._outgoing, from_id, key, edge)
+            self._index_add(self._incoming, to_id, key, edge)
+            self._index_add(self._by_type, relation_type, key, edge)
+            self._index_add(self._incident, from_id, key, edge)
+            self._index_add(self._incident, to_id, key, edge)
+            self._bump(from_id, to_id)
+        return True
+
+    def unlink(self, from_id: str, to_id: str, relation_type: str) -> bool:
+        """Removes an edge. Returns False if the edge did not exist."""
+        key = (from_id, to_id, relation_type)
+        with self._lock:
+            if self._edges.pop(key, None) is None:
+                return False
+            del self._seq[key]
+            count_key = (from_id, relation_type)
+            if self._counts[count_key] == 1:
+                del self._counts[count_key]
+            else:
+                self._counts[count_key] -= 1
+            self._index_remove(self._outgoing, from_id, key)
+            self._index_remove(self._incoming, to_id, key)
+            self._index_remove(self._by_type, relation_type, key)
+            self._index_remove(self._incident, from_id, key)
+            self._index_remove(self._incident, to_id, key)
+            self._bump(from_id, to_id)
+        return True
+
+    def _bump(self, from_id: str, to_id: str):
+        # Caller must hold the lock
+        self._versions[from_id] = self._versions.get(from_id, 0) + 1
+        if to_id != from_id:
+            self._versions[to_id] = self._versions.get(to_id, 0) + 1
+
+    def count(self, subject_id: str, relation_type: str) -> int:
+        """Number of outgoing edges of the type from the subject (O(1))."""
+        return self._counts.get((subject_id, relation_type), 0)
+
+    def version(self, subject_id: str) -> int:
+        return self._versions.get(subject_id, 0)
+
+    def outgoing(self, subject_id: str) -> List[dict]:
+        with self._lock:
+            return [dict(e) for e in self._outgoing.get(subject_id, {}).values()]
+
+    def incoming(self, subject_id: str) -> List[dict]:
+        with self._lock:
+            return [dict(e) for e in self._incoming.get(subject_id, {}).values()]
+
+    def of_type(self, relation_type: str) -> List[dict]:
+        with self._lock:
+            return [dict(e) for e in self._by_type.get(relation_type, {}).values()]
+
+    def page(
+        self,
+        subject_id: str,
+        relation_type: Optional[str] = None,
+        cursor: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Returns edges touching the subject in link order, optionally filtered by type.
+
+        The cursor is the sequence number of the last edge of the previous page,
+        so pages stay stable when earlier edges are unlinked.
+        Returns (edges, next_cursor); next_cursor is None on the last page.
+        """
+        result: List[dict] = []
+        last_seq = None
+        with self._lock:
+            for key, edge in self._incident.get(subject_id, {}).items():
+                if relation_type is not None and key[2] != relation_type:
+                    continue
+                seq = self._seq[key]
+                if cursor is not None and seq <= cursor:
+                    continue
+                if limit is not None and len(result) >= limit:
+                    return result, last_seq
+                result.append(dict(edge))
+                last_seq = seq
+        return result, None
+
+    def clear(self):
+        self.__init__()
+
+
+# Global instance for the reference implementation
+relation_store = RelationStore()
@@ -0,0 +1,228 @@
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class SubjectStore:
+    """
+    Storage backend interface for subjects (id -> JSON-serializable dict).
+
+    Records returned by `get` may be shared with the store; callers persist
+    changes by passing the record back to `put`.
+
+    Each subject also owns an append-only trajectory segment: steps are
+    addressed by index and only ever appended, so a commit writes the new
+    steps plus the (constant-size) subject record, never the whole history.
+    """
+
+    def get(self, subject_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    def put(self, subject_id: str, data: dict):
+        raise NotImplementedError
+
+    def delete(self, subject_id: str) -> bool:
+        """Deletes the subject record and its trajectory segment."""
+        raise NotImplementedError
+
+    def append_steps(self, subject_id: str, start_index: int, steps: List[dict], record: Optional[dict] = None) -> bool:
+        """
+        Appends `steps` at `start_index`, which must equal the current segment
+        length; returns False otherwise (a concurrent writer got there first).
+        If `record` is given, it is stored as the subject record in the same write.
+        """
+        raise NotImplementedError
+
+    def get_steps(self, subject_id: str, start: int = 0, end: Optional[int] = None) -> List[dict]:
+        raise NotImplementedError
+
+    def __contains__(self, subject_id: str) -> bool:
+        return self.get(subject_id) is not None
+
+    def close(self):
+        pass
+
+
+class InMemorySubjectStore(SubjectStore):
+    """Process-local dict. Fast, but unbounded and lost on restart."""
+
+    def __init__(self):
+        self._subjects: Dict[str, dict] = {}
+        self._trajectories: Dict[str, List[dict]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, subject_id: str) -> Optional[dict]:
+        return self._subjects.get(subject_id)
+
+    def put(self, subject_id: str, data: dict):
+        self._subjects[subject_id] = data
+
+    def delete(self, subject_id: str) -> bool:
+        self._trajectories.pop(subject_id, None)
+        return self._subjects.pop(subject_id, None) is not None
+
+    def append_steps(self, subject_id: str, start_index: int, steps: List[dict], record: Optional[dict] = None) -> bool:
+        with self._lock:
+            segment = self._trajectories.setdefault(subject_id, [])
+            if len(segment) != start_index:
+                return False
+            segment.extend(steps)
+            if record is not None:
+                self._subjects[subject_id] = record
+        return True
+
+    def get_steps(self, subject_id: str, start: int = 0, end: Optional[int] = None) -> List[dict]:
+        return self._trajectories.get(subject_id, [])[start:end]
+
+    def __contains__(self, subject_id: str) -> bool:
+        return subject_id in self._subjects
+
+
+class SQLiteSubjectStore(SubjectStore):
+    """
+    Durable local store: one JSON document per subject in SQLite (WAL mode).
+    """
+
+    def __init__(self, path: str = "lri_subjects.db"):
+        self.path = Path(path)
+        if self.path.parent != Path('.'):
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS subjects (id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS trajectory ("
+            "subject_id TEXT NOT NULL, idx INTEGER NOT NULL, step TEXT NOT NULL, "
+            "PRIMARY KEY (subject_id, idx)) WITHOUT ROWID"
+        )
+
+    _UPSERT = (
+        "INSERT INTO subjects (id, data) VALUES (?, ?) "
+        "ON CONFLICT(id) DO UPDATE SET data = excluded.data"
+    )
+
+    def get(self, subject_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM subjects WHERE id = ?", (subject_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, subject_id: str, data: dict):
+        serialized = json.dumps(data, default=str)
+        with self._lock:
+            self._conn.execute(self._UPSERT, (subject_id, serialized))
+
+    def delete(self, subject_id: str) -> bool:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM trajectory WHERE subject_id = ?", (subject_id,))
+            cursor = self._conn.execute("DELETE FROM subjects WHERE id = ?", (subject_id,))
+            self._conn.execute("COMMIT")
+        return cursor.rowcount > 0
+
+    def append_steps(self, subject_id: str, start_index: int, steps: List[dict], record: Optional[dict] = None) -> bool:
+        rows = [(subject_id, start_index + i, json.dumps(step, default=str)) for i, step in enumerate(steps)]
+        serialized = json.dumps(record, default=str) if record is not None else None
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (length,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(idx) + 1, 0) FROM trajectory WHERE subject_id = ?", (subject_id,)
+                ).fetchone()
+                if length != start_index:
+                    self._conn.execute("ROLLBACK")
+                    return False
+                self._conn.executemany("INSERT INTO trajectory (subject_id, idx, step) VALUES (?, ?, ?)", rows)
+                if serialized is not None:
+                    self._conn.execute(self._UPSERT, (subject_id, serialized))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return True
+
+    def get_steps(self, subject_id: str, start: int = 0, end: Optional[int] = None) -> List[dict]:
+        query = "SELECT step FROM trajectory WHERE subject_id = ? AND idx >= ?"
+        params = [subject_id, start]
+        if end is not None:
+            query += " AND idx < ?"
+            params.append(end)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY idx", params).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedSubjectStore(SubjectStore):
+    """
+    Write-through LRU cache in front of another store.
+
+    At most `max_entries` subjects stay in memory; cold subjects are
+    evicted and re-read from the backend on demand.
+    """
+
+    def __init__(self, backend: SubjectStore, max_entries: int = 1024):
+        if max_entries < 1:
+            raise ValueError("max_entries must be a positive integer")
+        self.backend = backend
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, subject_id: str, data: dict):
+        # Caller must hold the lock
+        self._cache[subject_id] = data
+        self._cache.move_to_end(subject_id)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def get(self, subject_id: str) -> Optional[dict]:
+        with self._lock:
+            data = self._cache.get(subject_id)
+            if data is not None:
+                self._cache.move_to_end(subject_id)
+                return data
+        data = self.backend.get(subject_id)
+        if data is not None:
+            with self._lock:
+                # A concurrent put may have cached a newer record meanwhile
+                cached = self._cache.get(subject_id)
+                if cached is not None:
+                    return cached
+                self._remember(subject_id, data)
+        return data
+
+    def put(self, subject_id: str, data: dict):
+        self.backend.put(subject_id, data)
+        with self._lock:
+            self._remember(subject_id, data)
+
+    def delete(self, subject_id: str) -> bool:
+        with self._lock:
+            self._cache.pop(subject_id, None)
+        return self.backend.delete(subject_id)
+
+    def append_steps(self, subject_id: str, start_index: int, steps: List[dict], record: Optional[dict] = None) -> bool:
+        # History is never cached: only the constant-size record stays hot
+        if not self.backend.append_steps(subject_id, start_index, steps, record):
+            return False
+        if record is not None:
+            with self._lock:
+                self._remember(subject_id, record)
+        return True
+
+    def get_steps(self, subject_id: str, start: int = 0, end: Optional[int] = None) -> List[dict]:
+        return self.backend.get_steps(subject_id, start, end)
+
+    def cache_size(self) -> int:
+        return len(self._cache)
+
+    def close(self):
+        self.backend.close()
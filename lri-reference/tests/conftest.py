@@ -0,0 +1,15 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _isolated_logs(tmp_path, monkeypatch):
+    """Sends the global DMP store and audit sink to tmp_path instead of the working tree."""
+    from security.audit_log import AuditLog
+    from services.dmp_writer import dmp_writer
+    from storage.dmp_store import DMPStore
+
+    monkeypatch.setattr(dmp_writer, "store", DMPStore(tmp_path / "dmp_log.jsonl"))
+    AuditLog.close()
+    monkeypatch.setattr(AuditLog, "default_path", str(tmp_path / "audit_log.jsonl"))
+    yield
+    AuditLog.close()
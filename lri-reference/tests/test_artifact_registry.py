@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+import pytest
+from models.economic_artifact import EconomicArtifact
+from services.artifact_registry import ArtifactRegistry
+from services.cycle_engine import run_identity_cycle
+from services.artifact_registry import artifact_registry
+
+def test_latest_by_type_and_listing_order():
+    registry = ArtifactRegistry()
+    registry.register_artifact(EconomicArtifact("s1", "cycle_snapshot", {"n": 1}))
+    registry.register_artifact(EconomicArtifact("s1", "report", {"n": 2}))
+    registry.register_artifact(EconomicArtifact("s1", "cycle_snapshot", {"n": 3}))
+    registry.register_artifact(EconomicArtifact("s2", "cycle_snapshot", {"n": 4}))
+
+    assert registry.get_artifact("s1", "cycle_snapshot").payload == {"n": 3}
+    assert registry.get_artifact("s1", "missing") is None
+    assert [a.payload["n"] for a in registry.list_exportable_artifacts("s1")] == [1, 2, 3]
+
+def test_keep_last_n_per_type():
+    registry = ArtifactRegistry(max_per_type=2)
+    for n in range(5):
+        registry.register_artifact(EconomicArtifact("s1", "cycle_snapshot", {"n": n}))
+    registry.register_artifact(EconomicArtifact("s1", "report", {"n": "r"}))
+
+    assert [a.payload["n"] for a in registry.list_exportable_artifacts("s1")] == [3, 4, "r"]
+
+    with pytest.raises(ValueError):
+        ArtifactRegistry(max_per_type=0)
+
+def test_ttl_retention():
+    registry = ArtifactRegistry(ttl_seconds=60)
+    old = EconomicArtifact("s1", "cycle_snapshot", {"n": "old"})
+    old.created_at = datetime.utcnow() - timedelta(minutes=5)
+    registry.register_artifact(old)
+    assert registry.get_artifact("s1", "cycle_snapshot") is None
+
+    registry.register_artifact(EconomicArtifact("s1", "cycle_snapshot", {"n": "new"}))
+    assert [a.payload["n"] for a in registry.list_exportable_artifacts("s1")] == ["new"]
+
+def test_ttl_sweep_cleans_idle_subjects():
+    registry = ArtifactRegistry(ttl_seconds=60)
+    for subject_id in ("idle_a", "idle_b"):
+        registry.register_artifact(EconomicArtifact(subject_id, "cycle_snapshot", {}))
+        for artifact in registry._by_subject[subject_id].values():
+            artifact.created_at = datetime.utcnow() - timedelta(minutes=5)
+
+    # Only "busy" registers; the idle subjects' buckets are never touched directly
+    for n in range(3):
+        registry.register_artifact(EconomicArtifact("busy", "cycle_snapshot", {"n": n}))
+    assert set(registry._by_subject) == {"busy"}
+    assert set(registry._by_type) == {("busy", "cycle_snapshot")}
+
+def test_cycle_artifact_references_head():
+    snapshot = run_identity_cycle({"subject_id": "test_artifact_agent", "action": "a", "intention": "i"})
+    payload = artifact_registry.get_artifact("test_artifact_agent", "cycle_snapshot").payload
+
+    assert payload["identity_state"] == {
+        "subject_id": "test_artifact_agent",
+        "head_hash": snapshot["head_hash"],
+        "chain_length": 1
+    }
+    assert payload["decisions_count"] == 1
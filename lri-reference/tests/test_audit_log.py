@@ -0,0 +1,69 @@
+import json
+import threading
+from datetime import datetime
+import pytest
+from security.audit_log import AuditLog, AuditSink, Overflow
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_record_writes_json_lines(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    AuditLog.sink = AuditSink(str(path))
+    try:
+        AuditLog.record(event="read_continuity", subject_id="alice", api_key="k1")
+        AuditLog.record("read_snapshot")
+        AuditLog.sink.flush()
+    finally:
+        AuditLog.close()
+
+    entries = _lines(path)
+    assert [e["event"] for e in entries] == ["read_continuity", "read_snapshot"]
+    assert entries[0]["subject_id"] == "alice"
+    assert entries[0]["api_key"] == "k1"
+    assert entries[1]["subject_id"] is None
+    assert datetime.fromisoformat(entries[0]["ts"]).tzinfo is not None
+    assert AuditLog.sink is None
+
+
+def test_sink_rotates_files(tmp_path):
+    path = tmp_path / "audit.jsonl"
+    sink = AuditSink(str(path), max_bytes=200, backup_count=2, batch_size=1)
+    for i in range(20):
+        sink.write({"event": "e", "n": i})
+    sink.close()
+
+    rotated = sorted(p.name for p in tmp_path.iterdir())
+    assert rotated == ["audit.jsonl", "audit.jsonl.1", "audit.jsonl.2"]
+    assert all(p.stat().st_size <= 200 for p in tmp_path.iterdir())
+    # Newest entries are in the live file, older ones in the backups
+    assert _lines(path)[-1]["n"] == 19
+    assert _lines(tmp_path / "audit.jsonl.1")[-1]["n"] < _lines(path)[0]["n"]
+
+
+def test_sink_overflow_policies(tmp_path):
+    release = threading.Event()
+    sink = AuditSink(str(tmp_path / "drop.jsonl"), max_queue=2, overflow=Overflow.DROP)
+    # Stall the writer so the queue fills up
+    original = sink._write_batch
+    sink._write_batch = lambda batch: (release.wait(), original(batch))
+    for i in range(10):
+        sink.write({"n": i})
+    assert sink.dropped > 0
+    release.set()
+    sink.close()
+    assert len(_lines(tmp_path / "drop.jsonl")) == 10 - sink.dropped
+
+    blocking = AuditSink(str(tmp_path / "block.jsonl"), max_queue=2, overflow=Overflow.BLOCK)
+    for i in range(50):
+        blocking.write({"n": i})
+    blocking.close()
+    assert blocking.dropped == 0
+    assert len(_lines(tmp_path / "block.jsonl")) == 50
+
+    with pytest.raises(RuntimeError):
+        blocking.write({"n": 0})
+    with pytest.raises(ValueError):
+        AuditSink(str(tmp_path / "x.jsonl"), overflow="spill")
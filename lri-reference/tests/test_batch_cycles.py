@@ -0,0 +1,67 @@
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from main import app
+from api import simulate_cycle, subject
+from models.identity_state import IdentityState
+from services.cycle_engine import run_identity_cycles
+from services.metrics_engine import metrics_engine
+from services.continuity_verifier import continuity_verifier
+
+client = TestClient(app)
+
+def test_batch_groups_by_subject_and_keeps_order():
+    payloads = [
+        {"subject_id": "test_batch_a", "action": "a1", "intention": "x"},
+        {"subject_id": "test_batch_b", "action": "b1", "intention": "y"},
+        {"subject_id": "test_batch_a", "action": "a2", "intention": "x"},
+        {"subject_id": "test_batch_a", "action": "a3", "intention": "z"},
+    ]
+    result = run_identity_cycles(payloads)
+
+    assert [r["status"] for r in result["results"]] == ["committed"] * 4
+    assert [r["index"] for r in result["results"]] == [0, 1, 2, 3]
+
+    trajectory = subject.get_trajectory("test_batch_a")
+    assert [s["action"] for s in trajectory] == ["a1", "a2", "a3"]
+    assert result["results"][3]["continuity_hash"] == trajectory[-1]["continuity_hash"]
+    assert result["subjects"]["test_batch_a"]["head_hash"] == IdentityState.load("test_batch_a").last_hash
+    assert result["subjects"]["test_batch_a"]["chain_length"] == 3
+
+    assert metrics_engine.summary("test_batch_a")["actions"] == 3
+    assert continuity_verifier.verify("test_batch_a", full=True)["status"] == "verified"
+
+def test_batch_reports_rejections_per_item():
+    subject_id = "test_batch_drift"
+    # Divergent history pushes drift above the policy threshold
+    for i in range(3):
+        metrics_engine.record(subject_id, "warmup", f"intent_{i}")
+
+    result = run_identity_cycles([
+        {"subject_id": subject_id, "action": "critical_deploy", "intention": "ship"},
+        {"subject_id": subject_id, "action": "normal_op", "intention": "ship"},
+    ])
+    assert [r["status"] for r in result["results"]] == ["rejected", "committed"]
+    assert IdentityState.load(subject_id).chain_length == 1
+
+def test_batch_endpoint():
+    response = client.post("/simulate/cycles", json={"cycles": [
+        {"subject_id": "test_batch_api", "action": "a1", "intention": "i"},
+        {"subject_id": "test_batch_api", "action": "a2", "intention": "i"},
+    ]})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "batch_completed"
+    assert len(data["results"]) == 2
+    assert data["subjects"]["test_batch_api"]["chain_length"] == 2
+    assert data["subjects"]["test_batch_api"]["metrics"]["actions"] == 2
+
+def test_batch_endpoint_keeps_http_errors(monkeypatch):
+    def forbidden(cycles):
+        raise HTTPException(status_code=403, detail="Action unauthorized by LRI Authority Policy")
+    monkeypatch.setattr(simulate_cycle, "run_identity_cycles", forbidden)
+
+    response = client.post("/simulate/cycles", json={"cycles": [
+        {"subject_id": "test_batch_forbidden", "action": "a1", "intention": "i"},
+    ]})
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Action unauthorized by LRI Authority Policy"
@@ -0,0 +1,117 @@
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.testclient import TestClient
+from main import app
+from api import authority
+from models.identity_state import IdentityState, GENESIS_HASH
+from services.continuity_verifier import ContinuityVerifier
+
+client = TestClient(app)
+
+def build_identity(subject_id, steps, verifier=None):
+    identity = IdentityState(subject_id)
+    for i in range(steps):
+        identity.evolve({
+            "action": f"step{i}",
+            "intention": "verify",
+            "timestamp": f"2024-01-01T00:00:{i % 60:02d}Z"
+        })
+        identity.save()
+        if verifier:
+            verifier.on_commit(identity)
+    return identity
+
+def test_full_verification_and_tamper_detection():
+    verifier = ContinuityVerifier()
+    identity = build_identity("test_verify_full", 5)
+
+    result = verifier.verify("test_verify_full", full=True)
+    assert result["status"] == "verified"
+    assert result["verified_steps"] == 5
+    assert result["head_hash"] == identity.last_hash
+
+    identity.trajectory[2]["action"] = "forged"
+    result = verifier.verify("test_verify_full", full=True)
+    assert result["status"] == "broken"
+    assert result["broken_at"] == 2
+
+def test_checkpoints_limit_rehashing_to_suffix():
+    verifier = ContinuityVerifier(checkpoint_interval=4)
+    build_identity("test_verify_checkpoint", 10, verifier)
+
+    checkpoints = verifier.checkpoints("test_verify_checkpoint")
+    assert [c.index for c in checkpoints] == [3, 7]
+
+    result = verifier.verify("test_verify_checkpoint")
+    assert result["status"] == "verified"
+    assert result["verified_steps"] == 2
+    assert verifier.verify("test_verify_checkpoint", full=True)["verified_steps"] == 10
+
+    # A checkpoint signed with another key is ignored
+    other = ContinuityVerifier(checkpoint_interval=4, secret_key="other")
+    other._checkpoints = verifier._checkpoints
+    assert other.verify("test_verify_checkpoint")["verified_steps"] == 10
+
+def test_verify_since_hash():
+    verifier = ContinuityVerifier()
+    identity = build_identity("test_verify_since", 6)
+    since = identity.trajectory[3]["continuity_hash"]
+
+    result = verifier.verify("test_verify_since", since_hash=since)
+    assert result["status"] == "verified"
+    assert result["verified_steps"] == 2
+
+    assert verifier.verify("test_verify_since", since_hash=GENESIS_HASH)["verified_steps"] == 6
+    assert verifier.verify("test_verify_since", since_hash="f" * 64)["status"] == "unknown_since_hash"
+
+def test_verify_ignores_steps_committed_after_the_record_was_read(monkeypatch):
+    verifier = ContinuityVerifier()
+    identity = build_identity("test_verify_race", 1)
+    stale = IdentityState.load("test_verify_race")
+    # A cycle commits between loading the record and reading the steps
+    identity.evolve({"action": "late", "intention": "verify", "timestamp": "2024-01-01T00:01:00Z"})
+    identity.save()
+    monkeypatch.setattr(IdentityState, "load", staticmethod(lambda subject_id: stale))
+
+    result = verifier.verify("test_verify_race", full=True)
+    assert result["status"] == "verified"
+    assert result["chain_length"] == 1
+    with ThreadPoolExecutor() as pool:
+        assert verifier.verify_many(["test_verify_race"], executor=pool)[0]["status"] == "verified"
+
+def test_verify_many():
+    verifier = ContinuityVerifier()
+    build_identity("test_bulk_a", 3)
+    broken = build_identity("test_bulk_b", 3)
+    broken.trajectory[-1]["continuity_hash"] = "bad"
+
+    results = verifier.verify_many(["test_bulk_a", "test_bulk_b"], max_workers=2)
+    assert [r["status"] for r in results] == ["verified", "broken"]
+
+    with ThreadPoolExecutor() as pool:
+        results = verifier.verify_many(["test_bulk_a"], executor=pool)
+    assert results[0]["status"] == "verified"
+
+def test_continuity_endpoints():
+    identity = build_identity("test_verify_api", 3)
+
+    response = client.get("/observer/subject/test_verify_api/continuity",
+                          params={"since_hash": identity.trajectory[0]["continuity_hash"]})
+    assert response.status_code == 200
+    assert response.json()["status"] == "verified"
+    assert response.json()["verified_steps"] == 2
+
+    assert authority.validate_continuity("test_verify_api")["continuous"] is True
+
+def test_continuity_endpoint_reverifies_unchanged_head():
+    identity = build_identity("test_verify_api_tamper", 3)
+    url = "/observer/subject/test_verify_api_tamper/continuity"
+    verified = client.get(url)
+    assert verified.json()["status"] == "verified"
+    assert client.get(url, headers={"If-None-Match": verified.headers["ETag"]}).status_code == 304
+
+    # Tampering that leaves the head hash unchanged
+    identity.trajectory[1]["action"] = "forged"
+    assert client.get(url).json()["status"] == "broken"
+    polled = client.get(url, headers={"If-None-Match": verified.headers["ETag"]})
+    assert polled.status_code == 200
+    assert polled.json()["status"] == "broken"
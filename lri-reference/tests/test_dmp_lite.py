@@ -1,4 +1,7 @@
-from storage.dmp_store import DMPStore
+import json
+import time
+import pytest
+from storage.dmp_store import DMPStore, BufferedDMPStore, Durability
 from services.dmp_writer import DMPWriter
 
 def test_dmp_append(tmp_path):
@@ -10,3 +13,50 @@ def test_dmp_append(tmp_path):
     content = (tmp_path / "dmp.jsonl").read_text()
     assert "A1" in content
     assert "explore" in content
+
+def test_buffered_dmp_batches_until_threshold(tmp_path):
+    path = tmp_path / "dmp.jsonl"
+    store = BufferedDMPStore(path=path, batch_size=3, flush_interval=None)
+    writer = DMPWriter(store)
+
+    writer.record("A1", "explore", "step_1")
+    writer.record("A1", "explore", "step_2")
+    assert not path.exists() or path.read_text() == ""
+
+    writer.record("A1", "explore", "step_3")
+    assert len(path.read_text().splitlines()) == 3
+
+    writer.record("A1", "explore", "step_4")
+    writer.close()
+    lines = path.read_text().splitlines()
+    assert [json.loads(l)["decision"] for l in lines] == ["step_1", "step_2", "step_3", "step_4"]
+
+    # close() is idempotent and the store refuses further writes
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.record("A1", "explore", "late")
+
+def test_buffered_dmp_time_threshold(tmp_path):
+    path = tmp_path / "dmp.jsonl"
+    store = BufferedDMPStore(path=path, batch_size=100, flush_interval=0.05)
+    store_writer = DMPWriter(store)
+    store_writer.record("A1", "explore", "tick")
+
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and not (path.exists() and path.read_text()):
+        time.sleep(0.01)
+    assert "tick" in path.read_text()
+    store.close()
+
+@pytest.mark.parametrize("durability", Durability.ALL)
+def test_buffered_dmp_durability_policies(tmp_path, durability):
+    path = tmp_path / "dmp.jsonl"
+    store = BufferedDMPStore(path=path, batch_size=2, flush_interval=None, durability=durability)
+    for i in range(5):
+        DMPWriter(store).record("A1", "explore", f"step_{i}")
+    store.close()
+    assert len(path.read_text().splitlines()) == 5
+
+def test_buffered_dmp_rejects_unknown_policy(tmp_path):
+    with pytest.raises(ValueError):
+        BufferedDMPStore(path=tmp_path / "dmp.jsonl", durability="sometimes")
@@ -0,0 +1,141 @@
+import threading
+import time
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+from api.errors import LRIError
+from api import subject
+from services.idempotency import IdempotencyStore
+
+client = TestClient(app)
+
+
+def test_cycle_retry_is_not_applied_twice():
+    payload = {"subject_id": "idem_agent", "action": "pay", "intention": "settle"}
+    headers = {"Idempotency-Key": "idem-cycle-1"}
+
+    first = client.post("/simulate/cycle", json=payload, headers=headers)
+    retry = client.post("/simulate/cycle", json=payload, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert subject.get_subject("idem_agent")["chain_length"] == 1
+
+    # A new key is a new decision
+    client.post("/simulate/cycle", json=payload, headers={"Idempotency-Key": "idem-cycle-2"})
+    assert subject.get_subject("idem_agent")["chain_length"] == 2
+
+
+def test_key_reuse_with_different_payload_is_rejected():
+    headers = {"Idempotency-Key": "idem-reuse"}
+    client.post("/simulate/cycle", json={"subject_id": "idem_reuse", "action": "a"}, headers=headers)
+    response = client.post("/simulate/cycle", json={"subject_id": "idem_reuse", "action": "b"}, headers=headers)
+    assert response.status_code == 422
+    assert response.json()["error_code"] == "LRI_007"
+
+
+def test_link_endpoints_are_idempotent():
+    headers = {"Idempotency-Key": "idem-event"}
+    event = {"event_id": "idem-evt-1", "subject_id": "idem_linker", "action": "ping"}
+    assert client.post("/ltp_event/", json=event, headers=headers).status_code == 200
+    retry = client.post("/ltp_event/", json=event, headers=headers)
+    assert retry.headers["Idempotent-Replayed"] == "true"
+
+    record = {"record_id": "idem-rec-1", "subject_id": "idem_linker", "decision": "go"}
+    # Keys are scoped per endpoint
+    assert "Idempotent-Replayed" not in client.post("/dmp_record/", json=record, headers=headers).headers
+
+
+def test_store_ttl_failures_and_bounds():
+    store = IdempotencyStore(max_entries=2, ttl_seconds=0.1)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert store.run("s", "k", {"a": 1}, compute) == (1, False)
+    assert store.run("s", "k", {"a": 1}, compute) == (1, True)
+    time.sleep(0.15)
+    assert store.run("s", "k", {"a": 1}, compute) == (2, False)
+    assert store.run("s", None, {"a": 1}, compute) == (3, False)
+
+    def boom():
+        raise RuntimeError("write failed")
+    with pytest.raises(RuntimeError):
+        store.run("s", "fails", {}, boom)
+    # Failures are forgotten, so the retry runs
+    assert store.run("s", "fails", {}, compute) == (4, False)
+
+    store.run("s", "k2", {}, compute)
+    store.run("s", "k3", {}, compute)
+    assert len(store) == 2
+
+    with pytest.raises(LRIError):
+        store.run("s", "k3", {"different": True}, compute)
+
+
+def test_concurrent_retries_wait_for_the_first_request():
+    store = IdempotencyStore()
+    started = threading.Event()
+    calls = []
+
+    def slow():
+        started.set()
+        time.sleep(0.1)
+        calls.append(1)
+        return "done"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(store.run("s", "k", {}, slow)))
+    first.start()
+    started.wait()
+    results.append(store.run("s", "k", {}, slow))
+    first.join()
+    assert calls == [1]
+    assert sorted(results) == [("done", False), ("done", True)]
+
+
+def test_eviction_skips_requests_still_running():
+    store = IdempotencyStore(max_entries=1)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def slow():
+        started.set()
+        release.wait()
+        calls.append(1)
+        return "done"
+
+    results = []
+    first = threading.Thread(target=lambda: results.append(store.run("s", "slow", {}, slow)), daemon=True)
+    retry = threading.Thread(target=lambda: results.append(store.run("s", "slow", {}, slow)), daemon=True)
+    first.start()
+    started.wait()
+    try:
+        # Over capacity while "slow" is in flight: only finished keys are evicted
+        store.run("s", "k1", {}, lambda: "k1")
+        store.run("s", "k2", {}, lambda: "k2")
+        retry.start()
+    finally:
+        release.set()
+    first.join()
+    retry.join()
+    assert calls == [1]
+    assert sorted(results) == [("done", False), ("done", True)]
+
+
+def test_retry_after_post_commit_failure_is_replayed(monkeypatch, tmp_path):
+    from services import cycle_engine
+    from services.dmp_writer import DMPWriter
+    from storage.dmp_store import BufferedDMPStore
+
+    store = BufferedDMPStore(tmp_path / "dmp.jsonl")
+    store.close()  # Every DMP write now raises after the chain commit
+    monkeypatch.setattr(cycle_engine, "dmp_writer", DMPWriter(store))
+    payload = {"subject_id": "idem_post_commit", "action": "pay", "intention": "settle"}
+    headers = {"Idempotency-Key": "idem-post-commit"}
+
+    first = client.post("/simulate/cycle", json=payload, headers=headers)
+    retry = client.post("/simulate/cycle", json=payload, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert subject.get_subject("idem_post_commit")["chain_length"] == 1
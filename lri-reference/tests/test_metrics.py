@@ -37,3 +37,96 @@ def test_drift_monitor_calculate():
 
     # Single item
     assert monitor.calculate(["a"]) == 1.0
+
+def test_metrics_engine_summary_matches_full_scan():
+    engine = MetricsEngine()
+    monitor = DriftMonitor()
+    intentions = ["a", "b", "a", "c", "a", "b"]
+    for i in intentions:
+        engine.record("agent_1", "act", i)
+
+    summary = engine.summary("agent_1")
+    assert summary == {"actions": 6, "intentions_count": 6, "distinct_intentions": 3}
+    assert monitor.from_summary(summary) == monitor.calculate(intentions)
+
+    assert engine.summary("agent_2") == {"actions": 0, "intentions_count": 0, "distinct_intentions": 0}
+    assert monitor.from_summary(engine.summary("agent_2")) == 0.0
+
+def test_metrics_engine_sliding_window():
+    engine = MetricsEngine(window=3)
+    monitor = DriftMonitor()
+    for i in ["a", "b", "c", "c", "c"]:
+        engine.record("agent_1", "act", i)
+
+    # Only the last 3 intentions ("c", "c", "c") are in scope
+    summary = engine.summary("agent_1")
+    assert summary["actions"] == 5
+    assert summary["intentions_count"] == 3
+    assert summary["distinct_intentions"] == 1
+    assert monitor.from_summary(summary) == monitor.calculate(["c", "c", "c"])
+    assert engine.snapshot("agent_1")["intentions"] == ["c", "c", "c"]
+
+    with pytest.raises(ValueError):
+        MetricsEngine(window=0)
+
+def test_metrics_engine_interns_intentions():
+    engine = MetricsEngine()
+    for agent in ("agent_1", "agent_2"):
+        for i in ["a", "b", "a"]:
+            engine.record(agent, "act", i)
+
+    # One id per distinct intention, shared across agents
+    assert len(engine._names) == 2
+    assert engine.intention_counts("agent_1") == {"a": 2, "b": 1}
+    assert engine.snapshot("agent_2")["intentions"] == ["a", "b", "a"]
+
+def test_metrics_engine_history_limit():
+    monitor = DriftMonitor()
+    intentions = ["a", "b", "c", "a", "b", "c", "d"]
+
+    counters_only = MetricsEngine(history_limit=0)
+    capped = MetricsEngine(history_limit=2)
+    for i in intentions:
+        counters_only.record("agent_1", "act", i)
+        capped.record("agent_1", "act", i)
+
+    # Counters (and so drift) still cover the whole history
+    for engine in (counters_only, capped):
+        summary = engine.summary("agent_1")
+        assert summary == {"actions": 7, "intentions_count": 7, "distinct_intentions": 4}
+        assert monitor.from_summary(summary) == monitor.calculate(intentions)
+
+    assert counters_only._data["agent_1"].history is None
+    assert counters_only.snapshot("agent_1")["intentions"] == []
+    assert capped.snapshot("agent_1")["intentions"] == ["c", "d"]
+    assert len(capped._data["agent_1"].history) < 4
+
+    with pytest.raises(ValueError):
+        MetricsEngine(history_limit=-1)
+
+def test_metrics_engine_spills_history(tmp_path):
+    engine = MetricsEngine(history_limit=2, spill_dir=str(tmp_path))
+    intentions = [f"i{n % 3}" for n in range(11)]
+    for i in intentions:
+        engine.record("agent_1", "act", i)
+
+    assert len(engine._data["agent_1"].history) < 4
+    assert list(tmp_path.iterdir())
+    assert engine.snapshot("agent_1")["intentions"] == intentions
+
+    engine.close()
+    assert not list(tmp_path.iterdir())
+
+def test_metrics_engine_reused_spill_dir(tmp_path):
+    # A new engine must not read ids spilled by an earlier one
+    first = MetricsEngine(history_limit=1, spill_dir=str(tmp_path))
+    for n in range(9):
+        first.record("agent_1", "act", f"old{n}")
+
+    second = MetricsEngine(history_limit=1, spill_dir=str(tmp_path))
+    intentions = ["a", "b", "a", "b", "c"]
+    for i in intentions:
+        second.record("agent_1", "act", i)
+
+    assert second.snapshot("agent_1")["intentions"] == intentions
+    assert first.snapshot("agent_1")["intentions"] == [f"old{n}" for n in range(9)]
@@ -0,0 +1,84 @@
+from fastapi.testclient import TestClient
+from main import app
+from models.identity_state import IdentityState
+from services.metrics_engine import metrics_engine
+from services.observer import Observer, observer_service
+
+client = TestClient(app)
+
+
+def _cycle(subject_id, action="speak", intention="inform"):
+    response = client.post("/simulate/cycle", json={
+        "subject_id": subject_id, "action": action, "intention": intention
+    })
+    assert response.status_code == 200
+    return response.json()["identity_state"]
+
+
+def test_cycle_commit_materializes_view():
+    subject_id = "materialized_agent"
+    result = _cycle(subject_id)
+
+    snapshot = observer_service.get_identity_snapshot(subject_id)
+    assert snapshot.continuity_hash == result["head_hash"]
+    assert snapshot.trajectory_length == 1
+
+    drift = observer_service.read_drift_metrics(subject_id)
+    assert drift["actions_count"] == 1
+
+    result = _cycle(subject_id, intention="persuade")
+    assert observer_service.get_identity_snapshot(subject_id).continuity_hash == result["head_hash"]
+    assert observer_service.read_drift_metrics(subject_id)["intentions_count"] == 2
+
+
+def test_out_of_band_changes_need_refresh():
+    observer = Observer(max_staleness_seconds=3600)
+    subject_id = "stale_observer_agent"
+    identity = IdentityState(subject_id)
+    identity.save()
+
+    assert observer.read_drift_metrics(subject_id)["actions_count"] == 0
+
+    # Written behind the cycle engine's back: the view is stale until refreshed
+    metrics_engine.record(subject_id, "walk", "explore")
+    assert observer.read_drift_metrics(subject_id)["actions_count"] == 0
+    assert observer.read_drift_metrics(subject_id, refresh=True)["actions_count"] == 1
+
+
+def test_staleness_bound_expires_view():
+    observer = Observer(max_staleness_seconds=0)
+    subject_id = "expiring_observer_agent"
+    IdentityState(subject_id).save()
+
+    assert observer.read_drift_metrics(subject_id)["actions_count"] == 0
+    metrics_engine.record(subject_id, "walk", "explore")
+    assert observer.read_drift_metrics(subject_id)["actions_count"] == 1
+
+
+def test_refresh_query_param():
+    subject_id = "refresh_param_agent"
+    _cycle(subject_id)
+    metrics_engine.record(subject_id, "walk", "explore")
+
+    response = client.get(f"/observer/subject/{subject_id}/drift", params={"refresh": True})
+    assert response.status_code == 200
+    assert response.json()["actions_count"] == 2
+    assert "ETag" in response.headers
+
+
+def test_http_reads_rematerialize_views_behind_the_etag():
+    subject_id = "out_of_band_http_agent"
+    _cycle(subject_id)
+    first = client.get(f"/observer/subject/{subject_id}/snapshot")
+    assert first.json()["trajectory_length"] == 1
+
+    # Committed behind the cycle engine's back: the ETag moves, so must the body
+    identity = IdentityState.load(subject_id)
+    identity.evolve({"action": "walk", "intention": "explore", "timestamp": "2026-01-01T00:00:00Z"})
+    identity.save()
+
+    second = client.get(f"/observer/subject/{subject_id}/snapshot")
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert second.json()["trajectory_length"] == 2
+    assert second.json()["continuity_hash"] == identity.last_hash
+    assert second.headers["ETag"].strip('"').startswith(identity.last_hash)
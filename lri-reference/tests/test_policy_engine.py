@@ -0,0 +1,66 @@
+import os
+import pytest
+from services.authority_policy import AuthorityPolicy
+from services.policy_engine import CompiledPolicy, PolicyEngine
+
+
+def test_protocol_rules_compile():
+    policy = PolicyEngine().policy
+    # coherence.rules.yaml thresholds are compiled, but only critical_* is mapped
+    assert policy.max_drift["archive"] == pytest.approx(0.4)
+    assert policy.drift_bound("critical_launch") == 0.5
+    assert policy.allows("archive_subject", 1.0)
+    assert policy.allows("reflect_now", 1.0)
+    assert policy.allows("anything_else", 1.0)
+    assert policy.transition_rule("active", "dormant") == {"coherence_below": 0.2}
+    assert policy.transition_rule("active", "archived") == {"reversible": False}
+    assert policy.relationship_types["mentor"]["max_per_subject"] == 5
+
+
+def test_exact_and_longest_prefix_win():
+    rules = {
+        "coherence": {"thresholds": {"min_for_read": 0.0, "min_for_write": 0.3, "min_for_archive": 0.6}},
+        "authority": {"actions": {"*": "read", "pay*": "write", "pay_out*": "archive", "pay": "read"}},
+    }
+    policy = CompiledPolicy(rules, drift_threshold=0.5)
+    assert policy.drift_bound("zzz") == 1.0
+    assert policy.drift_bound("payment") == pytest.approx(0.7)
+    assert policy.drift_bound("pay_out_all") == pytest.approx(0.4)
+    assert policy.drift_bound("pay") == 1.0
+    # Memoized lookups give the same answers
+    assert policy.drift_bound("pay_out_all") == pytest.approx(0.4)
+
+    with pytest.raises(ValueError):
+        CompiledPolicy({"authority": {"actions": {"x*": "teleport"}}}, drift_threshold=0.5)
+
+
+def test_drift_threshold_bounds_critical_actions():
+    strict = AuthorityPolicy(drift_threshold=0.2)
+    assert not strict.is_authorized(None, "critical_launch", {}, drift_score=0.3)
+    assert AuthorityPolicy(drift_threshold=0.5).is_authorized(None, "critical_launch", {}, drift_score=0.3)
+
+    # Changing the threshold later takes effect: the engine is its only source
+    policy = AuthorityPolicy()
+    assert policy.is_authorized(None, "critical_launch", {}, drift_score=0.3)
+    policy.drift_threshold = 0.2
+    assert policy.engine.drift_threshold == 0.2
+    assert not policy.is_authorized(None, "critical_launch", {}, drift_score=0.3)
+
+
+def test_hot_reload(tmp_path):
+    rules = tmp_path / "authority.rules.yaml"
+    rules.write_text('actions:\n  "critical_*": critical\n')
+    engine = PolicyEngine(str(tmp_path), drift_threshold=0.5, reload_interval=0)
+    assert not engine.allows("critical_op", 0.9)
+    assert engine.allows("critical_op", 0.5)
+
+    (tmp_path / "coherence.rules.yaml").write_text("thresholds:\n  min_for_write: 0.9\n")
+    rules.write_text('actions:\n  "critical_*": write\n')
+    os.utime(rules, (1, 1))
+    assert not engine.allows("critical_op", 0.5)
+
+    # A broken file keeps the last good policy
+    rules.write_text('actions:\n  "critical_*": teleport\n')
+    os.utime(rules, (2, 2))
+    assert not engine.allows("critical_op", 0.5)
+    assert engine.allows("critical_op", 0.05)
@@ -0,0 +1,73 @@
+import pytest
+from fastapi.testclient import TestClient
+import main
+from main import app
+from security.access_control import APIKey, AccessScope
+from services import rate_limiter as rate_limiter_module
+from services.rate_limiter import RateLimit, RateLimiter
+from storage.rate_limit_store import InMemoryRateLimitStore
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = RateLimiter(default=RateLimit(3, 60), scopes={AccessScope.READ_CONTINUITY: RateLimit(1, 60)})
+    monkeypatch.setattr(rate_limiter_module, "rate_limiter", limiter)
+    return limiter
+
+
+def test_headers_and_429(limiter):
+    for remaining in (2, 1, 0):
+        response = client.get("/subject/rl_agent")
+        assert response.headers["X-RateLimit-Limit"] == "3"
+        assert response.headers["X-RateLimit-Remaining"] == str(remaining)
+        assert response.headers["X-RateLimit-Window"] == "60"
+        assert int(response.headers["X-RateLimit-Reset"]) > 0
+
+    response = client.get("/subject/rl_agent")
+    assert response.status_code == 429
+    body = response.json()
+    assert body["error_code"] == "LRI_006"
+    assert body["error_type"] == "RateLimitExceeded"
+    assert body["retryable"] is True
+    assert body["retry_after"] == int(response.headers["Retry-After"]) >= 1
+
+    # Buckets are per subject
+    assert client.get("/subject/other_rl_agent").status_code == 200
+
+
+def test_per_scope_limits_and_api_keys(limiter):
+    main.key_store.register_key(APIKey("rl-key", [AccessScope.READ_CONTINUITY]))
+    assert client.get("/subject/rl_scope_agent/continuity", params={"api_key": "rl-key"}).status_code == 200
+    response = client.get("/subject/rl_scope_agent/continuity", params={"api_key": "rl-key"})
+    assert response.status_code == 429
+    assert response.headers["X-RateLimit-Limit"] == "1"
+
+    # The key is the identity: another subject does not reset its bucket
+    assert client.get("/subject/rl_other/continuity", headers={"X-API-Key": "rl-key"}).status_code == 429
+    # ...while other scopes have their own budget
+    assert client.get("/subject/rl_scope_agent").status_code == 200
+
+
+def test_disabled_by_default():
+    assert rate_limiter_module.rate_limiter is None
+    response = client.get("/subject/rl_unlimited")
+    assert "X-RateLimit-Limit" not in response.headers
+
+
+def test_token_bucket_refills():
+    store = InMemoryRateLimitStore(max_keys=2)
+    assert store.consume("a", 2, 1.0, now=0.0) == (True, 1.0)
+    assert store.consume("a", 2, 1.0, now=0.0) == (True, 0.0)
+    assert store.consume("a", 2, 1.0, now=0.5) == (False, 0.5)
+    assert store.consume("a", 2, 1.0, now=1.0)[0] is True
+    # Refill is capped at capacity
+    assert store.consume("a", 2, 1.0, now=100.0) == (True, 1.0)
+
+    store.consume("b", 2, 1.0, now=0.0)
+    store.consume("c", 2, 1.0, now=0.0)
+    assert len(store) == 2
+
+    with pytest.raises(ValueError):
+        RateLimit(0)
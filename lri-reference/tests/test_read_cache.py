@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+from main import app
+from api import subject, relations
+from services.cycle_engine import run_identity_cycle
+from services.observer import observer_service
+from services.read_cache import ReadCache, read_cache
+
+client = TestClient(app)
+
+def test_read_cache_validates_by_tag():
+    cache = ReadCache(max_entries=2)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+
+    assert cache.get_or_compute("k", "v1", compute) == 1
+    assert cache.get_or_compute("k", "v1", compute) == 1
+    assert cache.get_or_compute("k", "v2", compute) == 2
+
+    cache.put("a", "t", 1)
+    cache.put("b", "t", 2)
+    assert cache.get("k", "v2") is None  # Evicted (LRU)
+
+def test_subject_etag_and_304():
+    subject_id = "test_etag_subject"
+    run_identity_cycle({"subject_id": subject_id, "action": "a", "intention": "i"})
+
+    first = client.get(f"/subject/{subject_id}")
+    etag = first.headers["ETag"]
+    assert subject.get_subject(subject_id)["head_hash"] in etag
+
+    assert client.get(f"/subject/{subject_id}", headers={"If-None-Match": etag}).status_code == 304
+
+    # Record changes outside the chain still change the validator
+    subject.update_subject(subject_id, {"role": "mentor"})
+    assert client.get(f"/subject/{subject_id}", headers={"If-None-Match": etag}).status_code == 200
+
+def test_observer_reads_served_from_cache_until_head_advances(monkeypatch):
+    subject_id = "test_etag_observer"
+    run_identity_cycle({"subject_id": subject_id, "action": "a", "intention": "i"})
+    read_cache.clear()
+
+    calls = []
+    original = observer_service.read_drift_metrics
+    monkeypatch.setattr(observer_service, "read_drift_metrics", lambda sid, **kwargs: calls.append(sid) or original(sid, **kwargs))
+
+    first = client.get(f"/observer/subject/{subject_id}/drift")
+    etag = first.headers["ETag"]
+    assert client.get(f"/observer/subject/{subject_id}/drift").json() == first.json()
+    assert client.get(f"/observer/subject/{subject_id}/drift", headers={"If-None-Match": etag}).status_code == 304
+    assert len(calls) == 1
+
+    run_identity_cycle({"subject_id": subject_id, "action": "b", "intention": "j"})
+    second = client.get(f"/observer/subject/{subject_id}/drift", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["actions_count"] == 2
+    assert len(calls) == 2
+
+    snapshot = client.get(f"/observer/subject/{subject_id}/snapshot")
+    assert snapshot.status_code == 200
+    assert client.get(f"/observer/subject/{subject_id}/snapshot",
+                      headers={"If-None-Match": snapshot.headers["ETag"]}).status_code == 304
+
+    continuity = client.get(f"/observer/subject/{subject_id}/continuity")
+    assert continuity.json()["status"] == "verified"
+    assert client.get(f"/observer/subject/{subject_id}/continuity",
+                      headers={"If-None-Match": continuity.headers["ETag"]}).status_code == 304
+
+def test_relations_etag_changes_on_link():
+    subject_id = "test_etag_relations"
+    relations.link_subject(subject_id, "ev-1", "ltp_event")
+    etag = client.get(f"/subject/{subject_id}/relations").headers["ETag"]
+    assert client.get(f"/subject/{subject_id}/relations", headers={"If-None-Match": etag}).status_code == 304
+
+    relations.link_subject(subject_id, "ev-2", "ltp_event")
+    response = client.get(f"/subject/{subject_id}/relations", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["relations"]) == 2
@@ -0,0 +1,103 @@
+from fastapi.testclient import TestClient
+from main import app
+from api import relations
+from api.errors import LRIError
+import pytest
+from storage.relation_store import RelationLimitExceeded, RelationStore
+
+client = TestClient(app)
+
+def test_relation_store_indexes():
+    store = RelationStore()
+    assert store.link("A", "B", "mentor") is True
+    assert store.link("A", "B", "mentor") is False  # Duplicate edge
+    store.link("C", "A", "peer")
+    store.link("A", "D", "peer")
+
+    assert [e["to"] for e in store.outgoing("A")] == ["B", "D"]
+    assert [e["from"] for e in store.incoming("A")] == ["C"]
+    assert len(store.of_type("peer")) == 2
+
+    edges, _ = store.page("A")
+    assert len(edges) == 3
+
+    assert store.unlink("A", "B", "mentor") is True
+    assert store.unlink("A", "B", "mentor") is False
+    assert store.outgoing("A") == [{"from": "A", "to": "D", "type": "peer"}]
+    assert store.of_type("mentor") == []
+    assert len(store) == 2
+
+def test_relation_store_pagination():
+    store = RelationStore()
+    for i in range(5):
+        store.link("A", f"n{i}", "dmp_decision" if i % 2 == 0 else "ltp_transmission")
+
+    first, cursor = store.page("A", limit=2)
+    assert [e["to"] for e in first] == ["n0", "n1"]
+
+    # Unlinking an already-returned edge must not shift the next page
+    store.unlink("A", "n0", "dmp_decision")
+    second, cursor = store.page("A", cursor=cursor, limit=2)
+    assert [e["to"] for e in second] == ["n2", "n3"]
+
+    last, cursor = store.page("A", cursor=cursor, limit=2)
+    assert [e["to"] for e in last] == ["n4"]
+    assert cursor is None
+
+    typed, _ = store.page("A", relation_type="ltp_transmission")
+    assert [e["to"] for e in typed] == ["n1", "n3"]
+
+def test_relations_api_filter_and_cursor():
+    subject_id = "test_relations_agent"
+    relations.link_subject(subject_id, "ev-1", "ltp_event")
+    relations.link_subject(subject_id, "rec-1", "dmp_record")
+    relations.link_subject(subject_id, "ev-2", "ltp_event")
+
+    response = client.get(f"/subject/{subject_id}/relations", params={"type": "ltp_event"})
+    assert response.status_code == 200
+    assert [r["to"] for r in response.json()["relations"]] == ["ev-1", "ev-2"]
+
+    response = client.get(f"/subject/{subject_id}/relations", params={"limit": 2})
+    data = response.json()
+    assert len(data["relations"]) == 2
+    assert data["next_cursor"] is not None
+
+    response = client.get(f"/subject/{subject_id}/relations", params={"cursor": data["next_cursor"]})
+    assert [r["to"] for r in response.json()["relations"]] == ["ev-2"]
+    assert response.json()["next_cursor"] is None
+
+    response = client.get(f"/subject/{subject_id}/relations", params={"cursor": "bogus"})
+    assert response.status_code == 400
+
+def test_relation_counters_and_limits():
+    store = RelationStore()
+    store.link("A", "B", "mentor", limit=2)
+    store.link("A", "C", "mentor", limit=2)
+    store.link("B", "A", "mentor", limit=2)  # Incoming edges do not count against A
+    assert store.count("A", "mentor") == 2
+    assert store.link("A", "C", "mentor", limit=2) is False  # Existing edge, not a violation
+
+    with pytest.raises(RelationLimitExceeded):
+        store.link("A", "D", "mentor", limit=2)
+    assert store.count("A", "mentor") == 2
+
+    store.unlink("A", "B", "mentor")
+    assert store.count("A", "mentor") == 1
+    assert store.link("A", "D", "mentor", limit=2) is True
+
+def test_relation_limit_from_rules():
+    # relationships.rules.yaml: mentor.max_per_subject = 5
+    for i in range(5):
+        relations.link_subject("capped_mentee", f"mentor_{i}", "mentor")
+
+    response = client.get("/subject/capped_mentee/relations/mentor/count")
+    assert response.json() == {"subject_id": "capped_mentee", "relation_type": "mentor", "count": 5, "max_allowed": 5}
+
+    with pytest.raises(LRIError) as exc:
+        relations.link_subject("capped_mentee", "mentor_5", "mentor")
+    assert exc.value.to_dict()["error_code"] == "LRI_003"
+    assert exc.value.http_status == 409
+    assert exc.value.to_dict()["max_allowed"] == 5
+
+    # Types without a rule are unlimited
+    assert relations.relation_count("capped_mentee", "peer")["max_allowed"] is None
@@ -0,0 +1,80 @@
+import threading
+import pytest
+from services import cycle_engine
+from services.side_effect_pipeline import SideEffectPipeline, PipelineFull
+from services.metrics_engine import metrics_engine
+from services.dmp_writer import DMPWriter
+from storage.dmp_store import DMPStore
+
+def test_pipeline_preserves_per_key_order():
+    pipeline = SideEffectPipeline(workers=3)
+    seen = {"a": [], "b": []}
+    for i in range(50):
+        pipeline.submit("a", seen["a"].append, i)
+        pipeline.submit("b", seen["b"].append, i)
+    pipeline.drain()
+    assert seen["a"] == list(range(50))
+    assert seen["b"] == list(range(50))
+    pipeline.shutdown()
+
+def test_pipeline_backpressure_and_shutdown():
+    pipeline = SideEffectPipeline(workers=1, max_pending=1, submit_timeout=0.05)
+    release = threading.Event()
+    done = []
+
+    pipeline.submit("a", release.wait)       # Occupies the worker
+    pipeline.submit("a", done.append, 1)     # Fills the queue
+    with pytest.raises(PipelineFull):
+        pipeline.submit("a", done.append, 2)
+
+    release.set()
+    pipeline.shutdown()  # Drains queued work before stopping
+    assert done == [1]
+    with pytest.raises(RuntimeError):
+        pipeline.submit("a", done.append, 3)
+
+def test_pipeline_survives_failing_task():
+    pipeline = SideEffectPipeline(workers=1)
+    done = []
+    pipeline.submit("a", lambda: 1 / 0)
+    pipeline.submit("a", done.append, "after")
+    pipeline.shutdown()
+    assert pipeline.failures == 1
+    assert done == ["after"]
+
+def test_cycle_defers_side_effects(monkeypatch, tmp_path):
+    pipeline = SideEffectPipeline(workers=2)
+    monkeypatch.setattr(cycle_engine, "side_effect_pipeline", pipeline)
+    monkeypatch.setattr(cycle_engine, "dmp_writer", DMPWriter(DMPStore(tmp_path / "dmp.jsonl")))
+    subject_id = "test_async_cycle_agent"
+
+    for i in range(3):
+        snapshot = cycle_engine.run_identity_cycle({"subject_id": subject_id, "action": f"a{i}", "intention": "same"})
+        # Chain is committed on the request path; metrics are not in the response
+        assert len(snapshot["trajectory"]) == i + 1
+        assert "metrics" not in snapshot
+
+    pipeline.shutdown()
+    assert metrics_engine.summary(subject_id)["actions"] == 3
+    assert len((tmp_path / "dmp.jsonl").read_text().splitlines()) == 3
+
+def test_saturated_pipeline_runs_side_effects_inline(monkeypatch, tmp_path):
+    pipeline = SideEffectPipeline(workers=1, max_pending=1, submit_timeout=0.01)
+    monkeypatch.setattr(cycle_engine, "side_effect_pipeline", pipeline)
+    monkeypatch.setattr(cycle_engine, "dmp_writer", DMPWriter(DMPStore(tmp_path / "dmp.jsonl")))
+    release = threading.Event()
+    pipeline.submit("test_saturated_agent", release.wait)
+    pipeline.submit("test_saturated_agent", lambda: None)
+    subject_id = "test_saturated_agent"
+
+    snapshot = cycle_engine.run_identity_cycle({"subject_id": subject_id, "action": "a", "intention": "i"})
+    assert len(snapshot["trajectory"]) == 1
+    assert pipeline.dropped == 1
+    # Not lost: the committed decision's side effects ran on the request path
+    assert snapshot["metrics"]["actions"] == 1
+    assert len((tmp_path / "dmp.jsonl").read_text().splitlines()) == 1
+
+    release.set()
+    pipeline.shutdown()
+    cycle_engine.run_identity_cycle({"subject_id": subject_id, "action": "b", "intention": "i"})
+    assert metrics_engine.summary(subject_id)["actions"] == 2
@@ -0,0 +1,143 @@
+import pytest
+from api import subject
+from models.identity_state import IdentityState, TrajectoryConflict
+from storage.subject_store import InMemorySubjectStore, SQLiteSubjectStore, CachedSubjectStore
+
+def test_sqlite_store_survives_restart(tmp_path):
+    path = tmp_path / "subjects.db"
+    store = SQLiteSubjectStore(path)
+    store.put("alice", {"id": "alice", "role": "student"})
+    store.put("alice", {"id": "alice", "role": "mentor"})
+    store.close()
+
+    reopened = SQLiteSubjectStore(path)
+    assert reopened.get("alice") == {"id": "alice", "role": "mentor"}
+    assert "alice" in reopened
+    assert reopened.delete("alice") is True
+    assert reopened.delete("alice") is False
+    assert reopened.get("alice") is None
+    reopened.close()
+
+def test_cached_store_evicts_cold_subjects(tmp_path):
+    backend = SQLiteSubjectStore(tmp_path / "subjects.db")
+    store = CachedSubjectStore(backend, max_entries=2)
+    for name in ["a", "b", "c"]:
+        store.put(name, {"id": name})
+    assert store.cache_size() == 2
+
+    # Cold subject is re-read from the backend and becomes hot again
+    assert store.get("a") == {"id": "a"}
+    assert store.cache_size() == 2
+
+    assert store.delete("a") is True
+    assert store.get("a") is None
+    store.close()
+
+    with pytest.raises(ValueError):
+        CachedSubjectStore(backend, max_entries=0)
+
+def test_subject_api_on_persistent_backend(tmp_path, monkeypatch):
+    path = tmp_path / "subjects.db"
+    monkeypatch.setattr(subject, "subject_store", CachedSubjectStore(SQLiteSubjectStore(path), max_entries=1))
+
+    assert subject.create_subject("bob", {"id": "bob", "role": "agent"})["status"] == "created"
+    assert "error" in subject.create_subject("bob", {"id": "bob"})
+
+    identity = IdentityState.load("bob")
+    identity.evolve({"action": "join", "intention": "learn", "timestamp": "2024-01-01T00:00:00Z"})
+    identity.save()
+    subject.subject_store.close()
+
+    # Simulated restart: a fresh store sees the committed chain
+    monkeypatch.setattr(subject, "subject_store", SQLiteSubjectStore(path))
+    reloaded = IdentityState.load("bob")
+    assert reloaded.last_hash == identity.last_hash
+    assert reloaded.chain_length == 1
+    assert reloaded.trajectory == []
+    assert IdentityState.load("bob", history=True).trajectory == identity.trajectory
+    assert subject.update_subject("bob", {"role": "mentor"})["subject"]["role"] == "mentor"
+    assert subject.delete_subject("bob") == {"status": "deleted"}
+    assert "error" in subject.get_subject("bob")
+    subject.subject_store.close()
+
+class RecordingStore(SQLiteSubjectStore):
+    """Counts trajectory steps written per commit."""
+    def __init__(self, path):
+        super().__init__(path)
+        self.written = []
+
+    def append_steps(self, subject_id, start_index, steps, record=None):
+        self.written.append(len(steps))
+        return super().append_steps(subject_id, start_index, steps, record)
+
+def test_save_appends_only_new_steps(tmp_path, monkeypatch):
+    store = RecordingStore(tmp_path / "subjects.db")
+    monkeypatch.setattr(subject, "subject_store", store)
+
+    for i in range(20):
+        identity = IdentityState.load("carol")
+        identity.evolve({"action": f"a{i}", "intention": "grow", "timestamp": f"t{i}"})
+        identity.save()
+
+    # Constant write volume per commit, independent of chain length
+    assert store.written == [1] * 20
+    assert len(subject.get_trajectory("carol")) == 20
+    assert subject.get_trajectory("carol", 18)[0]["action"] == "a18"
+    assert "trajectory" not in subject.get_subject("carol")
+    store.close()
+
+def test_stale_save_is_rejected(monkeypatch):
+    monkeypatch.setattr(subject, "subject_store", InMemorySubjectStore())
+    first = IdentityState.load("dave")
+    second = IdentityState.load("dave")
+    first.evolve({"action": "a", "intention": "i", "timestamp": "t1"})
+    first.save()
+
+    second.evolve({"action": "b", "intention": "i", "timestamp": "t2"})
+    with pytest.raises(TrajectoryConflict):
+        second.save()
+    assert len(subject.get_trajectory("dave")) == 1
+
+def test_legacy_inline_trajectory_is_migrated(monkeypatch):
+    store = InMemorySubjectStore()
+    monkeypatch.setattr(subject, "subject_store", store)
+    identity = IdentityState("erin")
+    identity.evolve({"action": "a", "intention": "i", "timestamp": "t1"})
+    store.put("erin", {"id": "erin", "trajectory": identity.trajectory, "head_hash": identity.last_hash})
+
+    loaded = IdentityState.load("erin", history=True)
+    assert loaded.chain_length == 1
+    assert loaded.trajectory == identity.trajectory
+    assert "trajectory" not in store.get("erin")
+
+class RacingStore(InMemorySubjectStore):
+    """Runs `race` right after the next record read, as a concurrent writer would."""
+    race = None
+
+    def get(self, subject_id):
+        record = super().get(subject_id)
+        race, self.race = self.race, None
+        if race:
+            race()
+        return record
+
+def test_update_does_not_clobber_a_concurrent_commit(monkeypatch):
+    store = RacingStore()
+    monkeypatch.setattr(subject, "subject_store", store)
+    subject.create_subject("frank", {"id": "frank", "role": "agent"})
+
+    def commit():
+        identity = IdentityState.load("frank")
+        identity.evolve({"action": "a", "intention": "i", "timestamp": f"t{identity.chain_length}"})
+        identity.save()
+
+    store.race = commit
+    assert subject.update_subject("frank", {"role": "mentor"})["status"] == "updated"
+    record = subject.get_subject("frank")
+    assert record["role"] == "mentor"
+    assert record["chain_length"] == 1
+
+    # The chain head still advances afterwards
+    commit()
+    assert subject.get_subject("frank")["chain_length"] == 2
+    assert "error" in subject.update_subject("frank", {"head_hash": "f" * 64})
@@ -0,0 +1,90 @@
+import time
+import jwt
+import pytest
+from fastapi import HTTPException
+from services import security
+from services.security import SECRET_KEY, TokenCache, authenticate_user, get_current_user, revoke_token
+
+
+def _token(exp_in: float, user: str = "cache_user") -> str:
+    return jwt.encode({"user": user, "role": "agent", "exp": time.time() + exp_in}, SECRET_KEY, algorithm="HS256")
+
+
+def test_verified_token_is_cached(monkeypatch):
+    token = authenticate_user("agent_user", "agentpass")
+    first = get_current_user(token)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("signature verified again")
+    monkeypatch.setattr(security.jwt, "decode", fail)
+
+    again = get_current_user(token)
+    assert again == first
+    # Callers get a copy, not the cached claims
+    again["role"] = "admin"
+    assert get_current_user(token)["role"] == "agent"
+
+
+def test_cached_token_expires():
+    cache = TokenCache()
+    token = _token(exp_in=60)
+    cache.put(token, {"user": "cache_user", "exp": time.time() + 0.2})
+    assert cache.get(token)["user"] == "cache_user"
+    time.sleep(0.3)
+    assert cache.get(token) is None
+
+    # An expired entry is never served; the token is re-verified and rejected
+    token = _token(exp_in=-10)
+    security.token_cache.put(token, {"user": "cache_user", "exp": time.time() - 10})
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token)
+    assert exc.value.detail == "Token has expired"
+
+
+def test_revoked_token_is_rejected():
+    token = _token(exp_in=60, user="revoked_user")
+    assert get_current_user(token)["user"] == "revoked_user"
+
+    revoke_token(token)
+    with pytest.raises(HTTPException) as exc:
+        get_current_user(token)
+    assert exc.value.status_code == 401
+    assert exc.value.detail == "Token has been revoked"
+    # A revoked token is never re-cached
+    security.token_cache.put(token, {"user": "revoked_user"})
+    assert security.token_cache.get(token) is TokenCache.REVOKED
+
+
+def test_cache_is_bounded():
+    cache = TokenCache(max_entries=2)
+    tokens = [_token(60, user=f"u{i}") for i in range(3)]
+    for token in tokens:
+        cache.put(token, {"user": "x", "exp": time.time() + 60})
+    assert len(cache) == 2
+    assert cache.get(tokens[0]) is None
+    assert cache.get(tokens[2]) is not None
+
+    with pytest.raises(ValueError):
+        TokenCache(max_entries=0)
+
+
+def test_revocation_holds_until_exp():
+    cache = TokenCache(max_entries=2)
+    revoked = authenticate_user("agent_user", "agentpass")
+    cache.revoke(revoked)
+    for i in range(10):
+        cache.revoke(_token(exp_in=60, user=f"u{i}"))
+    # Revocations are never evicted to make room, however many follow
+    assert cache.get(revoked) is TokenCache.REVOKED
+
+    # Once the token has expired its revocation is dropped: jwt.decode rejects it anyway
+    expired = _token(exp_in=-10, user="expired_user")
+    cache.revoke(expired)
+    cache.revoke(_token(exp_in=60, user="later"))
+    assert not cache.is_revoked(expired)
+    assert cache.is_revoked(revoked)
+
+    no_exp = jwt.encode({"user": "forever"}, SECRET_KEY, algorithm="HS256")
+    cache.revoke(no_exp)
+    cache.revoke(_token(exp_in=60, user="later_still"))
+    assert cache.is_revoked(no_exp)
@@ -0,0 +1,71 @@
+import json
+from fastapi.testclient import TestClient
+from main import app
+from api import subject
+from models.identity_state import GENESIS_HASH
+
+client = TestClient(app)
+
+
+def _run_cycles(subject_id, n):
+    heads = []
+    for i in range(n):
+        response = client.post("/simulate/cycle", params={"history": False}, json={
+            "subject_id": subject_id, "action": f"step_{i}", "intention": "inform"
+        })
+        assert response.status_code == 200
+        heads.append(response.json()["identity_state"]["head_hash"])
+    return heads
+
+
+def _export(subject_id, **params):
+    response = client.get(f"/subject/{subject_id}/trajectory", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()], response.headers
+
+
+def test_cycle_without_history_returns_delta():
+    response = client.post("/simulate/cycle", params={"history": False}, json={
+        "subject_id": "delta_agent", "action": "speak", "intention": "inform"
+    })
+    state = response.json()["identity_state"]
+    assert "trajectory" not in state
+    assert state["step"]["action"] == "speak"
+    assert state["step"]["continuity_hash"] == state["head_hash"]
+    assert state["chain_length"] == 1
+    assert "metrics" in state
+
+
+def test_export_full_and_ranges():
+    subject_id = "export_agent"
+    heads = _run_cycles(subject_id, 5)
+
+    steps, headers = _export(subject_id)
+    assert [s["continuity_hash"] for s in steps] == heads
+    assert headers["X-Head-Hash"] == heads[-1]
+    assert headers["X-Chain-Length"] == "5"
+
+    steps, _ = _export(subject_id, from_index=1, limit=2)
+    assert [s["action"] for s in steps] == ["step_1", "step_2"]
+
+    steps, _ = _export(subject_id, from_hash=heads[2])
+    assert [s["action"] for s in steps] == ["step_3", "step_4"]
+
+    steps, _ = _export(subject_id, from_hash=GENESIS_HASH, limit=1)
+    assert [s["action"] for s in steps] == ["step_0"]
+
+
+def test_export_errors():
+    _run_cycles("export_errors_agent", 1)
+    assert client.get("/subject/missing_export_agent/trajectory").status_code == 404
+    assert client.get("/subject/export_errors_agent/trajectory", params={"from_hash": "f" * 64}).status_code == 404
+    response = client.get("/subject/export_errors_agent/trajectory", params={"from_hash": GENESIS_HASH, "from_index": 0})
+    assert response.status_code == 400
+
+
+def test_iter_trajectory_reads_in_chunks():
+    subject_id = "chunked_export_agent"
+    _run_cycles(subject_id, 7)
+    assert [s["action"] for s in subject.iter_trajectory(subject_id, chunk_size=3)] == [f"step_{i}" for i in range(7)]
+    assert len(list(subject.iter_trajectory(subject_id, 2, 6, chunk_size=3))) == 4
@@ -0,0 +1,83 @@
+"""
+Benchmark: snapshot formats for a 100k-event trajectory.
+
+Writes the same trajectory as pretty-printed JSON, uncompressed binary and
+gzip-compressed binary into a temporary directory, and reports file size,
+write time and load time (load_snapshot, including checksum verification).
+
+Usage:
+    python benchmarks/bench_snapshot_format.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import snapshots_manager
+
+EVENTS = 100_000
+ROUNDS = 3
+
+
+def make_trajectory(count: int) -> dict:
+    rng = random.Random(7)
+    events = []
+    coherence = 0.2
+    for i in range(count):
+        delta = rng.choice([0.15, 0.15, 0.25, -0.10, 0.0])
+        coherence = round(max(0.0, min(1.0, coherence + delta)), 2)
+        events.append({
+            "phase": "active" if coherence >= 0.5 else "emerging",
+            "coherence": coherence,
+            "event": rng.choice(["mentor_added", "peer_added", "phase_transition", "drift_event"]),
+            "delta": delta,
+            "status": "success",
+            "error_msg": None,
+        })
+    return {
+        "subject_id": "bench-subject",
+        "events": events,
+        "current_state": {"id": "bench-subject", "phase": "active", "coherence": coherence, "relations": []},
+    }
+
+
+def best_of(fn) -> float:
+    timings = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    trajectory = make_trajectory(EVENTS)
+    variants = [
+        ("json", snapshots_manager.FORMAT_JSON, False),
+        ("binary", snapshots_manager.FORMAT_BINARY, False),
+        ("binary+gzip", snapshots_manager.FORMAT_BINARY, True),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshots_manager.SNAPSHOTS_DIR = Path(tmp)
+        print(f"{EVENTS} events, best of {ROUNDS}")
+        print(f"{'format':<12} | {'size (KB)':>10} | {'write (ms)':>10} | {'load (ms)':>10}")
+        for name, fmt, compress in variants:
+            round_no = iter(range(ROUNDS))
+
+            def write():
+                snapshots_manager.create_snapshot(f"{name}-{next(round_no)}".replace("+", "-"),
+                                                  trajectory, format=fmt, compress=compress)
+
+            write_s = best_of(write)
+            snapshot_id = f"{name}-0".replace("+", "-")
+            path = next(Path(tmp).glob(f"{snapshot_id}.*"))
+            load_s = best_of(lambda: snapshots_manager.load_snapshot(snapshot_id))
+            print(f"{name:<12} | {path.stat().st_size / 1024:10.0f} | {write_s * 1e3:10.0f} | {load_s * 1e3:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
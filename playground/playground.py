@@ -3,7 +3,9 @@ import os
 import sys
 import glob
 import time
+import json
 import argparse
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import snapshots_manager
@@ -36,16 +38,22 @@ MAX_MENTORS = 2
 class TrajectoryRenderer:
     def __init__(self):
         self.history = []
+        # Running Merkle checksum of history, so snapshots don't rehash it
+        self.integrity = snapshots_manager.MerkleAccumulator()
+        # Last snapshot this history extends: new snapshots store only the delta
+        self.parent_snapshot = None
 
     def add_step(self, phase, coherence, event, delta, status, error_msg=None):
-        self.history.append({
+        step = {
             "phase": phase,
             "coherence": coherence,
             "event": event,
             "delta": delta,
             "status": status,
             "error_msg": error_msg
-        })
+        }
+        self.history.append(step)
+        self.integrity.append(step)
 
     def render(self, identity_id):
         print(f"\nIdentity Trajectory: {identity_id}\n")
@@ -117,27 +125,40 @@ def process_command(cmd_str, identity, renderer, session_state=None):
     # Handle Snapshot Commands
     if cmd == "snapshot":
         if len(args) < 1:
-            print("✗ Usage: snapshot <id>")
+            print("✗ Usage: snapshot <id> [binary]")
             return
         snapshot_id = args[0]
+        snapshot_format = args[1].lower() if len(args) > 1 else snapshots_manager.FORMAT_JSON
         try:
             trajectory_data = {
                 "subject_id": identity["id"],
                 "events": renderer.history,
                 "current_state": identity
             }
-            snap = snapshots_manager.create_snapshot(snapshot_id, trajectory_data)
+            try:
+                snap = snapshots_manager.create_snapshot(snapshot_id, trajectory_data, format=snapshot_format,
+                                                         accumulator=renderer.integrity,
+                                                         parent=renderer.parent_snapshot)
+            except snapshots_manager.SnapshotExistsError:
+                raise
+            except snapshots_manager.SnapshotError:
+                # Parent is gone, changed on disk, not Merkle-based or no longer a
+                # prefix of this trajectory: store a full copy instead
+                snap = snapshots_manager.create_snapshot(snapshot_id, trajectory_data, format=snapshot_format,
+                                                         accumulator=renderer.integrity)
+            renderer.parent_snapshot = snap["id"]
             print(f"✓ Snapshot '{snap['id']}' created at coherence {identity['coherence']:.2f}")
             print(f"\nFrozen trajectory:")
             print(f"  Events: {len(renderer.history)}")
             print(f"  Phase: {identity['phase']}")
-            print(f"  Checksum: {snap['checksum']}...")
+            print(f"  Checksum: {snap['checksum'][:16]}...")
         except Exception as e:
             print(f"✗ Error creating snapshot: {e}")
         return
 
     elif cmd == "snapshots":
-        snaps = snapshots_manager.list_snapshots()
+        verify = bool(args) and args[0].lower() == "verify"
+        snaps = snapshots_manager.list_snapshots(verify=verify)
         if not snaps:
             print("No snapshots found.")
             return
@@ -163,7 +184,7 @@ def process_command(cmd_str, identity, renderer, session_state=None):
             return
 
         try:
-            snapshot = snapshots_manager.load_snapshot(snapshot_id)
+            snapshot, integrity = snapshots_manager.open_branch(snapshot_id)
 
             # Restore state
             trajectory = snapshot["trajectory"]
@@ -172,8 +193,12 @@ def process_command(cmd_str, identity, renderer, session_state=None):
             identity.clear()
             identity.update(trajectory["current_state"])
 
-            # Clear and update history
+            # Clear and update history; later snapshots are deltas on this one
             renderer.history = trajectory["events"]
+            renderer.integrity = integrity
+            # Older (non-Merkle) snapshots can't be delta parents
+            is_merkle = snapshot.get("checksum_type") == snapshots_manager.CHECKSUM_MERKLE
+            renderer.parent_snapshot = snapshot["id"] if is_merkle else None
 
             # Enable READ-ONLY mode
             session_state["frozen"] = True
@@ -207,8 +232,8 @@ def process_command(cmd_str, identity, renderer, session_state=None):
         print("  add_mentor <subject> <mentor>  Add mentor relationship")
         print("  add_peer <subject> <peer>      Add peer relationship")
         print("  transition <phase>             Attempt lifecycle transition")
-        print("  snapshot <id>                  Freeze current trajectory")
-        print("  snapshots                      List available snapshots")
+        print("  snapshot <id> [binary]         Freeze current trajectory (binary: compact format)")
+        print("  snapshots [verify]             List available snapshots (verify: recheck all)")
         print("  switch <id>                    Load a snapshot (READ-ONLY)")
         print("  continue                       Resume from READ-ONLY mode")
         print("  show_trajectory                Display full evolution")
@@ -342,13 +367,116 @@ def interactive_mode():
         except Exception as e:
             print(f"✗ Error: {e}")
 
+def run_scenario(identity, scenario):
+    """
+    Applies one scenario to `identity` (the state left by the previous one).
+    Returns (identity, outcome). Prints nothing, so it backs both the
+    narrated playground and the headless runner.
+    """
+    outcome = {
+        "init": False,
+        "skipped": False,
+        "start_coherence": identity.get("coherence", 0.0),
+        "start_phase": identity.get("phase", "unknown"),
+        "intent": scenario.get("intent"),
+        "error": None,
+        "warnings": [],
+        "checks": [],
+        "failure": None,
+        "delta": 0.0,
+        "status": "success",
+    }
+
+    # Initialize identity if present (usually first scenario)
+    if "identity" in scenario:
+        identity = scenario["identity"]
+        # Ensure coherence is float
+        identity["coherence"] = float(identity["coherence"])
+
+        # Reset start to initial for the first step display logic
+        outcome["start_coherence"] = identity["coherence"]
+        outcome["start_phase"] = identity["phase"]
+        outcome["init"] = True
+
+    if not identity:
+        outcome["skipped"] = True
+        return identity, outcome
+
+    intent = outcome["intent"]
+    expected = scenario.get("expected", {})
+    error_caught = None
+
+    # Logic to simulate errors based on scenario cues
+
+    # Scenario 03: Drift Check
+    is_drift = False
+    if intent == "drift_event":
+        # Apply penalty for visualization purposes (mocking the drift effect)
+        apply_mock_coherence(identity, scenario)
+        is_drift = True
+
+        if "change" in scenario and "unauthorized_field" in scenario["change"]:
+             error_caught = "LRI_007_DRIFT_DETECTED"
+
+    # Scenario 04: Invalid Transition Check
+    if "requested_transition" in scenario:
+         trans = scenario["requested_transition"]
+         if trans.get("from") == "archived" and trans.get("to") == "active":
+             error_caught = "LRI_004_INVALID_LIFECYCLE_TRANSITION"
+
+    # Apply intent only if no error (and not drift which we handled)
+    if not error_caught and not is_drift:
+        apply_mock_coherence(identity, scenario)
+
+        # Scenario 05: Activation Logic / Phase Change
+        if "phase_after" in expected:
+             # Check conditions (mocking the rule check)
+             if identity["coherence"] >= 0.6: # Mock threshold
+                 identity["phase"] = expected["phase_after"]
+             else:
+                 outcome["warnings"].append(
+                     f"⚠️ Phase transition to {expected['phase_after']} failed due to low coherence.")
+
+    # Validation against expectations
+    if "error" in expected:
+        if expected["error"] == error_caught:
+            outcome["checks"].append(f"✓ Expected Error Caught: {error_caught}")
+        else:
+            outcome["failure"] = f"Expected error {expected['error']}, got {error_caught}"
+            outcome["checks"].append(f"❌ Failed: {outcome['failure']}")
+    elif error_caught:
+         outcome["failure"] = f"Unexpected Error: {error_caught}"
+         outcome["checks"].append(f"❌ {outcome['failure']}")
+    else:
+         outcome["checks"].extend([
+             "✓ Coherence within valid range",
+             "✓ Phase transition valid",
+             "✓ Expected outcome matched",
+         ])
+
+    # Update Trajectory
+    end_coherence = identity.get("coherence", 0.0)
+    outcome["delta"] = end_coherence - outcome["start_coherence"]
+    outcome["error"] = error_caught
+
+    if error_caught == "LRI_007_DRIFT_DETECTED":
+        outcome["status"] = "drift"
+    elif error_caught:
+        outcome["status"] = "error"
+
+    return identity, outcome
+
+def find_scenarios(scenarios_dir, recursive=False):
+    pattern = os.path.join(scenarios_dir, "**", "*.yaml") if recursive else os.path.join(scenarios_dir, "*.yaml")
+    return sorted(glob.glob(pattern, recursive=recursive))
+
 def run_playground():
     print("\n🚀 Starting LRI Interactive Playground...\n")
 
     # Find all scenarios
     base_dir = os.path.dirname(os.path.abspath(__file__))
     scenarios_dir = os.path.join(base_dir, "scenarios")
-    scenario_files = sorted(glob.glob(os.path.join(scenarios_dir, "*.yaml")))
+    scenario_files = find_scenarios(scenarios_dir)
 
     if not scenario_files:
         print(f"❌ No scenarios found in {scenarios_dir}")
@@ -373,100 +501,27 @@ def run_playground():
 
         print(f"Story: {scenario.get('story', 'Unknown')}\n")
 
-        # Capture start state for delta calculation
-        start_coherence = identity.get("coherence", 0.0)
-        start_phase = identity.get("phase", "unknown")
+        identity, outcome = run_scenario(identity, scenario)
 
-        # Initialize identity if present (usually first scenario)
-        is_init_step = False
-        if "identity" in scenario:
-            identity = scenario["identity"]
-            # Ensure coherence is float
-            identity["coherence"] = float(identity["coherence"])
-
-            # Reset start to initial for the first step display logic
-            start_coherence = identity["coherence"]
-            start_phase = identity["phase"]
-            is_init_step = True
-
-        if not identity:
+        if outcome["skipped"]:
             print("⚠️ No identity loaded yet. Skipping...")
             continue
 
         # Display Initial State (Before Logic)
         print(f"Initial State:")
-        print(f"  Phase: {start_phase}")
-        print(f"  Coherence: {start_coherence:.2f}")
+        print(f"  Phase: {outcome['start_phase']}")
+        print(f"  Coherence: {outcome['start_coherence']:.2f}")
 
-        # Simulate processing
-        intent = scenario.get("intent")
+        intent = outcome["intent"]
         if intent:
             print(f"\nIntent: \"{intent}\"")
         print("")
 
-        expected = scenario.get("expected", {})
-        error_caught = None
-
-        # Logic to simulate errors based on scenario cues
-
-        # Scenario 03: Drift Check
-        is_drift = False
-        if intent == "drift_event":
-            # Apply penalty for visualization purposes (mocking the drift effect)
-            apply_mock_coherence(identity, scenario)
-            is_drift = True
-
-            if "change" in scenario and "unauthorized_field" in scenario["change"]:
-                 error_caught = "LRI_007_DRIFT_DETECTED"
-
-        # Scenario 04: Invalid Transition Check
-        if "requested_transition" in scenario:
-             trans = scenario["requested_transition"]
-             if trans.get("from") == "archived" and trans.get("to") == "active":
-                 error_caught = "LRI_004_INVALID_LIFECYCLE_TRANSITION"
-
-        # Apply intent only if no error (and not drift which we handled)
-        if not error_caught and not is_drift:
-            apply_mock_coherence(identity, scenario)
-
-            # Scenario 05: Activation Logic / Phase Change
-            if "phase_after" in expected:
-                 # Check conditions (mocking the rule check)
-                 if identity["coherence"] >= 0.6: # Mock threshold
-                     identity["phase"] = expected["phase_after"]
-                 else:
-                     print(f"⚠️ Phase transition to {expected['phase_after']} failed due to low coherence.")
-
-        # Validation against expectations
-        passed = True
-
-        # Check expected error
-        if "error" in expected:
-            if expected["error"] == error_caught:
-                print(f"✓ Expected Error Caught: {error_caught}")
-            else:
-                print(f"❌ Failed: Expected error {expected['error']}, got {error_caught}")
-                passed = False
-        elif error_caught:
-             print(f"❌ Unexpected Error: {error_caught}")
-             passed = False
-        else:
-             print("✓ Coherence within valid range")
-             print("✓ Phase transition valid")
-             print("✓ Expected outcome matched")
-
-        # Update Trajectory
-        end_coherence = identity.get("coherence", 0.0)
-        delta = end_coherence - start_coherence
-
-        status = "success"
-        if error_caught == "LRI_007_DRIFT_DETECTED":
-            status = "drift"
-        elif error_caught:
-            status = "error"
+        for line in outcome["warnings"] + outcome["checks"]:
+            print(line)
 
         # Add Step
-        if is_init_step:
+        if outcome["init"]:
             renderer.add_step(
                 identity["phase"], identity["coherence"],
                 None, 0.0, "success"
@@ -475,13 +530,13 @@ def run_playground():
             if intent:
                 renderer.add_step(
                     identity["phase"], identity["coherence"],
-                    intent, delta, status, error_msg=error_caught
+                    intent, outcome["delta"], outcome["status"], error_msg=outcome["error"]
                 )
 
         # Render Trajectory
         renderer.render(identity.get("id", "unknown"))
 
-        if passed:
+        if outcome["failure"] is None:
              pass
         else:
             print("🛑 Scenario Failed\n")
@@ -491,12 +546,133 @@ def run_playground():
     print("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
     print("🎉 Playground finished.")
 
+def _parse_scenarios(paths):
+    """Parse scenario files (in a worker). Returns [(path, scenario, load_error, parse_ms)]."""
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    parsed = []
+    for path in paths:
+        started = time.perf_counter()
+        try:
+            with open(path, 'r') as f:
+                scenario, error = yaml.load(f, Loader=loader) or {}, None
+        except Exception as e:
+            scenario, error = None, f"Failed to load YAML: {e}"
+        if error is None and not isinstance(scenario, dict):
+            scenario, error = None, f"Scenario must be a mapping, got {type(scenario).__name__}"
+        parsed.append((path, scenario, error, (time.perf_counter() - started) * 1000))
+    return parsed
+
+def _run_story(story):
+    """Run one story (scenarios sharing an identity, in order) without output."""
+    identity = {}
+    results = []
+    for path, scenario, load_error, parse_ms in story:
+        started = time.perf_counter()
+        result = {"file": path, "passed": False, "skipped": False, "error": None, "failure": load_error}
+        outcome = None
+        if load_error is None:
+            try:
+                identity, outcome = run_scenario(identity, scenario)
+            except Exception as e:
+                # Reported as this file's failure; the rest of the story still runs
+                result["failure"] = f"Scenario raised {type(e).__name__}: {e}"
+        if outcome is not None:
+            result.update(
+                passed=outcome["failure"] is None and not outcome["skipped"],
+                skipped=outcome["skipped"],
+                intent=outcome["intent"],
+                error=outcome["error"],
+                failure=outcome["failure"],
+                phase=identity.get("phase") if identity else None,
+                coherence=identity.get("coherence") if identity else None,
+            )
+        result["elapsed_ms"] = round(parse_ms + (time.perf_counter() - started) * 1000, 3)
+        results.append(result)
+    return results
+
+def run_headless(scenarios_dir=None, workers=None, results_path="scenario_results.json"):
+    """
+    Runs every scenario under `scenarios_dir` (recursively) without
+    narration, sleeps or rendering, and writes the results as JSON.
+
+    Each directory's files are taken in name order. A scenario with an
+    `identity` block starts a new story, and so does each directory; the
+    files after it continue that story. Stories are independent, so files
+    are parsed and stories run across a process pool. A file that cannot be
+    loaded or that raises is reported as a failed scenario.
+    Returns the results document.
+    """
+    if scenarios_dir is None:
+        scenarios_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+    started = time.perf_counter()
+    # Directory by directory, so a story never spans a directory boundary
+    scenario_files = sorted(find_scenarios(scenarios_dir, recursive=True),
+                            key=lambda path: (os.path.dirname(path), os.path.basename(path)))
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        slots = workers * 4
+        size = max(1, -(-len(scenario_files) // slots))
+        chunks = [scenario_files[i:i + size] for i in range(0, len(scenario_files), size)]
+        parsed = [item for chunk in pool.map(_parse_scenarios, chunks) for item in chunk]
+
+        stories = []
+        for item in parsed:
+            path, scenario = item[0], item[1]
+            if (not stories or (scenario and "identity" in scenario)
+                    or os.path.dirname(path) != os.path.dirname(stories[-1][-1][0])):
+                stories.append([])
+            stories[-1].append(item)
+        story_results = list(pool.map(_run_story, stories, chunksize=max(1, len(stories) // slots)))
+
+    scenarios = []
+    for story in story_results:
+        story_file = os.path.relpath(story[0]["file"], scenarios_dir)
+        for result in story:
+            result["file"] = os.path.relpath(result["file"], scenarios_dir)
+            result["story"] = story_file
+            scenarios.append(result)
+
+    passed = sum(1 for result in scenarios if result["passed"])
+    skipped = sum(1 for result in scenarios if result["skipped"])
+    report = {
+        "scenarios_dir": os.path.abspath(scenarios_dir),
+        "total": len(scenarios),
+        "passed": passed,
+        "failed": len(scenarios) - passed - skipped,
+        "skipped": skipped,
+        "elapsed_seconds": round(time.perf_counter() - started, 3),
+        "stories": [
+            {
+                "story": story[0]["story"],
+                "passed": all(result["passed"] or result["skipped"] for result in story),
+                "coherence_trajectory": [result.get("coherence") for result in story if not result["skipped"]],
+            }
+            for story in story_results
+        ],
+        "scenarios": scenarios,
+    }
+    if results_path:
+        with open(results_path, 'w') as f:
+            json.dump(report, f, indent=2)
+    return report
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="LRI Playground")
     parser.add_argument("--interactive", action="store_true", help="Launch interactive REPL mode")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run scenarios in parallel without output and write a JSON results file")
+    parser.add_argument("--scenarios", help="Scenario directory for --headless (default: ./scenarios)")
+    parser.add_argument("--workers", type=int, help="Worker processes for --headless (default: CPU count)")
+    parser.add_argument("--results", default="scenario_results.json", help="Results file for --headless")
     args = parser.parse_args()
 
     if args.interactive:
         interactive_mode()
+    elif args.headless:
+        report = run_headless(args.scenarios, args.workers, args.results)
+        print(f"{report['passed']}/{report['total']} scenarios passed, {report['failed']} failed "
+              f"in {report['elapsed_seconds']:.2f}s -> {args.results}")
+        sys.exit(1 if report["failed"] else 0)
     else:
         run_playground()
@@ -1,12 +1,42 @@
+import gzip
 import json
 import hashlib
+import struct
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+import tempfile
 import threading
 import os
 
 SNAPSHOTS_DIR = Path(__file__).parent / "snapshots"
-_snapshot_lock = threading.Lock()  # Global lock for snapshot creation queue
+CATALOG_NAME = "catalog.idx"  # Sidecar index in SNAPSHOTS_DIR (not matched by *.json)
+_snapshot_lock = threading.Lock()  # Global lock for snapshot creation queue and catalog updates
+
+# Snapshot encodings, selectable per snapshot; reads detect the format from the file
+FORMAT_JSON = "json"      # Pretty-printed JSON document
+FORMAT_BINARY = "binary"  # Length-prefixed records, gzip-compressed by default
+EXTENSIONS = {FORMAT_JSON: ".json", FORMAT_BINARY: ".snap"}
+
+# Binary layout: MAGIC, header record (snapshot metadata and every trajectory
+# key except events), one record per event, an empty record, trailer record
+# ({"checksum": ...}). A record is a big-endian uint32 length followed by
+# compact JSON; events are stored in their canonical (checksummed) encoding.
+_MAGIC = b"LRISNAP\x01"
+_LENGTH = struct.Struct(">I")
+_GZIP_MAGIC = b"\x1f\x8b"
+_CANONICAL = json.JSONEncoder(sort_keys=True, separators=(',', ':'), default=str)
+_WRITE_BUFFER = 1 << 20
+
+# Checksum schemes (snapshot["checksum_type"]); snapshots without one are CHECKSUM_SHA256
+CHECKSUM_SHA256 = "sha256"        # compute_checksum over the whole events list
+CHECKSUM_MERKLE = "merkle-sha256"  # MerkleAccumulator root over the events
+
+# Reconstructed delta-snapshot ancestors: checksum -> (full events, MerkleAccumulator)
+_CHAIN_CACHE_SIZE = 32
+_chain_cache = OrderedDict()
+_chain_cache_lock = threading.Lock()
 
 class SnapshotError(Exception):
     """Base exception for snapshot errors."""
@@ -39,88 +69,487 @@ def compute_checksum(events: list) -> str:
     )
     return hashlib.sha256(events_json.encode()).hexdigest()[:16]
 
-def create_snapshot(snapshot_id: str, trajectory_data: dict) -> dict:
+def _leaf_hash(data) -> bytes:
+    digest = hashlib.sha256(b"\x00")
+    digest.update(data)
+    return digest.digest()
+
+def _node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(b"\x01" + left + right).digest()
+
+def _tree_hash(leaves: list) -> bytes:
+    """Merkle tree hash of a non-empty list of leaf hashes (RFC 6962 shape)."""
+    if len(leaves) == 1:
+        return leaves[0]
+    split = 1 << ((len(leaves) - 1).bit_length() - 1)  # Largest power of two < n
+    return _node_hash(_tree_hash(leaves[:split]), _tree_hash(leaves[split:]))
+
+class MerkleAccumulator:
+    """Append-only Merkle tree over trajectory events.
+
+    Events are hashed in their canonical JSON encoding (sorted keys, compact)
+    with RFC 6962 leaf/node prefixes. Only the roots of the perfect subtrees
+    ("peaks") are combined on append, so adding an event costs O(log n) and
+    the root is available at any time without rehashing the history. Leaf
+    hashes are kept to produce inclusion proofs for single events.
+    """
+
+    def __init__(self, events: list = ()):
+        self.leaves = []
+        self._peaks = []  # (leaf count, hash) of perfect subtrees, largest first
+        for event in events:
+            self.append(event)
+
+    def __len__(self) -> int:
+        return len(self.leaves)
+
+    def copy(self) -> "MerkleAccumulator":
+        """Independent accumulator with the same events (leaf hashes are shared)."""
+        clone = MerkleAccumulator()
+        clone.leaves = list(self.leaves)
+        clone._peaks = list(self._peaks)
+        return clone
+
+    def append(self, event: dict):
+        self.append_encoded(_CANONICAL.encode(event).encode())
+
+    def append_encoded(self, data: bytes):
+        """Append an event given as its canonical encoding."""
+        node = _leaf_hash(data)
+        self.leaves.append(node)
+        size = 1
+        while self._peaks and self._peaks[-1][0] == size:
+            node = _node_hash(self._peaks.pop()[1], node)
+            size *= 2
+        self._peaks.append((size, node))
+
+    def root(self) -> str:
+        """Hex Merkle root of all events appended so far."""
+        if not self._peaks:
+            return hashlib.sha256(b"").hexdigest()
+        node = self._peaks[-1][1]
+        for _, peak in reversed(self._peaks[:-1]):
+            node = _node_hash(peak, node)
+        return node.hex()
+
+    def proof(self, index: int) -> list:
+        """Inclusion proof (hex sibling hashes, leaf to root) for event `index`.
+
+        Raises:
+            IndexError: If there is no event at `index`.
+        """
+        if not 0 <= index < len(self.leaves):
+            raise IndexError(f"No event at index {index} (trajectory has {len(self.leaves)})")
+        path = []
+        leaves = self.leaves
+        while len(leaves) > 1:
+            split = 1 << ((len(leaves) - 1).bit_length() - 1)
+            if index < split:
+                path.append(_tree_hash(leaves[split:]))
+                leaves = leaves[:split]
+            else:
+                path.append(_tree_hash(leaves[:split]))
+                leaves = leaves[split:]
+                index -= split
+        return [node.hex() for node in reversed(path)]
+
+def verify_event(event: dict, index: int, size: int, proof: list, root: str) -> bool:
+    """Check that `event` is event `index` of a `size`-event trajectory with Merkle `root`.
+
+    Needs only the event and its proof (see MerkleAccumulator.proof and
+    prove_event), not the rest of the trajectory.
+    """
+    if not 0 <= index < size:
+        return False
+    node = _leaf_hash(_CANONICAL.encode(event).encode())
+    position, last = index, size - 1
+    for sibling in proof:
+        sibling = bytes.fromhex(sibling)
+        if last == 0:
+            return False
+        if position & 1 or position == last:
+            node = _node_hash(sibling, node)
+            if not position & 1:
+                while position and not position & 1:
+                    position >>= 1
+                    last >>= 1
+        else:
+            node = _node_hash(node, sibling)
+        position >>= 1
+        last >>= 1
+    return last == 0 and node.hex() == root
+
+def create_snapshot(snapshot_id: str, trajectory_data: dict, format: str = FORMAT_JSON,
+                    compress: bool = True, accumulator: MerkleAccumulator = None,
+                    parent: str = None) -> dict:
     """Freeze current trajectory safely with atomic write and queue.
 
+    With `parent`, a delta snapshot is written: it stores only the events
+    appended since that snapshot plus a reference to it (id, checksum and
+    event count), and load_snapshot rebuilds the rest from the parent chain.
+
     Args:
         snapshot_id: Unique identifier for the snapshot.
         trajectory_data: Dictionary containing 'events' and 'current_state'.
+        format: FORMAT_JSON or FORMAT_BINARY.
+        compress: Gzip the binary format (ignored for JSON).
+        accumulator: MerkleAccumulator already holding exactly these events
+            (e.g. TrajectoryRenderer.integrity), so the checksum is not
+            recomputed over the whole history.
+        parent: ID of a snapshot whose events are a prefix of these.
 
     Returns:
-        The created snapshot dictionary.
+        The created snapshot dictionary (for a delta, its trajectory holds
+        only the appended events).
 
     Raises:
-        ValueError: If snapshot ID is invalid.
+        ValueError: If snapshot ID or format is invalid.
         SnapshotExistsError: If snapshot already exists.
+        SnapshotNotFoundError: If the parent snapshot doesn't exist.
+        SnapshotError: If the trajectory does not extend the parent's.
     """
     # Sanitize snapshot ID (security: prevent path traversal)
     safe_id = "".join([c for c in snapshot_id if c.isalnum() or c in ('-', '_')])
     if not safe_id:
         raise ValueError("Invalid snapshot ID: must contain alphanumeric characters")
+    if format not in EXTENSIONS:
+        raise ValueError(f"Unknown snapshot format '{format}'. Use one of: {', '.join(EXTENSIONS)}")
 
-    filepath = SNAPSHOTS_DIR / f"{safe_id}.json"
+    filepath = SNAPSHOTS_DIR / f"{safe_id}{EXTENSIONS[format]}"
     SNAPSHOTS_DIR.mkdir(parents=True, exist_ok=True)
 
     events = trajectory_data.get("events", [])
+    if accumulator is not None and len(accumulator) != len(events):
+        accumulator = None
 
     snapshot = {
         "id": safe_id,
         "created_at": datetime.now(timezone.utc).isoformat(),
         "trajectory": trajectory_data,
-        "checksum": compute_checksum(events)
+        "checksum_type": CHECKSUM_MERKLE,
+        "checksum": None
     }
 
+    base = None
+    if parent is not None:
+        parent_id = "".join([c for c in parent if c.isalnum() or c in ('-', '_')])
+        parent_path = _find_snapshot_file(parent_id)
+        if parent_path is None:
+            raise SnapshotNotFoundError(f"Parent snapshot '{parent_id}' not found")
+        parent_snapshot, base = _resolve(parent_path)
+        if base is None:
+            raise SnapshotError(f"Snapshot '{parent_id}' predates delta snapshots and can't be a parent")
+        shared = len(base)
+        if accumulator is not None:
+            extends = accumulator.leaves[:shared] == base.leaves
+        else:
+            extends = events[:shared] == parent_snapshot["trajectory"]["events"]
+        if len(events) < shared or not extends:
+            raise SnapshotError(f"Trajectory does not extend snapshot '{parent_id}'")
+        snapshot["trajectory"] = dict(trajectory_data, events=events[shared:])
+        snapshot["parent"] = {"id": parent_id, "checksum": parent_snapshot["checksum"], "events_count": shared}
+
+    # Binary snapshots compute it while streaming the events out
+    if format == FORMAT_JSON:
+        if accumulator is None:
+            accumulator = base.copy() if base is not None else MerkleAccumulator()
+            for event in snapshot["trajectory"]["events"]:
+                accumulator.append(event)
+        snapshot["checksum"] = accumulator.root()
+
     # Queue snapshot creation
     with _snapshot_lock:
+        if _find_snapshot_file(safe_id) is not None:
+            raise SnapshotExistsError(f"Snapshot '{safe_id}' already exists. Choose a different name.")
         try:
-            with open(filepath, 'x') as f:  # 'x' — atomic write
-                json.dump(snapshot, f, indent=2, default=str)
+            with open(filepath, 'xb' if format == FORMAT_BINARY else 'x') as f:  # 'x' — atomic write
+                try:
+                    if format == FORMAT_BINARY:
+                        snapshot["checksum"] = _write_binary(f, snapshot, compress, base)
+                    else:
+                        json.dump(snapshot, f, indent=2, default=str)
+                except BaseException:
+                    f.close()
+                    os.unlink(filepath)
+                    raise
         except FileExistsError:
             raise SnapshotExistsError(f"Snapshot '{safe_id}' already exists. Choose a different name.")
 
+        catalog = _read_catalog()
+        catalog[filepath.name] = _catalog_entry(filepath, snapshot, valid=True, events_count=len(events))
+        _write_catalog(catalog)
+
     return snapshot
 
-def list_snapshots() -> list:
+def _write_binary(raw, snapshot: dict, compress: bool, base: MerkleAccumulator = None) -> str:
+    """Stream `snapshot` to `raw` in the binary format.
+
+    Returns the events checksum (continuing from `base`, the parent's
+    accumulator, for a delta snapshot).
+    """
+    trajectory = snapshot["trajectory"]
+    events = trajectory.get("events", [])
+    header = {key: value for key, value in snapshot.items() if key not in ("trajectory", "checksum")}
+    header["trajectory"] = {key: value for key, value in trajectory.items() if key != "events"}
+    header["events_count"] = len(events)
+
+    out = gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=6, mtime=0) if compress else raw
+    accumulator = base.copy() if base is not None else MerkleAccumulator()
+    buffer = bytearray(_MAGIC)
+
+    def record(data: bytes):
+        buffer.extend(_LENGTH.pack(len(data)))
+        buffer.extend(data)
+        if len(buffer) >= _WRITE_BUFFER:
+            out.write(buffer)
+            buffer.clear()
+
+    record(json.dumps(header, separators=(',', ':'), default=str).encode())
+    for event in events:
+        data = _CANONICAL.encode(event).encode()
+        accumulator.append_encoded(data)
+        record(data)
+    checksum = accumulator.root()
+
+    record(b"")
+    record(json.dumps({"checksum": checksum}).encode())
+    out.write(buffer)
+    if compress:
+        out.close()  # Flushes the gzip trailer; `raw` stays open
+    return checksum
+
+def _read_binary(filepath: Path):
+    """Read a binary snapshot. Returns (snapshot, canonical encodings of its events)."""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    if data[:2] == _GZIP_MAGIC:
+        data = gzip.decompress(data)
+    if data[:len(_MAGIC)] != _MAGIC:
+        raise SnapshotError(f"{filepath.name} is not a binary snapshot")
+
+    view = memoryview(data)
+    offset = len(_MAGIC)
+    records = []
+    while True:
+        (length,) = _LENGTH.unpack_from(view, offset)
+        offset += _LENGTH.size
+        if length == 0:  # End of events (the header record is never empty)
+            break
+        records.append(view[offset:offset + length])
+        offset += length
+    (length,) = _LENGTH.unpack_from(view, offset)
+    trailer = json.loads(bytes(view[offset + _LENGTH.size:offset + _LENGTH.size + length]))
+
+    snapshot = json.loads(bytes(records[0]))
+    del snapshot["events_count"]
+    snapshot["trajectory"]["events"] = json.loads(b"[" + b",".join(records[1:]) + b"]")
+    snapshot["checksum"] = trailer.get("checksum")
+    return snapshot, records[1:]
+
+def _read_snapshot_file(filepath: Path):
+    """Read a snapshot file as stored (a delta holds only its own events).
+
+    Returns (snapshot, canonical event encodings or None). Binary snapshots
+    store events canonically, so their stored bytes are hashed directly.
+    """
+    if filepath.suffix == EXTENSIONS[FORMAT_BINARY]:
+        return _read_binary(filepath)
+    with open(filepath) as f:
+        return json.load(f), None
+
+def _resolve(filepath: Path):
+    """Read and verify a snapshot, rebuilding a delta's events from its parents.
+
+    Walks up the parent chain until a cached ancestor (or a full snapshot),
+    then verifies each snapshot on the way back down: its parent reference
+    must match the parent's checksum, and its own checksum the Merkle root
+    of all its events. Verified Merkle snapshots are cached by checksum.
+
+    Returns:
+        (snapshot with full events, MerkleAccumulator or None for snapshots
+        predating Merkle checksums). Both may be shared with the cache.
+    """
+    chain, seen = [], set()
+    events, accumulator = [], None
+    while True:
+        snapshot, records = _read_snapshot_file(filepath)
+        chain.append((snapshot, records))
+        parent = snapshot.get("parent")
+        if not parent:
+            break
+        with _chain_cache_lock:
+            cached = _chain_cache.get(parent["checksum"])
+            if cached is not None:
+                _chain_cache.move_to_end(parent["checksum"])
+        if cached is not None:
+            events, accumulator = cached
+            break
+        if parent["id"] in seen:
+            raise SnapshotError(f"Snapshot '{parent['id']}' is its own ancestor")
+        seen.add(parent["id"])
+        filepath = _find_snapshot_file(parent["id"])
+        if filepath is None:
+            raise SnapshotNotFoundError(f"Parent snapshot '{parent['id']}' of '{snapshot.get('id')}' not found")
+
+    for snapshot, records in reversed(chain):
+        trajectory = snapshot.setdefault("trajectory", {})
+        own_events = trajectory.get("events", [])
+        if snapshot.get("checksum_type") != CHECKSUM_MERKLE:
+            # Older snapshots are always full copies
+            _check_checksum(snapshot.get("checksum"), compute_checksum(own_events))
+            events, accumulator = own_events, None
+            continue
+
+        parent = snapshot.get("parent")
+        if parent:
+            if accumulator is None or len(accumulator) != parent.get("events_count") \
+                    or accumulator.root() != parent.get("checksum"):
+                raise ChecksumError(f"Parent snapshot '{parent['id']}' no longer matches "
+                                    f"'{snapshot.get('id')}' (checksum changed)")
+            accumulator = accumulator.copy()
+            events = events + own_events
+        else:
+            accumulator = MerkleAccumulator()
+            events = own_events
+        if records is not None:
+            for data in records:
+                accumulator.append_encoded(data)
+        else:
+            for event in own_events:
+                accumulator.append(event)
+        _check_checksum(snapshot.get("checksum"), accumulator.root())
+        trajectory["events"] = events
+
+        with _chain_cache_lock:
+            _chain_cache[snapshot["checksum"]] = (events, accumulator)
+            while len(_chain_cache) > _CHAIN_CACHE_SIZE:
+                _chain_cache.popitem(last=False)
+    return snapshot, accumulator
+
+def _find_snapshot_file(safe_id: str):
+    """Path of the snapshot file for `safe_id` in whichever format exists, else None."""
+    for extension in EXTENSIONS.values():
+        filepath = SNAPSHOTS_DIR / f"{safe_id}{extension}"
+        if filepath.exists():
+            return filepath
+    return None
+
+def _read_catalog() -> dict:
+    """Read the sidecar catalog ({file name: entry}). Missing or corrupt means empty."""
+    try:
+        with open(SNAPSHOTS_DIR / CATALOG_NAME) as f:
+            catalog = json.load(f)
+        return catalog if isinstance(catalog, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _write_catalog(catalog: dict):
+    """Replace the catalog atomically (temp file + os.replace). Hold _snapshot_lock."""
+    fd, tmp_path = tempfile.mkstemp(dir=SNAPSHOTS_DIR, prefix=f".{CATALOG_NAME}.")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(catalog, f, separators=(',', ':'))
+        os.replace(tmp_path, SNAPSHOTS_DIR / CATALOG_NAME)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _catalog_entry(filepath: Path, snapshot: dict, valid: bool, events_count: int = None) -> dict:
+    """Catalog row for a snapshot file, stamped with the file's mtime and size."""
+    stat = filepath.stat()
+    trajectory = snapshot.get("trajectory", {})
+    return {
+        "id": snapshot.get("id", filepath.stem),
+        "created_at": snapshot.get("created_at"),
+        "phase": trajectory.get("current_state", {}).get("phase", "unknown"),
+        "events_count": len(trajectory.get("events", [])) if events_count is None else events_count,
+        "checksum": snapshot.get("checksum"),
+        "parent": (snapshot.get("parent") or {}).get("id"),
+        "format": FORMAT_BINARY if filepath.suffix == EXTENSIONS[FORMAT_BINARY] else FORMAT_JSON,
+        "valid": valid,
+        "mtime": stat.st_mtime_ns,
+        "size": stat.st_size,
+    }
+
+def _index_file(filepath: Path):
+    """Load and verify one snapshot file. Returns its catalog entry, or None if unreadable."""
+    try:
+        try:
+            snapshot, _ = _resolve(filepath)
+            valid = True
+        except (ChecksumError, SnapshotNotFoundError):
+            # Still listed: either it was tampered with or its parent is gone
+            snapshot = _read_snapshot_file(filepath)[0]
+            events_count = len(snapshot.get("trajectory", {}).get("events", [])) \
+                + (snapshot.get("parent") or {}).get("events_count", 0)
+            return _catalog_entry(filepath, snapshot, False, events_count)
+        return _catalog_entry(filepath, snapshot, valid)
+    except Exception:
+        # Skip corrupted files that can't be decoded
+        return None
+
+def list_snapshots(verify: bool = False, workers: int = None) -> list:
     """List all saved snapshots with metadata.
 
+    Rows come from the catalog index; a snapshot file is only opened when
+    it is missing from the catalog or its mtime/size no longer match. Its
+    `valid` flag is then the one recorded when it was last indexed, and
+    load_snapshot still verifies the full checksum before use.
+
+    Args:
+        verify: Re-read every file and recompute its checksum.
+        workers: Thread pool size for reading files (default: executor default).
+
     Returns:
-        List of snapshot metadata dictionaries.
+        List of snapshot metadata dictionaries, newest first.
     """
-    snapshots = []
     # Ensure directory exists
     if not SNAPSHOTS_DIR.exists():
         return []
 
-    for filepath in SNAPSHOTS_DIR.glob("*.json"):
-        try:
-            with open(filepath) as f:
-                snapshot = json.load(f)
-
-            trajectory = snapshot.get("trajectory", {})
-            current_state = trajectory.get("current_state", {})
-            events = trajectory.get("events", [])
+    catalog = _read_catalog()
+    files = {path.name: path for extension in EXTENSIONS.values()
+             for path in SNAPSHOTS_DIR.glob(f"*{extension}")}
 
-            # Verify checksum implicitly to mark validity
-            is_valid = False
+    entries, stale = {}, []
+    for name, filepath in files.items():
+        entry = catalog.get(name)
+        if not verify and entry is not None:
             try:
-                verify_checksum(snapshot)
-                is_valid = True
-            except ChecksumError:
-                is_valid = False
-
-            snapshots.append({
-                "id": snapshot.get("id", filepath.stem),
-                "created_at": snapshot.get("created_at"),
-                "events_count": len(events),
-                "phase": current_state.get("phase", "unknown"),
-                "valid": is_valid
-            })
-        except Exception:
-            # Skip corrupted files that aren't valid JSON
-            continue
+                stat = filepath.stat()
+            except OSError:
+                continue
+            if entry.get("mtime") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                entries[name] = entry
+                continue
+        stale.append(name)
+
+    if stale:
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                indexed = list(pool.map(_index_file, (files[name] for name in stale)))
+        else:
+            indexed = [_index_file(files[stale[0]])]
+        entries.update((name, entry) for name, entry in zip(stale, indexed) if entry is not None)
+
+    if stale or catalog.keys() - files.keys():
+        with _snapshot_lock:
+            # Merge into the current catalog: snapshots may have been created meanwhile
+            current = _read_catalog()
+            current.update(entries)
+            for name in list(current):
+                if name not in entries and not (SNAPSHOTS_DIR / name).exists():
+                    del current[name]
+            _write_catalog(current)
+
+    snapshots = [
+        {key: entry.get(key) for key in ("id", "created_at", "events_count", "phase", "checksum", "format",
+                                         "parent", "valid")}
+        for entry in entries.values()
+    ]
 
     # Sort by creation time (newest first)
-    snapshots.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+    snapshots.sort(key=lambda x: x.get("created_at") or "", reverse=True)
     return snapshots
 
 def load_snapshot(snapshot_id: str) -> dict:
@@ -130,29 +559,44 @@ def load_snapshot(snapshot_id: str) -> dict:
         snapshot_id: The ID of the snapshot to load.
 
     Returns:
-        The full snapshot dictionary.
+        The full snapshot dictionary (a delta snapshot's events include its
+        parents' events).
 
     Raises:
         ValueError: If ID is invalid.
-        SnapshotNotFoundError: If file doesn't exist.
+        SnapshotNotFoundError: If file (or a parent snapshot's) doesn't exist.
         ChecksumError: If integrity check fails.
     """
+    snapshot, _ = _load(snapshot_id)
+    return snapshot
+
+def open_branch(snapshot_id: str):
+    """Load a snapshot to continue from it.
+
+    Returns (snapshot, accumulator): the events list and MerkleAccumulator
+    are private copies, safe to append to. Pass the snapshot's id as
+    `parent` to create_snapshot to store only the events added afterwards.
+    """
+    snapshot, accumulator = _load(snapshot_id)
+    if accumulator is None:
+        accumulator = MerkleAccumulator(snapshot["trajectory"]["events"])
+    return snapshot, accumulator.copy()
+
+def _load(snapshot_id: str):
     # Sanitize ID
     safe_id = "".join([c for c in snapshot_id if c.isalnum() or c in ('-', '_')])
     if not safe_id:
         raise ValueError("Invalid snapshot ID")
 
-    filepath = SNAPSHOTS_DIR / f"{safe_id}.json"
+    filepath = _find_snapshot_file(safe_id)
 
-    if not filepath.exists():
+    if filepath is None:
         raise SnapshotNotFoundError(f"Snapshot '{safe_id}' not found")
 
-    with open(filepath) as f:
-        snapshot = json.load(f)
-
-    verify_checksum(snapshot)
-
-    return snapshot
+    snapshot, accumulator = _resolve(filepath)
+    # Cached events may be shared with other snapshots: hand out a copy
+    snapshot["trajectory"]["events"] = list(snapshot["trajectory"]["events"])
+    return snapshot, accumulator
 
 def verify_checksum(snapshot: dict):
     """Verify snapshot integrity.
@@ -160,11 +604,37 @@ def verify_checksum(snapshot: dict):
     Raises:
         ChecksumError: If verification fails.
     """
-    expected = snapshot.get("checksum")
-    trajectory = snapshot.get("trajectory", {})
-    events = trajectory.get("events", [])
+    _check_checksum(snapshot.get("checksum"), _events_checksum(snapshot))
+
+def prove_event(snapshot_id: str, index: int) -> dict:
+    """Event `index` of a snapshot with its Merkle inclusion proof.
+
+    The result can be checked with verify_event(event, index, size, proof,
+    root) by anyone who trusts the root, without the rest of the trajectory.
+
+    Raises:
+        SnapshotError: If the snapshot predates Merkle checksums.
+        IndexError: If there is no event at `index`.
+    """
+    snapshot, accumulator = _load(snapshot_id)
+    if accumulator is None:
+        raise SnapshotError(f"Snapshot '{snapshot['id']}' has no Merkle checksum")
+    events = snapshot["trajectory"].get("events", [])
+    return {
+        "event": events[index] if 0 <= index < len(events) else None,
+        "index": index,
+        "size": len(events),
+        "proof": accumulator.proof(index),
+        "root": snapshot["checksum"],
+    }
 
-    actual = compute_checksum(events)
+def _events_checksum(snapshot: dict) -> str:
+    """Recompute a snapshot's checksum with the scheme it was created with."""
+    events = snapshot.get("trajectory", {}).get("events", [])
+    if snapshot.get("checksum_type") == CHECKSUM_MERKLE:
+        return MerkleAccumulator(events).root()
+    return compute_checksum(events)
 
+def _check_checksum(expected: str, actual: str):
     if expected != actual:
         raise ChecksumError(f"Snapshot integrity check failed. Expected {expected}, got {actual}")
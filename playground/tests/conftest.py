@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+PLAYGROUND_ROOT = Path(__file__).resolve().parents[1]
+
+playground_path = str(PLAYGROUND_ROOT)
+if playground_path not in sys.path:
+    sys.path.insert(0, playground_path)
+
+import snapshots_manager  # noqa: E402
+
+
+@pytest.fixture
+def snapshots_dir(tmp_path, monkeypatch):
+    """Points snapshots_manager at an empty directory with a cold chain cache."""
+    monkeypatch.setattr(snapshots_manager, "SNAPSHOTS_DIR", tmp_path / "snapshots")
+    snapshots_manager._chain_cache.clear()
+    yield snapshots_manager.SNAPSHOTS_DIR
+    snapshots_manager._chain_cache.clear()
@@ -0,0 +1,90 @@
+import json
+import builtins
+import pytest
+import playground
+import snapshots_manager as sm
+from test_snapshots_manager import step, write_legacy
+
+
+@pytest.fixture
+def session(snapshots_dir, monkeypatch, capsys):
+    monkeypatch.setattr(builtins, "input", lambda prompt="": "y")
+    identity = playground.initialize_identity()
+    renderer = playground.TrajectoryRenderer()
+    renderer.add_step(identity["phase"], identity["coherence"], None, 0.0, "success")
+    state = {"frozen": False}
+
+    def run(command):
+        playground.process_command(command, identity, renderer, state)
+        return capsys.readouterr().out
+
+    return run, renderer
+
+
+def test_snapshots_after_switch_are_deltas(session):
+    run, renderer = session
+    run("add_peer alice bob")
+    assert "✓ Snapshot 'base'" in run("snapshot base")
+    run("switch base")
+    run("continue")
+    run("add_mentor alice smith")
+    assert "✓ Snapshot 'branch'" in run("snapshot branch binary")
+
+    branch = sm.load_snapshot("branch")
+    assert branch["parent"]["id"] == "base"
+    assert branch["trajectory"]["events"] == renderer.history
+    assert renderer.integrity.root() == branch["checksum"]
+
+
+def test_run_headless_on_bundled_scenarios(tmp_path):
+    results_path = tmp_path / "results.json"
+    report = playground.run_headless(workers=2, results_path=str(results_path))
+
+    assert report["total"] == 5
+    assert report["passed"] == 5
+    assert report["failed"] == 0
+    assert len(report["stories"]) == 1
+    assert report["stories"][0]["coherence_trajectory"][0] == 0.18
+    assert json.loads(results_path.read_text())["passed"] == 5
+
+
+def test_switch_to_legacy_snapshot_falls_back_to_full_copies(session, snapshots_dir):
+    run, renderer = session
+    write_legacy(snapshots_dir, "old", [step(0)])
+    run("switch old")
+    run("continue")
+    assert renderer.parent_snapshot is None
+
+    run("add_peer alice bob")
+    assert "✓ Snapshot 'first'" in run("snapshot first")
+    run("add_peer alice carol")
+    assert "✓ Snapshot 'second'" in run("snapshot second")
+    assert "parent" not in sm.load_snapshot("first")
+    assert sm.load_snapshot("second")["parent"]["id"] == "first"
+
+
+def test_run_headless_reports_bad_files_and_splits_stories_by_directory(tmp_path):
+    identity = 'identity: {id: alice, phase: emerging, coherence: 0.18}\n'
+    step = 'intent: mentor_relation\nrelation: {type: mentor, target: smith}\n'
+    files = {
+        "a/01_start.yaml": identity,
+        "a/02_list.yaml": "- not\n- a mapping\n",
+        "a/03_bad_field.yaml": "intent: archive\nrequested_transition: archived\n",
+        "a/04_step.yaml": step,
+        "a/sub/01_step.yaml": step,
+    }
+    for name, content in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+    report = playground.run_headless(str(tmp_path), workers=1, results_path=None)
+    results = {result["file"]: result for result in report["scenarios"]}
+
+    assert "must be a mapping" in results["a/02_list.yaml"]["failure"]
+    assert "AttributeError" in results["a/03_bad_field.yaml"]["failure"]
+    assert results["a/04_step.yaml"]["passed"]
+    # A subdirectory starts its own story instead of continuing alice's
+    assert results["a/sub/01_step.yaml"]["skipped"]
+    assert [story["story"] for story in report["stories"]] == ["a/01_start.yaml", "a/sub/01_step.yaml"]
+    assert report["failed"] == 2
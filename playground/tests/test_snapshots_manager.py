@@ -0,0 +1,142 @@
+import json
+import pytest
+import snapshots_manager as sm
+
+
+def step(i, event="peer_added"):
+    return {"phase": "emerging", "coherence": round(0.2 + i * 0.01, 2), "event": event,
+            "delta": 0.01, "status": "success", "error_msg": None}
+
+
+def trajectory(events):
+    return {"subject_id": "alice", "events": events,
+            "current_state": {"id": "alice", "phase": "emerging", "coherence": 0.2, "relations": []}}
+
+
+def write_legacy(directory, snapshot_id, events):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / f"{snapshot_id}.json").write_text(json.dumps({
+        "id": snapshot_id,
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "trajectory": trajectory(events),
+        "checksum": sm.compute_checksum(events),
+    }))
+
+
+def test_catalog_tracks_snapshot_files(snapshots_dir):
+    events = [step(i) for i in range(50)]
+    sm.create_snapshot("plain", trajectory(events))
+    sm.create_snapshot("short", trajectory(events[:5]))
+    assert (snapshots_dir / sm.CATALOG_NAME).exists()
+    with pytest.raises(sm.SnapshotExistsError):
+        sm.create_snapshot("plain", trajectory(events))
+
+    rows = {row["id"]: row for row in sm.list_snapshots()}
+    assert rows["plain"]["events_count"] == 50
+    assert rows["short"]["events_count"] == 5
+    assert all(row["valid"] for row in rows.values())
+
+    # A changed file is re-indexed despite its catalog entry
+    path = snapshots_dir / "plain.json"
+    path.write_text(path.read_text().replace('"peer_added"', '"forged"', 1))
+    rows = {row["id"]: row for row in sm.list_snapshots()}
+    assert rows["plain"]["valid"] is False
+
+    # Deleted files drop out of the listing and the catalog
+    (snapshots_dir / "short.json").unlink()
+    assert [row["id"] for row in sm.list_snapshots()] == ["plain"]
+    assert "short.json" not in json.loads((snapshots_dir / sm.CATALOG_NAME).read_text())
+
+
+def test_binary_snapshot_round_trip(snapshots_dir):
+    events = [step(i) for i in range(50)]
+    sm.create_snapshot("packed", trajectory(events), format=sm.FORMAT_BINARY)
+    sm.create_snapshot("raw", trajectory(events), format=sm.FORMAT_BINARY, compress=False)
+    sm.create_snapshot("plain", trajectory(events))
+    for snapshot_id in ("packed", "raw"):
+        assert sm.load_snapshot(snapshot_id)["trajectory"] == sm.load_snapshot("plain")["trajectory"]
+    # Snapshot ids are unique across formats
+    with pytest.raises(sm.SnapshotExistsError):
+        sm.create_snapshot("packed", trajectory(events))
+
+    rows = {row["id"]: row for row in sm.list_snapshots(verify=True)}
+    assert rows["packed"]["format"] == sm.FORMAT_BINARY
+    assert rows["plain"]["format"] == sm.FORMAT_JSON
+    assert all(row["valid"] for row in rows.values())
+
+
+def test_merkle_proofs(snapshots_dir):
+    events = [step(i) for i in range(13)]
+    accumulator = sm.MerkleAccumulator()
+    for event in events:
+        accumulator.append(event)
+    sm.create_snapshot("proved", trajectory(events), accumulator=accumulator)
+
+    for index in (0, 7, 12):
+        proof = sm.prove_event("proved", index)
+        assert sm.verify_event(proof["event"], index, proof["size"], proof["proof"], proof["root"])
+        assert not sm.verify_event(step(99), index, proof["size"], proof["proof"], proof["root"])
+    with pytest.raises(IndexError):
+        sm.prove_event("proved", 13)
+
+
+def test_legacy_checksum_still_verifies(snapshots_dir):
+    write_legacy(snapshots_dir, "old", [step(0)])
+    assert sm.load_snapshot("old")["trajectory"]["events"] == [step(0)]
+    with pytest.raises(sm.SnapshotError):
+        sm.prove_event("old", 0)
+
+
+@pytest.mark.parametrize("fmt", [sm.FORMAT_JSON, sm.FORMAT_BINARY])
+def test_delta_round_trip(snapshots_dir, fmt):
+    events = [step(i) for i in range(20)]
+    sm.create_snapshot("base", trajectory(events))
+    events = events + [step(20, "mentor_added"), step(21)]
+    delta = sm.create_snapshot("child", trajectory(events), format=fmt, parent="base")
+
+    assert len(delta["trajectory"]["events"]) == 2
+    assert delta["parent"]["id"] == "base"
+    assert delta["parent"]["events_count"] == 20
+
+    sm._chain_cache.clear()
+    loaded = sm.load_snapshot("child")
+    assert loaded["trajectory"]["events"] == events
+    assert loaded["checksum"] == sm.MerkleAccumulator(events).root()
+
+
+def test_multi_level_chain_and_tampered_ancestor(snapshots_dir):
+    events = [step(0)]
+    sm.create_snapshot("a", trajectory(events))
+    for parent, snapshot_id in [("a", "b"), ("b", "c"), ("c", "d")]:
+        events = events + [step(len(events))]
+        accumulator = sm.MerkleAccumulator(events)
+        sm.create_snapshot(snapshot_id, trajectory(events), accumulator=accumulator, parent=parent)
+
+    sm._chain_cache.clear()
+    assert sm.load_snapshot("d")["trajectory"]["events"] == events
+    assert [row["events_count"] for row in sm.list_snapshots(verify=True)
+            if row["id"] == "d"] == [4]
+
+    # Loads hand out copies: appending must not leak into the cached chain
+    sm.load_snapshot("c")["trajectory"]["events"].append(step(99))
+    assert len(sm.load_snapshot("c")["trajectory"]["events"]) == 3
+
+    path = snapshots_dir / "b.json"
+    snapshot = json.loads(path.read_text())
+    snapshot["trajectory"]["events"][0]["event"] = "forged"
+    path.write_text(json.dumps(snapshot))
+    sm._chain_cache.clear()
+    with pytest.raises(sm.ChecksumError):
+        sm.load_snapshot("d")
+
+
+def test_delta_requires_extending_merkle_parent(snapshots_dir):
+    write_legacy(snapshots_dir, "old", [step(0)])
+    with pytest.raises(sm.SnapshotError):
+        sm.create_snapshot("new", trajectory([step(0), step(1)]), parent="old")
+
+    sm.create_snapshot("base", trajectory([step(0), step(1)]))
+    with pytest.raises(sm.SnapshotError):
+        sm.create_snapshot("fork", trajectory([step(5)]), parent="base")
+    with pytest.raises(sm.SnapshotNotFoundError):
+        sm.create_snapshot("orphan", trajectory([step(0)]), parent="missing")